@@ -0,0 +1,48 @@
+"""add partial, composite and trigram indexes for job filters
+
+Revision ID: 28f088b6a828
+Revises: d1b66d621f87
+Create Date: 2026-10-18 11:26:53.914077
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '28f088b6a828'
+down_revision: Union[str, Sequence[str], None] = 'd1b66d621f87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # jobs is live: build without blocking writes. CONCURRENTLY can't run in
+    # a transaction block, so these run in autocommit.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_jobs_active_posted_date', 'jobs', ['posted_date', 'id'], unique=False,
+                        postgresql_where=sa.text("status = 'active'"), postgresql_concurrently=True)
+        op.create_index('ix_jobs_status_company_size_posted_date', 'jobs',
+                        ['status', 'company_size', 'posted_date'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_jobs_status_experience_level_posted_date', 'jobs',
+                        ['status', 'experience_level', 'posted_date'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_jobs_location_trgm', 'jobs', ['location'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'},
+                        postgresql_concurrently=True)
+        op.create_index('ix_jobs_company_trgm', 'jobs', ['company'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'company': 'gin_trgm_ops'},
+                        postgresql_concurrently=True)
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_jobs_company_trgm', table_name='jobs', postgresql_concurrently=True)
+        op.drop_index('ix_jobs_location_trgm', table_name='jobs', postgresql_concurrently=True)
+        op.drop_index('ix_jobs_status_experience_level_posted_date', table_name='jobs', postgresql_concurrently=True)
+        op.drop_index('ix_jobs_status_company_size_posted_date', table_name='jobs', postgresql_concurrently=True)
+        op.drop_index('ix_jobs_active_posted_date', table_name='jobs', postgresql_concurrently=True)
@@ -0,0 +1,39 @@
+"""add annualized salary columns to jobs
+
+Revision ID: 3931587f766c
+Revises: 48e81941749f
+Create Date: 2026-10-18 21:02:37.551904
+
+Existing rows are filled by ``python -m app.services.salary --backfill``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3931587f766c'
+down_revision: Union[str, Sequence[str], None] = '48e81941749f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('salary_min', sa.Integer(), nullable=True))
+    op.add_column('jobs', sa.Column('salary_max', sa.Integer(), nullable=True))
+    op.add_column('jobs', sa.Column('salary_currency', sa.String(length=3), nullable=True))
+    op.create_index('ix_jobs_active_salary_max', 'jobs', ['salary_max'], unique=False,
+                    postgresql_where=sa.text("status = 'active'"))
+    op.create_index('ix_jobs_active_salary_min', 'jobs', ['salary_min'], unique=False,
+                    postgresql_where=sa.text("status = 'active'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_active_salary_min', table_name='jobs')
+    op.drop_index('ix_jobs_active_salary_max', table_name='jobs')
+    op.drop_column('jobs', 'salary_currency')
+    op.drop_column('jobs', 'salary_max')
+    op.drop_column('jobs', 'salary_min')
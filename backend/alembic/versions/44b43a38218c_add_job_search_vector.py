@@ -0,0 +1,54 @@
+"""add weighted full-text search vector to jobs
+
+Revision ID: 44b43a38218c
+Revises: feeaf0c03f80
+Create Date: 2026-10-18 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '44b43a38218c'
+down_revision: Union[str, Sequence[str], None] = 'feeaf0c03f80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION jobs_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(NEW.company, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER jobs_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, company, description ON jobs
+        FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update()
+    """)
+
+    # Backfill existing rows through the trigger
+    op.execute("UPDATE jobs SET title = title")
+
+    op.create_index('ix_jobs_search_vector', 'jobs', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_search_vector', table_name='jobs', postgresql_using='gin')
+    op.execute("DROP TRIGGER IF EXISTS jobs_search_vector_trigger ON jobs")
+    op.execute("DROP FUNCTION IF EXISTS jobs_search_vector_update()")
+    op.drop_column('jobs', 'search_vector')
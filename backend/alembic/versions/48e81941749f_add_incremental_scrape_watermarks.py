@@ -0,0 +1,44 @@
+"""add scrape watermarks for incremental scraping
+
+Revision ID: 48e81941749f
+Revises: c8d80a25d3f0
+Create Date: 2026-10-18 20:11:48.093517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '48e81941749f'
+down_revision: Union[str, Sequence[str], None] = 'c8d80a25d3f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('scrape_watermarks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(length=100), nullable=False),
+    sa.Column('query', sa.String(length=255), nullable=False),
+    sa.Column('location', sa.String(length=255), nullable=False),
+    sa.Column('seen_external_ids', sa.JSON(), nullable=False),
+    sa.Column('last_scraped_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_new_jobs', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'query', 'location', name='uq_scrape_watermarks_source_query_location')
+    )
+    op.create_index(op.f('ix_scrape_watermarks_id'), 'scrape_watermarks', ['id'], unique=False)
+    op.add_column('scrape_tasks', sa.Column('incremental', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('scrape_tasks', 'incremental')
+    op.drop_index(op.f('ix_scrape_watermarks_id'), table_name='scrape_watermarks')
+    op.drop_table('scrape_watermarks')
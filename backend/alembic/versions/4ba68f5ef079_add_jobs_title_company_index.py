@@ -0,0 +1,31 @@
+"""add jobs (title, company) index for ingest dedup
+
+Revision ID: 4ba68f5ef079
+Revises: 987664b6d829
+Create Date: 2026-10-18 23:05:41.518207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4ba68f5ef079'
+down_revision: Union[str, Sequence[str], None] = '987664b6d829'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built without blocking writes to the live jobs table
+    with op.get_context().autocommit_block():
+        op.create_index('ix_jobs_title_company', 'jobs', ['title', 'company'], unique=False,
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_jobs_title_company', table_name='jobs', postgresql_concurrently=True)
@@ -0,0 +1,46 @@
+"""index coalesced salary bounds so open-ended ranges match salary filters
+
+Revision ID: 5e2b8c41d7a9
+Revises: a3f7d92c1b60
+Create Date: 2026-10-18 04:31:47.218093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2b8c41d7a9'
+down_revision: Union[str, Sequence[str], None] = 'a3f7d92c1b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_jobs_active_salary_top', 'jobs', [sa.text('coalesce(salary_max, salary_min)')],
+                        unique=False, postgresql_where=sa.text("status = 'active'"), postgresql_concurrently=True)
+        op.create_index('ix_jobs_active_salary_floor', 'jobs', [sa.text('coalesce(salary_min, salary_max)')],
+                        unique=False, postgresql_where=sa.text("status = 'active'"), postgresql_concurrently=True)
+        op.drop_index('ix_jobs_active_salary_max', table_name='jobs', postgresql_concurrently=True)
+        op.drop_index('ix_jobs_active_salary_min', table_name='jobs', postgresql_concurrently=True)
+    # Partial index expressions get no planner statistics of their own
+    op.execute(
+        "CREATE STATISTICS jobs_salary_bounds_stats "
+        "ON (coalesce(salary_max, salary_min)), (coalesce(salary_min, salary_max)) FROM jobs"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP STATISTICS IF EXISTS jobs_salary_bounds_stats")
+    with op.get_context().autocommit_block():
+        op.create_index('ix_jobs_active_salary_max', 'jobs', ['salary_max'], unique=False,
+                        postgresql_where=sa.text("status = 'active'"), postgresql_concurrently=True)
+        op.create_index('ix_jobs_active_salary_min', 'jobs', ['salary_min'], unique=False,
+                        postgresql_where=sa.text("status = 'active'"), postgresql_concurrently=True)
+        op.drop_index('ix_jobs_active_salary_floor', table_name='jobs', postgresql_concurrently=True)
+        op.drop_index('ix_jobs_active_salary_top', table_name='jobs', postgresql_concurrently=True)
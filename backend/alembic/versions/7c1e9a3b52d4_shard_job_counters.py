@@ -0,0 +1,132 @@
+"""shard job_counters and only count external_url changes on update
+
+Revision ID: 7c1e9a3b52d4
+Revises: 4ba68f5ef079
+Create Date: 2026-10-18 23:41:09.772630
+
+Every job write used to update the same two job_counters rows, so
+concurrent writers queued on their row locks, and every UPDATE of jobs ran
+the statement trigger. Counters now have per-connection shards summed on
+read, and the update trigger only fires for rows whose external_url
+appears or disappears.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e9a3b52d4'
+down_revision: Union[str, Sequence[str], None] = '4ba68f5ef079'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# JOB_COUNTER_SHARDS in app/models/job_counter.py
+JOB_COUNTER_SHARDS = 16
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("LOCK TABLE jobs IN SHARE ROW EXCLUSIVE MODE")
+    op.add_column('job_counters', sa.Column('shard', sa.SmallInteger(), server_default='0', nullable=False))
+    op.drop_constraint('job_counters_pkey', 'job_counters', type_='primary')
+    op.create_primary_key('job_counters_pkey', 'job_counters', ['name', 'shard'])
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION job_counters_add(counter text, delta bigint) RETURNS void AS $$
+        BEGIN
+            INSERT INTO job_counters (name, shard, value)
+            VALUES (counter, mod(pg_backend_pid(), {JOB_COUNTER_SHARDS}), delta)
+            ON CONFLICT (name, shard) DO UPDATE SET value = job_counters.value + EXCLUDED.value;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION jobs_counters_update() RETURNS trigger AS $$
+        DECLARE
+            n bigint;
+            n_scraped bigint;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                SELECT count(*), count(external_url) INTO n, n_scraped FROM new_rows;
+            ELSE
+                SELECT -count(*), -count(external_url) INTO n, n_scraped FROM old_rows;
+            END IF;
+            IF n <> 0 THEN
+                PERFORM job_counters_add('jobs_total', n);
+            END IF;
+            IF n_scraped <> 0 THEN
+                PERFORM job_counters_add('jobs_scraped', n_scraped);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION jobs_scraped_counter_update() RETURNS trigger AS $$
+        BEGIN
+            PERFORM job_counters_add('jobs_scraped', CASE WHEN NEW.external_url IS NULL THEN -1 ELSE 1 END);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS jobs_counters_update_trigger ON jobs")
+    op.execute("""
+        CREATE TRIGGER jobs_counters_update_trigger
+        AFTER UPDATE OF external_url ON jobs
+        FOR EACH ROW WHEN ((OLD.external_url IS NULL) IS DISTINCT FROM (NEW.external_url IS NULL))
+        EXECUTE FUNCTION jobs_scraped_counter_update()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("LOCK TABLE jobs IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("DROP TRIGGER IF EXISTS jobs_counters_update_trigger ON jobs")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION jobs_counters_update() RETURNS trigger AS $$
+        DECLARE
+            total_delta bigint := 0;
+            scraped_delta bigint := 0;
+            n bigint;
+            n_scraped bigint;
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                SELECT count(*), count(external_url) INTO n, n_scraped FROM new_rows;
+                total_delta := total_delta + n;
+                scraped_delta := scraped_delta + n_scraped;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                SELECT count(*), count(external_url) INTO n, n_scraped FROM old_rows;
+                total_delta := total_delta - n;
+                scraped_delta := scraped_delta - n_scraped;
+            END IF;
+            IF total_delta <> 0 THEN
+                UPDATE job_counters SET value = value + total_delta WHERE name = 'jobs_total';
+            END IF;
+            IF scraped_delta <> 0 THEN
+                UPDATE job_counters SET value = value + scraped_delta WHERE name = 'jobs_scraped';
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER jobs_counters_update_trigger
+        AFTER UPDATE ON jobs REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION jobs_counters_update()
+    """)
+    op.execute("DROP FUNCTION IF EXISTS jobs_scraped_counter_update()")
+    op.execute("DROP FUNCTION IF EXISTS job_counters_add(text, bigint)")
+
+    # Fold the shards back into one row per counter
+    op.execute("""
+        INSERT INTO job_counters (name, shard, value)
+        SELECT name, 0, sum(value) FROM job_counters GROUP BY name
+        ON CONFLICT (name, shard) DO UPDATE SET value = EXCLUDED.value
+    """)
+    op.execute("DELETE FROM job_counters WHERE shard <> 0")
+    op.drop_constraint('job_counters_pkey', 'job_counters', type_='primary')
+    op.create_primary_key('job_counters_pkey', 'job_counters', ['name'])
+    op.drop_column('job_counters', 'shard')
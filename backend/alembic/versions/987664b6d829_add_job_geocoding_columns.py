@@ -0,0 +1,36 @@
+"""add geocoded location columns to jobs
+
+Revision ID: 987664b6d829
+Revises: 3931587f766c
+Create Date: 2026-10-18 21:47:12.304158
+
+Existing rows are filled by ``python -m app.services.geo --backfill``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '987664b6d829'
+down_revision: Union[str, Sequence[str], None] = '3931587f766c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('jobs', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('jobs', sa.Column('geo_cell', sa.BigInteger(), nullable=True))
+    op.create_index('ix_jobs_active_geo_cell', 'jobs', ['geo_cell'], unique=False,
+                    postgresql_where=sa.text("status = 'active'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_active_geo_cell', table_name='jobs')
+    op.drop_column('jobs', 'geo_cell')
+    op.drop_column('jobs', 'longitude')
+    op.drop_column('jobs', 'latitude')
@@ -0,0 +1,32 @@
+"""drop ix_jobs_active_posted_date, covered by ix_jobs_status_posted_date_id
+
+Revision ID: a3f7d92c1b60
+Revises: 7c1e9a3b52d4
+Create Date: 2026-10-18 04:02:11.604310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f7d92c1b60'
+down_revision: Union[str, Sequence[str], None] = '7c1e9a3b52d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (status, posted_date, id) serves the status = 'active' listing order as well
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_jobs_active_posted_date', table_name='jobs', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_jobs_active_posted_date', 'jobs', ['posted_date', 'id'], unique=False,
+                        postgresql_where=sa.text("status = 'active'"), postgresql_concurrently=True)
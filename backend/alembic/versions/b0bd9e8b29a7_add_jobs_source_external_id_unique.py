@@ -0,0 +1,38 @@
+"""add unique (source_id, external_id) key for scraped job ingest
+
+Revision ID: b0bd9e8b29a7
+Revises: 28f088b6a828
+Create Date: 2026-10-18 14:03:27.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b0bd9e8b29a7'
+down_revision: Union[str, Sequence[str], None] = '28f088b6a828'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the oldest row of any existing (source_id, external_id) pair as the keyed one
+    op.execute("""
+        UPDATE jobs SET external_id = NULL
+        WHERE external_id IS NOT NULL
+          AND id NOT IN (
+              SELECT min(id) FROM jobs
+              WHERE external_id IS NOT NULL
+              GROUP BY source_id, external_id
+          )
+    """)
+    op.create_index('uq_jobs_source_external_id', 'jobs', ['source_id', 'external_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_jobs_source_external_id', table_name='jobs')
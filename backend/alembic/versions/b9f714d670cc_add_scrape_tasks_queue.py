@@ -0,0 +1,60 @@
+"""add scrape_tasks queue
+
+Revision ID: b9f714d670cc
+Revises: e4c32261ba69
+Create Date: 2026-10-18 18:05:36.227410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9f714d670cc'
+down_revision: Union[str, Sequence[str], None] = 'e4c32261ba69'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('scrape_tasks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(length=100), nullable=False),
+    sa.Column('query', sa.String(length=255), nullable=False),
+    sa.Column('location', sa.String(length=255), nullable=False),
+    sa.Column('limit', sa.Integer(), nullable=False),
+    sa.Column('requested_by_id', sa.Integer(), nullable=True),
+    sa.Column(
+        'status',
+        sa.Enum('queued', 'running', 'succeeded', 'failed', name='scrape_task_status',
+                native_enum=False, create_constraint=True),
+        server_default='queued',
+        nullable=False,
+    ),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('max_attempts', sa.Integer(), server_default='3', nullable=False),
+    sa.Column('run_after', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('locked_by', sa.String(length=255), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('jobs_found', sa.Integer(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['requested_by_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_scrape_tasks_id'), 'scrape_tasks', ['id'], unique=False)
+    op.create_index('ix_scrape_tasks_queued_run_after', 'scrape_tasks', ['run_after', 'id'], unique=False,
+                    postgresql_where=sa.text("status = 'queued'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_scrape_tasks_queued_run_after', table_name='scrape_tasks',
+                  postgresql_where=sa.text("status = 'queued'"))
+    op.drop_index(op.f('ix_scrape_tasks_id'), table_name='scrape_tasks')
+    op.drop_table('scrape_tasks')
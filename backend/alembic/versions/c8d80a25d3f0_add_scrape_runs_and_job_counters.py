@@ -0,0 +1,127 @@
+"""add scrape_runs history and trigger-maintained job counters
+
+Revision ID: c8d80a25d3f0
+Revises: b9f714d670cc
+Create Date: 2026-10-18 19:02:14.618305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d80a25d3f0'
+down_revision: Union[str, Sequence[str], None] = 'b9f714d670cc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('scrape_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=True),
+    sa.Column('source', sa.String(length=100), nullable=False),
+    sa.Column('query', sa.String(length=255), nullable=False),
+    sa.Column('location', sa.String(length=255), nullable=False),
+    sa.Column('triggered_by_id', sa.Integer(), nullable=True),
+    sa.Column(
+        'status',
+        sa.Enum('running', 'completed', 'failed', name='scrape_run_status',
+                native_enum=False, create_constraint=True),
+        server_default='running',
+        nullable=False,
+    ),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('pages_fetched', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('bytes_downloaded', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('jobs_found', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('jobs_saved', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('jobs_duplicated', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['task_id'], ['scrape_tasks.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['triggered_by_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_scrape_runs_id'), 'scrape_runs', ['id'], unique=False)
+
+    op.add_column('scraped_jobs', sa.Column('scrape_run_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_scraped_jobs_scrape_run_id_scrape_runs', 'scraped_jobs', 'scrape_runs',
+                          ['scrape_run_id'], ['id'], ondelete='SET NULL')
+
+    op.create_table('job_counters',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION jobs_counters_update() RETURNS trigger AS $$
+        DECLARE
+            total_delta bigint := 0;
+            scraped_delta bigint := 0;
+            n bigint;
+            n_scraped bigint;
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                SELECT count(*), count(external_url) INTO n, n_scraped FROM new_rows;
+                total_delta := total_delta + n;
+                scraped_delta := scraped_delta + n_scraped;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                SELECT count(*), count(external_url) INTO n, n_scraped FROM old_rows;
+                total_delta := total_delta - n;
+                scraped_delta := scraped_delta - n_scraped;
+            END IF;
+            IF total_delta <> 0 THEN
+                UPDATE job_counters SET value = value + total_delta WHERE name = 'jobs_total';
+            END IF;
+            IF scraped_delta <> 0 THEN
+                UPDATE job_counters SET value = value + scraped_delta WHERE name = 'jobs_scraped';
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+
+    # Seed and install the triggers under a lock so no write slips in between
+    op.execute("LOCK TABLE jobs IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("""
+        INSERT INTO job_counters (name, value)
+        SELECT 'jobs_total', count(*) FROM jobs
+        UNION ALL
+        SELECT 'jobs_scraped', count(external_url) FROM jobs
+    """)
+    op.execute("""
+        CREATE TRIGGER jobs_counters_insert_trigger
+        AFTER INSERT ON jobs REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION jobs_counters_update()
+    """)
+    op.execute("""
+        CREATE TRIGGER jobs_counters_update_trigger
+        AFTER UPDATE ON jobs REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION jobs_counters_update()
+    """)
+    op.execute("""
+        CREATE TRIGGER jobs_counters_delete_trigger
+        AFTER DELETE ON jobs REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION jobs_counters_update()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS jobs_counters_delete_trigger ON jobs")
+    op.execute("DROP TRIGGER IF EXISTS jobs_counters_update_trigger ON jobs")
+    op.execute("DROP TRIGGER IF EXISTS jobs_counters_insert_trigger ON jobs")
+    op.execute("DROP FUNCTION IF EXISTS jobs_counters_update()")
+    op.drop_table('job_counters')
+    op.drop_constraint('fk_scraped_jobs_scrape_run_id_scrape_runs', 'scraped_jobs', type_='foreignkey')
+    op.drop_column('scraped_jobs', 'scrape_run_id')
+    op.drop_index(op.f('ix_scrape_runs_id'), table_name='scrape_runs')
+    op.drop_table('scrape_runs')
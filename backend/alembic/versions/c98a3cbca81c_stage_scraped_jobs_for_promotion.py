@@ -0,0 +1,36 @@
+"""stage scraped jobs for batch promotion
+
+Revision ID: c98a3cbca81c
+Revises: b0bd9e8b29a7
+Create Date: 2026-10-18 15:21:09.640127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c98a3cbca81c'
+down_revision: Union[str, Sequence[str], None] = 'b0bd9e8b29a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('scraped_jobs', sa.Column('scraped_by_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_scraped_jobs_scraped_by_id_users', 'scraped_jobs', 'users',
+                          ['scraped_by_id'], ['id'], ondelete='SET NULL')
+    op.execute("UPDATE scraped_jobs SET is_processed = false WHERE is_processed IS NULL")
+    op.create_index('ix_scraped_jobs_unprocessed', 'scraped_jobs', ['id'], unique=False,
+                    postgresql_where=sa.text("is_processed = false"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_scraped_jobs_unprocessed', table_name='scraped_jobs',
+                  postgresql_where=sa.text("is_processed = false"))
+    op.drop_constraint('fk_scraped_jobs_scraped_by_id_users', 'scraped_jobs', type_='foreignkey')
+    op.drop_column('scraped_jobs', 'scraped_by_id')
@@ -0,0 +1,38 @@
+"""add keyset pagination index on jobs
+
+Revision ID: d1b66d621f87
+Revises: 44b43a38218c
+Create Date: 2026-10-18 10:04:17.228410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1b66d621f87'
+down_revision: Union[str, Sequence[str], None] = '44b43a38218c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Cursors are keyed on (posted_date, id), so posted_date can't be NULL
+    op.execute("UPDATE jobs SET posted_date = coalesce(created_at, now()) WHERE posted_date IS NULL")
+    op.alter_column('jobs', 'posted_date',
+               existing_type=sa.DateTime(timezone=True),
+               existing_server_default=sa.text('now()'),
+               nullable=False)
+    op.create_index('ix_jobs_status_posted_date_id', 'jobs', ['status', 'posted_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_status_posted_date_id', table_name='jobs')
+    op.alter_column('jobs', 'posted_date',
+               existing_type=sa.DateTime(timezone=True),
+               existing_server_default=sa.text('now()'),
+               nullable=True)
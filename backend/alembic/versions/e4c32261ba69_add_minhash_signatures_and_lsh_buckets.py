@@ -0,0 +1,41 @@
+"""add MinHash signatures and LSH buckets for near-duplicate detection
+
+Revision ID: e4c32261ba69
+Revises: c98a3cbca81c
+Create Date: 2026-10-18 16:47:52.381904
+
+Existing jobs get signatures from ``python -m app.services.dedup --backfill``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c32261ba69'
+down_revision: Union[str, Sequence[str], None] = 'c98a3cbca81c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('minhash', sa.LargeBinary(), nullable=True))
+    op.add_column('scraped_jobs', sa.Column('minhash', sa.LargeBinary(), nullable=True))
+    op.create_table('job_lsh_buckets',
+    sa.Column('band', sa.SmallInteger(), nullable=False),
+    sa.Column('bucket', sa.BigInteger(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('band', 'bucket', 'job_id')
+    )
+    op.create_index('ix_job_lsh_buckets_job_id', 'job_lsh_buckets', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_lsh_buckets_job_id', table_name='job_lsh_buckets')
+    op.drop_table('job_lsh_buckets')
+    op.drop_column('scraped_jobs', 'minhash')
+    op.drop_column('jobs', 'minhash')
@@ -1,22 +1,54 @@
-from fastapi import Depends, HTTPException, Header
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import os
+import threading
+import time
 import jwt
 from jwt import ExpiredSignatureError, InvalidTokenError
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.cache import TTLCache
+from app.database import get_async_db
 from app.models.user import User
-from typing import Optional
 
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-only-change-me")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "120"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+# Opt-in: authenticate from the admin/active claims in the token when they're
+# newer than the user's last flag change. Revocations are only seen by the
+# process whose ORM session made the change (not other workers, restarted
+# processes, raw SQL or bulk updates), so a demoted or deactivated user can
+# keep the old flags until the token expires. Enable only for single-process
+# deployments that change user flags through the ORM.
+TRUST_TOKEN_CLAIMS = os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "false").lower() == "true"
+
+# bcrypt work factor; keep it low only for tests and seeding. Hashes below
+# the current cost are upgraded on the next successful login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# bcrypt releases the GIL, so this many hashes really do run in parallel
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=31,
+)
+
+# Dedicated pool so a burst of logins queues here instead of tying up the
+# shared threadpool that sync routes and dependencies run on
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
 
 security = HTTPBearer(auto_error=True)
 
@@ -26,26 +58,97 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash several passwords in parallel on the password executor"""
+    return list(password_executor.map(get_password_hash, passwords))
+
+async def hash_password_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Check a password off the event loop.
+
+    Returns (valid, new_hash); new_hash is set when the stored hash uses an
+    outdated scheme or cost and should be replaced.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Authenticated principal, detached from any DB session so it can be cached"""
+    id: int
+    email: str
+    first_name: str
+    last_name: str
+    is_admin: bool
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            is_admin=user.is_admin,
+            is_active=user.is_active,
+        )
+
+user_cache = TTLCache(maxsize=USER_CACHE_MAX_ENTRIES, ttl=USER_CACHE_TTL_SECONDS)
+
+# user id -> when is_active/is_admin last changed; claims issued before it are ignored
+_claims_revoked_at: Dict[int, float] = {}
+_claims_revoked_lock = threading.Lock()
+
+def token_claims(user) -> dict:
+    """Access-token claims for a User or CurrentUser"""
+    return {
+        "sub": str(user.id),
+        "email": user.email,
+        "fn": user.first_name,
+        "ln": user.last_name,
+        "adm": user.is_admin,
+        "act": user.is_active,
+    }
+
+def invalidate_user(user_id: int):
+    """Drop a cached principal and stop trusting claims in tokens issued until now"""
+    user_cache.pop(user_id)
+    now = time.time()
+    cutoff = now - ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    with _claims_revoked_lock:
+        _claims_revoked_at[user_id] = now
+        for stale_id in [uid for uid, at in _claims_revoked_at.items() if at < cutoff]:
+            del _claims_revoked_at[stale_id]
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+    issued_at = datetime.now(timezone.utc)
+    expire = issued_at + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode["exp"] = expire
+    to_encode["iat"] = issued_at
     if "sub" in to_encode:
         to_encode["sub"] = str(to_encode["sub"])
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 def verify_token(token: str) -> int:
+    return int(decode_token(token)["sub"])
+
+def decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         sub = payload.get("sub")
-        if sub is None:
+        if sub is None or not str(sub).isdigit():
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        # Cast back to int for DB lookups
-        return int(sub)
+        return payload
     except ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -65,13 +168,48 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
         return None
     return user
 
-def get_current_user(
+def _principal_from_claims(payload: dict) -> Optional[CurrentUser]:
+    if not TRUST_TOKEN_CLAIMS:
+        return None
+    if any(claim not in payload for claim in ("email", "fn", "ln", "adm", "act", "iat")):
+        return None
+    user_id = int(payload["sub"])
+    with _claims_revoked_lock:
+        revoked_at = _claims_revoked_at.get(user_id)
+    if revoked_at is not None and payload["iat"] <= revoked_at:
+        return None
+    return CurrentUser(
+        id=user_id,
+        email=payload["email"],
+        first_name=payload["fn"],
+        last_name=payload["ln"],
+        is_admin=bool(payload["adm"]),
+        is_active=bool(payload["act"]),
+    )
+
+async def resolve_user(payload: dict, db: AsyncSession) -> Optional[CurrentUser]:
+    """Principal for a decoded token: cache, then token claims, then the users table"""
+    user_id = int(payload["sub"])
+    principal = user_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    principal = _principal_from_claims(payload)
+    if principal is None:
+        user = await db.get(User, user_id)
+        if user is None:
+            return None
+        principal = CurrentUser.from_user(user)
+
+    user_cache.set(user_id, principal)
+    return principal
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
+    db: AsyncSession = Depends(get_async_db),
+) -> CurrentUser:
     token = credentials.credentials
-    user_id = verify_token(token)
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await resolve_user(decode_token(token), db)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -85,7 +223,7 @@ def get_current_user(
         )
     return user
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_admin_user(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -95,18 +233,17 @@ def get_current_admin_user(current_user: User = Depends(get_current_user)) -> Us
 
 security_optional = HTTPBearer(auto_error=False)
 
-def get_current_user_optional(
+async def get_current_user_optional(
     credentials: HTTPAuthorizationCredentials = Depends(security_optional),
-    db: Session = Depends(get_db),
-) -> Optional[User]:
+    db: AsyncSession = Depends(get_async_db),
+) -> Optional[CurrentUser]:
     """Get current user if credentials are provided, otherwise return None"""
     if not credentials:
         return None
 
     try:
         token = credentials.credentials
-        user_id = verify_token(token)
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await resolve_user(decode_token(token), db)
 
         if user is None or not user.is_active:
             return None
@@ -114,3 +251,17 @@ def get_current_user_optional(
         return user
     except:
         return None
+
+def _invalidate_changed_user(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.is_active.history.has_changes() or state.attrs.is_admin.history.has_changes():
+        invalidate_user(target.id)
+    else:
+        user_cache.pop(target.id)
+
+def _invalidate_deleted_user(mapper, connection, target):
+    invalidate_user(target.id)
+
+# ORM-level updates only; bulk query.update() calls must call invalidate_user()
+event.listen(User, "after_update", _invalidate_changed_user)
+event.listen(User, "after_delete", _invalidate_deleted_user)
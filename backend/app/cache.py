@@ -0,0 +1,231 @@
+import abc
+import enum
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+
+from fastapi import Request, Response
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory").lower()
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL", "redis://localhost:6379/0")
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+
+# Anonymous /jobs reads are cached under this namespace; every write to jobs invalidates it
+JOBS_CACHE_NAMESPACE = "jobs"
+
+
+class CacheBackend(abc.ABC):
+    """Byte-string store behind ResponseCache"""
+
+    # Whether other processes (API workers, scrape workers, promoters) see the same store
+    shared: bool = False
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float):
+        ...
+
+    @abc.abstractmethod
+    async def incr(self, key: str) -> int:
+        ...
+
+    @abc.abstractmethod
+    async def get_counter(self, key: str) -> int:
+        ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU; each worker keeps (and invalidates) its own copy.
+
+    Invalidations made in another process never reach it, so jobs written by
+    the scrape worker or the staging promoters only show up in cached
+    listings once the entries expire (RESPONSE_CACHE_TTL_SECONDS). Use the
+    redis backend when those run as separate processes.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._counters: Dict[str, int] = {}
+        self._counters_lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._entries.set(key, value, ttl)
+
+    async def incr(self, key: str) -> int:
+        with self._counters_lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    async def get_counter(self, key: str) -> int:
+        with self._counters_lock:
+            return self._counters.get(key, 0)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared backend so every worker sees the same entries and invalidations"""
+
+    shared = True
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package")
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self._client.set(key, value, ex=max(int(ttl), 1))
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(key)
+
+    async def get_counter(self, key: str) -> int:
+        return int(await self._client.get(key) or 0)
+
+
+def create_cache_backend() -> Optional[CacheBackend]:
+    if RESPONSE_CACHE_BACKEND == "none":
+        return None
+    if RESPONSE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(RESPONSE_CACHE_URL)
+    if RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS)
+    raise RuntimeError(f"Unknown RESPONSE_CACHE_BACKEND '{RESPONSE_CACHE_BACKEND}'")
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+
+    def to_response(self, request: Request) -> Response:
+        """Full JSON response, or a bodiless 304 when the client already has this ETag"""
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+class ResponseCache:
+    """Serialized responses keyed by namespace + normalized query parameters.
+
+    Writers call ``invalidate(namespace)``, which bumps the namespace's
+    generation number; it is part of every key, so older entries simply stop
+    being looked up and age out of the backend.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @property
+    def shared(self) -> bool:
+        """Whether an invalidation from this process reaches the API workers' caches"""
+        return self.backend is not None and self.backend.shared
+
+    async def key(self, namespace: str, params: Dict[str, Any]) -> str:
+        generation = await self.backend.get_counter(f"gen:{namespace}")
+        normalized = sorted(
+            (name, normalize_param(value))
+            for name, value in params.items()
+            if value is not None
+        )
+        digest = hashlib.sha256(json.dumps(normalized, default=str).encode()).hexdigest()
+        return f"resp:{namespace}:{generation}:{digest}"
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        stored = await self.backend.get(key)
+        if not stored:
+            return None
+        etag, _, body = stored.partition(b"\n")
+        return CachedResponse(body=body, etag=etag.decode())
+
+    async def set(self, key: str, body: bytes) -> CachedResponse:
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+        await self.backend.set(key, etag.encode() + b"\n" + body, self.ttl)
+        return CachedResponse(body=body, etag=etag)
+
+    async def invalidate(self, namespace: str):
+        if self.backend is not None:
+            await self.backend.incr(f"gen:{namespace}")
+
+
+def normalize_param(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        value = value.value
+    if isinstance(value, str):
+        return " ".join(value.split())
+    return value
+
+
+response_cache = ResponseCache(create_cache_backend(), ttl=RESPONSE_CACHE_TTL_SECONDS)
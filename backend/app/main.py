@@ -1,15 +1,32 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.auth import CurrentUser, get_current_admin_user
+from app.database import pool_status
+from app.services.scrapers.executor import scraper_executor
+import app.services.dedup  # noqa: F401  (registers the Job signature/LSH bucket events)
+import app.services.salary  # noqa: F401  (registers the Job salary column events)
+import app.services.geo  # noqa: F401  (registers the Job geocoding events)
 import app.routers.jobs as jobs
 import app.routers.users as users
-# import app.routers.scraping as scraping
+import app.routers.scraping as scraping
 # import app.routers.applications as applications
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await scraper_executor.start()
+    try:
+        yield
+    finally:
+        await scraper_executor.stop()
+
 app = FastAPI(
     title="Job Board API",
     version="1.0.0",
     description="A job board API built with FastAPI",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -23,7 +40,7 @@ app.add_middleware(
 # 🔗 Routers
 app.include_router(jobs.router, prefix="")
 app.include_router(users.router, prefix="")
-# app.include_router(scraping.router)
+app.include_router(scraping.router)
 # app.include_router(applications.router, prefix="")
 
 @app.get("/")
@@ -33,3 +50,8 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/db-pool")
+def db_pool_health(current_user: CurrentUser = Depends(get_current_admin_user)):
+    """Connection pool usage (admins only); watch checked_out/overflow/wait_ms for exhaustion"""
+    return pool_status()
@@ -4,8 +4,15 @@ from .application import Application, ApplicationStatus
 from .user import User
 from .job_source import JobSource
 from .scraped_job import ScrapedJob
+from .job_lsh_bucket import JobLshBucket
+from .scrape_task import ScrapeTask, ScrapeTaskStatus
+from .scrape_run import ScrapeRun, ScrapeRunStatus
+from .job_counter import JobCounter
+from .scrape_watermark import ScrapeWatermark
 
 __all__ = [
   "BaseModel", "Application", "ApplicationStatus", "User",
-  "Job", "JobStatus", "JobSource", "ScrapedJob", "CompanySize", "ExperienceLevel"
+  "Job", "JobStatus", "JobSource", "ScrapedJob", "JobLshBucket", "ScrapeTask", "ScrapeTaskStatus",
+  "ScrapeRun", "ScrapeRunStatus", "JobCounter", "ScrapeWatermark",
+  "CompanySize", "ExperienceLevel"
 ]
\ No newline at end of file
@@ -1,8 +1,11 @@
-from sqlalchemy import Column, DateTime, Integer, Boolean, String, Text, ForeignKey, Enum as SAEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, DateTime, Float, Integer, Boolean, LargeBinary, String, Text, ForeignKey, Index, DDL, event, text, Enum as SAEnum
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from app.models.base import BaseModel
+from app.models.job_counter import JOB_COUNTER_SHARDS
 from sqlalchemy.sql import func
 import enum
+from datetime import datetime, timezone
 
 class JobStatus(str, enum.Enum):
     ACTIVE = "active"
@@ -27,12 +30,61 @@ class ExperienceLevel(str, enum.Enum):
 
 class Job(BaseModel):
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        # Listing order and keyset pagination: WHERE status = ? ORDER BY posted_date DESC, id DESC
+        Index("ix_jobs_status_posted_date_id", "status", "posted_date", "id"),
+        Index("ix_jobs_status_company_size_posted_date", "status", "company_size", "posted_date"),
+        Index("ix_jobs_status_experience_level_posted_date", "status", "experience_level", "posted_date"),
+        # Substring ILIKE filters on location/company
+        Index(
+            "ix_jobs_location_trgm", "location",
+            postgresql_using="gin", postgresql_ops={"location": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_jobs_company_trgm", "company",
+            postgresql_using="gin", postgresql_ops={"company": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # min_salary / max_salary listing filters (app/routers/jobs.py); an open
+        # end of a range ("Up to $90K") falls back to the other end
+        Index(
+            "ix_jobs_active_salary_top",
+            text("coalesce(salary_max, salary_min)"),
+            postgresql_where=text("status = 'active'"),
+            sqlite_where=text("status = 'active'"),
+        ),
+        Index(
+            "ix_jobs_active_salary_floor",
+            text("coalesce(salary_min, salary_max)"),
+            postgresql_where=text("status = 'active'"),
+            sqlite_where=text("status = 'active'"),
+        ),
+        # near/radius_km listing filter: geo_cell range scans (app/services/geo.py)
+        Index(
+            "ix_jobs_active_geo_cell",
+            "geo_cell",
+            postgresql_where=text("status = 'active'"),
+            sqlite_where=text("status = 'active'"),
+        ),
+        # Title/company duplicate lookup in scraped job ingest (app/services/ingest.py)
+        Index("ix_jobs_title_company", "title", "company"),
+        # Conflict target for scraped job ingest (app/services/ingest.py)
+        Index("uq_jobs_source_external_id", "source_id", "external_id", unique=True),
+    )
 
     title = Column(String(255), nullable=False)
     company = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     location = Column(String(255))
+    # Geocoded location and its Z-order cell, set by app/services/geo.py
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geo_cell = Column(BigInteger, nullable=True)
     salary_range = Column(String(100))
+    # Annualized salary_range, parsed by app/services/salary.py
+    salary_min = Column(Integer, nullable=True)
+    salary_max = Column(Integer, nullable=True)
+    salary_currency = Column(String(3), nullable=True)
     application_url = Column(String(500), nullable=False)
 
     # New fields
@@ -73,7 +125,12 @@ class Job(BaseModel):
         server_default=JobStatus.ACTIVE.value,
     )
 
-    posted_date = Column(DateTime(timezone=True), server_default=func.now())
+    posted_date = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False,
+    )
     posted_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=False)
     posted_by = relationship("User", back_populates="jobs_posted")
 
@@ -82,6 +139,13 @@ class Job(BaseModel):
     external_url = Column(String(500), nullable=True)
     is_scraped = Column(Boolean, default=False)
 
+    # Weighted tsvector over title (A), company (B) and description (C).
+    # Maintained by the jobs_search_vector_trigger on Postgres; unused elsewhere.
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=True))
+
+    # Packed MinHash signature for near-duplicate detection (app/services/dedup.py)
+    minhash = deferred(Column(LargeBinary, nullable=True))
+
     source = relationship("JobSource", back_populates="jobs")
     applications = relationship(
         "Application",
@@ -110,4 +174,110 @@ class Job(BaseModel):
             ExperienceLevel.PRINCIPAL: "Principal",
             ExperienceLevel.EXECUTIVE: "Executive"
         }
-        return level_map.get(self.experience_level) if self.experience_level else None
\ No newline at end of file
+        return level_map.get(self.experience_level) if self.experience_level else None
+
+JOB_SEARCH_VECTOR_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION jobs_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.company, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+""")
+
+JOB_SEARCH_VECTOR_TRIGGER = DDL("""
+CREATE TRIGGER jobs_search_vector_trigger
+BEFORE INSERT OR UPDATE OF title, company, description ON jobs
+FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update()
+""")
+
+# Keep metadata.create_all() (seed_data.py) in step with the migrations
+event.listen(Job.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
+event.listen(Job.__table__, "after_create", JOB_SEARCH_VECTOR_FUNCTION.execute_if(dialect="postgresql"))
+event.listen(Job.__table__, "after_create", JOB_SEARCH_VECTOR_TRIGGER.execute_if(dialect="postgresql"))
+
+# jobs_total / jobs_scraped in job_counters (app/models/job_counter.py), so the
+# admin stats never count the table. Inserts and deletes are counted per
+# statement, so a multi-row insert touches each counter once, and into the
+# writing connection's shard, so concurrent writers don't serialize on one
+# row. Updates can't change the total; only a row whose external_url
+# appears or disappears fires the (row-level) update trigger.
+JOB_COUNTERS_ADD_FUNCTION = DDL(f"""
+CREATE OR REPLACE FUNCTION job_counters_add(counter text, delta bigint) RETURNS void AS $$
+BEGIN
+    INSERT INTO job_counters (name, shard, value)
+    VALUES (counter, mod(pg_backend_pid(), {JOB_COUNTER_SHARDS}), delta)
+    ON CONFLICT (name, shard) DO UPDATE SET value = job_counters.value + EXCLUDED.value;
+END
+$$ LANGUAGE plpgsql
+""")
+
+JOB_COUNTERS_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION jobs_counters_update() RETURNS trigger AS $$
+DECLARE
+    n bigint;
+    n_scraped bigint;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT count(*), count(external_url) INTO n, n_scraped FROM new_rows;
+    ELSE
+        SELECT -count(*), -count(external_url) INTO n, n_scraped FROM old_rows;
+    END IF;
+    IF n <> 0 THEN
+        PERFORM job_counters_add('jobs_total', n);
+    END IF;
+    IF n_scraped <> 0 THEN
+        PERFORM job_counters_add('jobs_scraped', n_scraped);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+""")
+
+JOB_SCRAPED_COUNTER_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION jobs_scraped_counter_update() RETURNS trigger AS $$
+BEGIN
+    PERFORM job_counters_add('jobs_scraped', CASE WHEN NEW.external_url IS NULL THEN -1 ELSE 1 END);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+""")
+
+# Transition tables need one trigger per event, and can't be combined with a
+# column list, so the update trigger is row-level and filtered by WHEN
+JOB_COUNTERS_TRIGGERS = [
+    DDL("""
+CREATE TRIGGER jobs_counters_insert_trigger
+AFTER INSERT ON jobs REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION jobs_counters_update()
+"""),
+    DDL("""
+CREATE TRIGGER jobs_counters_update_trigger
+AFTER UPDATE OF external_url ON jobs
+FOR EACH ROW WHEN ((OLD.external_url IS NULL) IS DISTINCT FROM (NEW.external_url IS NULL))
+EXECUTE FUNCTION jobs_scraped_counter_update()
+"""),
+    DDL("""
+CREATE TRIGGER jobs_counters_delete_trigger
+AFTER DELETE ON jobs REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION jobs_counters_update()
+"""),
+]
+
+for function in (JOB_COUNTERS_ADD_FUNCTION, JOB_COUNTERS_FUNCTION, JOB_SCRAPED_COUNTER_FUNCTION):
+    event.listen(Job.__table__, "after_create", function.execute_if(dialect="postgresql"))
+for trigger in JOB_COUNTERS_TRIGGERS:
+    event.listen(Job.__table__, "after_create", trigger.execute_if(dialect="postgresql"))
+
+# The planner doesn't use the statistics ANALYZE keeps for partial index
+# expressions, so without these the salary filters are always estimated at a
+# third of the rows and ix_jobs_active_salary_top/floor are never chosen
+JOB_SALARY_STATISTICS = DDL("""
+CREATE STATISTICS jobs_salary_bounds_stats
+ON (coalesce(salary_max, salary_min)), (coalesce(salary_min, salary_max)) FROM jobs
+""")
+
+event.listen(Job.__table__, "after_create", JOB_SALARY_STATISTICS.execute_if(dialect="postgresql"))
@@ -0,0 +1,29 @@
+from sqlalchemy import BigInteger, Column, DDL, SmallInteger, String, event
+from app.database import Base
+
+class JobCounter(Base):
+    """One shard of a row count over ``jobs``, kept current by triggers on Postgres (see app/models/job.py).
+
+    Each writing connection adds to its own shard (``pg_backend_pid()`` modulo
+    ``JOB_COUNTER_SHARDS``) so concurrent job writers don't queue on a single
+    row; a counter's value is the sum of its shards.
+    """
+    __tablename__ = "job_counters"
+
+    name = Column(String(50), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True, default=0, server_default="0")
+    value = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<JobCounter(name='{self.name}', shard={self.shard}, value={self.value})>"
+
+JOB_COUNTER_NAMES = ("jobs_total", "jobs_scraped")
+# Shards per counter; job_counters_add() (app/models/job.py) picks one per connection
+JOB_COUNTER_SHARDS = 16
+
+# Tables are created empty, so the counters start at zero; the migration seeds them from COUNT(*)
+event.listen(
+    JobCounter.__table__,
+    "after_create",
+    DDL("INSERT INTO job_counters (name, value) VALUES ('jobs_total', 0), ('jobs_scraped', 0)").execute_if(dialect="postgresql"),
+)
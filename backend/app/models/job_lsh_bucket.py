@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Index, Integer, SmallInteger
+from app.database import Base
+
+class JobLshBucket(Base):
+    """One LSH band bucket of a job's MinHash signature (see app/services/dedup.py)"""
+    __tablename__ = "job_lsh_buckets"
+    __table_args__ = (
+        Index("ix_job_lsh_buckets_job_id", "job_id"),
+    )
+
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+
+    def __repr__(self):
+        return f"<JobLshBucket(band={self.band}, bucket={self.bucket}, job_id={self.job_id})>"
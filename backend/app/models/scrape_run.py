@@ -0,0 +1,50 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String, Text, Enum as SAEnum
+from sqlalchemy.orm import relationship
+from app.models.base import BaseModel
+import enum
+from datetime import datetime, timezone
+
+class ScrapeRunStatus(str, enum.Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ScrapeRun(BaseModel):
+    """One execution of a scrape task, as shown in the admin scraping history"""
+    __tablename__ = "scrape_runs"
+
+    task_id = Column(Integer, ForeignKey("scrape_tasks.id", ondelete="SET NULL"), nullable=True)
+    source = Column(String(100), nullable=False)
+    query = Column(String(255), nullable=False)
+    location = Column(String(255), nullable=False)
+    triggered_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+
+    status = Column(
+        SAEnum(
+            ScrapeRunStatus,
+            name="scrape_run_status",
+            native_enum=False,
+            create_constraint=True,
+            validate_strings=True,
+            values_callable=lambda e: [m.value for m in e],
+        ),
+        nullable=False,
+        default=ScrapeRunStatus.RUNNING,
+        server_default=ScrapeRunStatus.RUNNING.value,
+    )
+    started_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    completed_at = Column(DateTime(timezone=True))
+
+    pages_fetched = Column(Integer, nullable=False, default=0, server_default="0")
+    bytes_downloaded = Column(BigInteger, nullable=False, default=0, server_default="0")
+    jobs_found = Column(Integer, nullable=False, default=0, server_default="0")
+    # Filled in as the staged rows are promoted, which may happen after the run completes
+    jobs_saved = Column(Integer, nullable=False, default=0, server_default="0")
+    jobs_duplicated = Column(Integer, nullable=False, default=0, server_default="0")
+    error = Column(Text)
+
+    task = relationship("ScrapeTask")
+    triggered_by = relationship("User")
+
+    def __repr__(self):
+        return f"<ScrapeRun(id={self.id}, source='{self.source}', status='{self.status}')>"
@@ -0,0 +1,61 @@
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, false, text, Enum as SAEnum
+from sqlalchemy.orm import relationship
+from app.models.base import BaseModel
+import enum
+from datetime import datetime, timezone
+
+class ScrapeTaskStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class ScrapeTask(BaseModel):
+    """A queued scrape run, executed by ``python -m app.services.scrape_queue``"""
+    __tablename__ = "scrape_tasks"
+    __table_args__ = (
+        # Workers claim the next runnable task: WHERE status = 'queued' ORDER BY run_after, id
+        Index(
+            "ix_scrape_tasks_queued_run_after",
+            "run_after",
+            "id",
+            postgresql_where=text("status = 'queued'"),
+            sqlite_where=text("status = 'queued'"),
+        ),
+    )
+
+    source = Column(String(100), nullable=False)
+    query = Column(String(255), nullable=False)
+    location = Column(String(255), nullable=False)
+    limit = Column(Integer, nullable=False)
+    requested_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    # Stop paging at the first page of already-seen postings (app/services/watermarks.py)
+    incremental = Column(Boolean, nullable=False, default=False, server_default=false())
+
+    status = Column(
+        SAEnum(
+            ScrapeTaskStatus,
+            name="scrape_task_status",
+            native_enum=False,
+            create_constraint=True,
+            validate_strings=True,
+            values_callable=lambda e: [m.value for m in e],
+        ),
+        nullable=False,
+        default=ScrapeTaskStatus.QUEUED,
+        server_default=ScrapeTaskStatus.QUEUED.value,
+    )
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts = Column(Integer, nullable=False, default=3, server_default="3")
+    # Not claimable before this; pushed back after a failed attempt
+    run_after = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    locked_by = Column(String(255))
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    jobs_found = Column(Integer)
+    last_error = Column(Text)
+
+    requested_by = relationship("User")
+
+    def __repr__(self):
+        return f"<ScrapeTask(id={self.id}, source='{self.source}', status='{self.status}')>"
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, Integer, JSON, String, UniqueConstraint
+from app.models.base import BaseModel
+
+class ScrapeWatermark(BaseModel):
+    """External ids already seen for one source/query/location, newest first.
+
+    Incremental scrapes page through results sorted by date and stop at the
+    first page made up entirely of these ids (app/services/watermarks.py).
+    """
+    __tablename__ = "scrape_watermarks"
+    __table_args__ = (
+        UniqueConstraint("source", "query", "location", name="uq_scrape_watermarks_source_query_location"),
+    )
+
+    source = Column(String(100), nullable=False)
+    # Lowercased with collapsed whitespace, so equivalent searches share a watermark
+    query = Column(String(255), nullable=False)
+    location = Column(String(255), nullable=False)
+    seen_external_ids = Column(JSON, nullable=False, default=list)
+    last_scraped_at = Column(DateTime(timezone=True))
+    last_new_jobs = Column(Integer)
+
+    def __repr__(self):
+        return f"<ScrapeWatermark(id={self.id}, source='{self.source}', query='{self.query}')>"
@@ -1,10 +1,19 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON, Index, LargeBinary, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
 class ScrapedJob(BaseModel):
     __tablename__ = "scraped_jobs"
+    __table_args__ = (
+        # Promotion workers claim the oldest unprocessed rows (app/services/staging.py)
+        Index(
+            "ix_scraped_jobs_unprocessed",
+            "id",
+            postgresql_where=text("is_processed = false"),
+            sqlite_where=text("is_processed = false"),
+        ),
+    )
 
     source_id = Column(Integer, ForeignKey("job_sources.id"), nullable=False)
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True)
@@ -22,12 +31,18 @@ class ScrapedJob(BaseModel):
     is_processed = Column(Boolean, default=False)
     is_duplicate = Column(Boolean, default=False)
     duplicate_of_job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True)
+    # Data completeness for new jobs; estimated similarity (0-100) to duplicate_of_job_id for duplicates
     confidence_score = Column(Integer, default=100)
+    minhash = Column(LargeBinary, nullable=True)
     has_description = Column(Boolean, default=True)
     has_salary = Column(Boolean, default=False)
     has_location = Column(Boolean, default=True)
     scraped_at = Column(DateTime(timezone=True), server_default=func.now())
     processed_at = Column(DateTime(timezone=True))
+    # Admin who triggered the scrape; promoted jobs are posted under their account
+    scraped_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    # Run that staged this row; promotion adds its outcome to the run's saved/duplicated counts
+    scrape_run_id = Column(Integer, ForeignKey("scrape_runs.id", ondelete="SET NULL"), nullable=True)
     source = relationship("JobSource", back_populates="scraped_jobs")
     job = relationship("Job", foreign_keys=[job_id])
     duplicate_of = relationship("Job", foreign_keys=[duplicate_of_job_id])
@@ -1,15 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional, Union
+from app.database import get_async_db
 from app.models import Job, JobStatus, CompanySize, ExperienceLevel
-from app.schemas import JobCreate, JobUpdate, JobResponse, JobSummary
-from app.auth import get_current_user
-from app.models.user import User
-from app.auth import get_current_user, get_current_user_optional
-from typing import Optional
+from app.schemas import JobCreate, JobUpdate, JobResponse, JobSummary, JobPage, JobFacets
+from app.auth import CurrentUser, get_current_user, get_current_user_optional
+from app.search import apply_search
+from app.pagination import encode_cursor, decode_cursor
+from app.cache import JOBS_CACHE_NAMESPACE, response_cache
+from app.services.geo import resolve_point, within_radius
+from app.services.job_counts import matching_count
+from app.services.job_facets import FACET_COLUMNS, facet_counts
+from app.services.job_listing import dump_json, summary_query, summary_rows
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+MAX_RADIUS_KM = 500
+
+_job_response_adapter = TypeAdapter(JobResponse)
+_job_facets_adapter = TypeAdapter(JobFacets)
+
+async def _cache_response(request: Request, cache_key: Optional[str], content, adapter: TypeAdapter):
+    """Return ``content`` unchanged, or store its JSON under ``cache_key`` and answer from the cache entry"""
+    if cache_key is None:
+        return content
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    entry = await response_cache.set(cache_key, body)
+    return entry.to_response(request)
+
+async def _json_response(request: Request, cache_key: Optional[str], body: bytes):
+    """Answer with already-serialized JSON, storing it under ``cache_key`` if given"""
+    if cache_key is None:
+        return Response(content=body, media_type="application/json")
+    entry = await response_cache.set(cache_key, body)
+    return entry.to_response(request)
+
 def parse_status(status_str: Optional[str]) -> Optional[JobStatus]:
     if not status_str:
         return None
@@ -18,69 +46,242 @@ def parse_status(status_str: Optional[str]) -> Optional[JobStatus]:
     except ValueError:
         return None
 
-@router.get("/", response_model=List[JobSummary])
-def list_jobs(
+class JobFilters:
+    """Listing filters shared by ``list_jobs`` and ``job_facets``.
+
+    Salary filters compare against the annualized ``salary_min`` /
+    ``salary_max`` columns (app/services/salary.py); a range open at one end
+    ("Up to $90K", "From $25 an hour") is compared on the end it has, and
+    jobs without a parsable salary never match. ``near`` / ``radius_km`` match jobs whose
+    geocoded location (app/services/geo.py) lies within the radius.
+    """
+
+    def __init__(
+        self,
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+        search_mode: str = Query(
+            "substring",
+            pattern="^(fulltext|substring)$",
+            description="substring: ILIKE on title/company (default); fulltext: ranked full-text search",
+        ),
+        location: Optional[str] = None,
+        company: Optional[str] = None,
+        company_size: Optional[CompanySize] = None,
+        experience_level: Optional[ExperienceLevel] = None,
+        min_salary: Optional[int] = Query(None, ge=0, description="Annual salary; matches jobs whose range reaches it"),
+        max_salary: Optional[int] = Query(None, ge=0, description="Annual salary; matches jobs whose range starts at or below it"),
+        salary_currency: Optional[str] = Query(None, pattern="^[A-Za-z]{3}$"),
+        near: Optional[str] = Query(None, description='Place name ("SF", "Austin, TX") or "lat,lon"'),
+        radius_km: float = Query(50, gt=0, le=MAX_RADIUS_KM),
+    ):
+        self.status = parse_status(status)
+        self.search = search
+        self.search_mode = search_mode
+        self.location = location
+        self.company = company
+        self.company_size = company_size
+        self.experience_level = experience_level
+        self.min_salary = min_salary
+        self.max_salary = max_salary
+        self.salary_currency = salary_currency.upper() if salary_currency else None
+        self.near = near
+        self.radius_km = radius_km
+
+    def cache_params(self) -> dict:
+        """The filters as response cache key parameters (anonymous requests, so no status)"""
+        return {
+            "search": self.search.lower() if self.search else None,
+            "search_mode": self.search_mode if self.search else None,
+            "location": self.location.lower() if self.location else None,
+            "company": self.company.lower() if self.company else None,
+            "company_size": self.company_size,
+            "experience_level": self.experience_level,
+            "min_salary": self.min_salary,
+            "max_salary": self.max_salary,
+            "salary_currency": self.salary_currency,
+            "near": " ".join(self.near.lower().split()) if self.near else None,
+            "radius_km": self.radius_km if self.near else None,
+        }
+
+    async def apply(
+        self,
+        query,
+        db: AsyncSession,
+        current_user: Optional[CurrentUser],
+        admin_default_status: Optional[JobStatus] = JobStatus.ACTIVE,
+    ):
+        """Restrict the ``query`` select over jobs; returns it with the search rank order (or None).
+
+        Everyone but admins only sees active jobs. Admins get ``status`` when
+        given, else ``admin_default_status`` (None: every status).
+        """
+        rank_order = None
+        if self.search and self.search_mode == "fulltext":
+            query, rank_order = await apply_search(query, db, self.search)
+        elif self.search:
+            search_term = f"%{self.search}%"
+            query = query.filter(
+                or_(
+                    Job.title.ilike(search_term),
+                    Job.company.ilike(search_term)
+                )
+            )
+
+        if current_user and current_user.is_admin:
+            status_filter = self.status or admin_default_status
+            if status_filter:
+                query = query.filter(Job.status == status_filter)
+        else:
+            query = query.filter(Job.status == JobStatus.ACTIVE)
+
+        if self.location:
+            query = query.filter(Job.location.ilike(f"%{self.location}%"))
+        if self.company:
+            query = query.filter(Job.company.ilike(f"%{self.company}%"))
+        if self.company_size:
+            query = query.filter(Job.company_size == self.company_size)
+        if self.experience_level:
+            query = query.filter(Job.experience_level == self.experience_level)
+        # Written exactly like the ix_jobs_active_salary_top/floor expressions so they use them
+        if self.min_salary is not None:
+            query = query.filter(func.coalesce(Job.salary_max, Job.salary_min) >= self.min_salary)
+        if self.max_salary is not None:
+            query = query.filter(func.coalesce(Job.salary_min, Job.salary_max) <= self.max_salary)
+        if self.salary_currency:
+            query = query.filter(Job.salary_currency == self.salary_currency)
+        if self.near:
+            point = resolve_point(self.near)
+            if point is None:
+                raise HTTPException(status_code=400, detail=f"Unknown location '{self.near}'")
+            query = query.filter(within_radius(*point, self.radius_km))
+        return query, rank_order
+
+@router.get("/", response_model=Union[List[JobSummary], JobPage])
+async def list_jobs(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    status: Optional[str] = None,
-    search: Optional[str] = None,
-    location: Optional[str] = None,
-    company: Optional[str] = None,
-    company_size: Optional[CompanySize] = None,
-    experience_level: Optional[ExperienceLevel] = None,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user_optional)
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset pagination: pass an empty value for the first page, then each response's next_cursor",
+    ),
+    with_total: bool = Query(False, description="Return a JobPage carrying the total number of matching jobs"),
+    description_chars: Optional[int] = Query(None, ge=1, le=10000, description="Cut descriptions to this many characters"),
+    filters: JobFilters = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[CurrentUser] = Depends(get_current_user_optional)
 ):
-    """List jobs with optional status filtering for admins"""
-    query = db.query(Job)
-
-    status_filter = None
-    if status:
-        try:
-            status_filter = JobStatus(status.lower())
-        except ValueError:
-            status_filter = None
-
-    if search:
-        search_term = f"%{search}%"
-        from sqlalchemy import or_
-        query = query.filter(
-            or_(
-                Job.title.ilike(search_term),
-                Job.company.ilike(search_term)
-            )
-        )
+    """List jobs with optional status filtering for admins.
+
+    With ``cursor`` set, pages are keyed on (posted_date, id) instead of
+    ``skip`` and the response is a JobPage carrying ``next_cursor``. Search
+    results are then ordered by recency rather than relevance.
+
+    ``with_total`` also makes the response a JobPage, with ``total`` exact up
+    to ``JOB_COUNT_EXACT_THRESHOLD`` matches and an estimate beyond
+    (``total_is_estimate``).
+
+    Rows are selected as JobSummary columns only and serialized straight to
+    JSON (app/services/job_listing.py); ``description_chars`` truncates
+    descriptions in the query.
+
+    Anonymous requests are served from the response cache with an ETag.
+    """
+    cache_key = None
+    if current_user is None and response_cache.enabled:
+        cache_key = await response_cache.key(JOBS_CACHE_NAMESPACE, {
+            "view": "list",
+            "skip": skip,
+            "limit": limit,
+            "cursor": cursor,
+            "with_total": with_total,
+            "description_chars": description_chars,
+            **filters.cache_params(),
+        })
+        cached = await response_cache.get(cache_key)
+        if cached is not None:
+            return cached.to_response(request)
+
+    query, rank_order = await filters.apply(summary_query(description_chars), db, current_user)
+    total, total_is_estimate = None, False
+    if with_total:
+        total, total_is_estimate = await matching_count(db, query)
 
-    if current_user and current_user.is_admin and status_filter:
-        query = query.filter(Job.status == status_filter)
-    else:
-        query = query.filter(Job.status == JobStatus.ACTIVE)
+    if cursor is not None:
+        if cursor:
+            posted_date, last_id = decode_cursor(cursor, 2)
+            try:
+                after = (datetime.fromisoformat(posted_date), int(last_id))
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            query = query.filter(tuple_(Job.posted_date, Job.id) < tuple_(*after))
 
-    if location:
-        query = query.filter(Job.location.ilike(f"%{location}%"))
-    if company:
-        query = query.filter(Job.company.ilike(f"%{company}%"))
-    if company_size:
-        query = query.filter(Job.company_size == company_size)
-    if experience_level:
-        query = query.filter(Job.experience_level == experience_level)
+        result = await db.execute(query.order_by(Job.posted_date.desc(), Job.id.desc()).limit(limit + 1))
+        rows = summary_rows(result)
+        jobs = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = jobs[-1]
+            next_cursor = encode_cursor([last["posted_date"].isoformat(), last["id"]])
+        page = {"items": jobs, "next_cursor": next_cursor, "total": total, "total_is_estimate": total_is_estimate}
+        return await _json_response(request, cache_key, dump_json(page))
 
-    jobs = query.offset(skip).limit(limit).all()
-    return jobs
+    if rank_order is not None:
+        query = query.order_by(rank_order)
+    query = query.order_by(Job.posted_date.desc(), Job.id.desc())
+
+    result = await db.execute(query.offset(skip).limit(limit))
+    jobs = summary_rows(result)
+    if with_total:
+        page = {"items": jobs, "next_cursor": None, "total": total, "total_is_estimate": total_is_estimate}
+        return await _json_response(request, cache_key, dump_json(page))
+    return await _json_response(request, cache_key, dump_json(jobs))
+
+@router.get("/facets", response_model=JobFacets)
+async def job_facets(
+    request: Request,
+    filters: JobFilters = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[CurrentUser] = Depends(get_current_user_optional)
+):
+    """Job counts per company size, experience level, status, location and company.
+
+    Counts cover the jobs ``list_jobs`` would return for the same filters
+    (admins without ``status``: every status), top ``JOB_FACET_LIMIT`` values
+    per facet. Anonymous requests are cached like listings.
+    """
+    cache_key = None
+    if current_user is None and response_cache.enabled:
+        cache_key = await response_cache.key(JOBS_CACHE_NAMESPACE, {"view": "facets", **filters.cache_params()})
+        cached = await response_cache.get(cache_key)
+        if cached is not None:
+            return cached.to_response(request)
+
+    query, _ = await filters.apply(select(*FACET_COLUMNS.values()), db, current_user, admin_default_status=None)
+    facets = await facet_counts(db, query.subquery())
+    return await _cache_response(request, cache_key, facets, _job_facets_adapter)
 
 @router.get("/{job_id}", response_model=JobResponse)
-def get_job(job_id: int, db: Session = Depends(get_db)):
+async def get_job(job_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get a specific job by ID"""
-    job = db.query(Job).filter(Job.id == job_id).first()
+    cache_key = None
+    if response_cache.enabled:
+        cache_key = await response_cache.key(JOBS_CACHE_NAMESPACE, {"view": "detail", "id": job_id})
+        cached = await response_cache.get(cache_key)
+        if cached is not None:
+            return cached.to_response(request)
+
+    job = await db.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
+    return await _cache_response(request, cache_key, job, _job_response_adapter)
 
 @router.post("/", response_model=JobResponse)
-def create_job(
+async def create_job(
     job: JobCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Create a new job posting"""
     job_data = job.dict()
@@ -88,19 +289,20 @@ def create_job(
 
     db_job = Job(**job_data)
     db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    await db.commit()
+    await response_cache.invalidate(JOBS_CACHE_NAMESPACE)
+    await db.refresh(db_job)
     return db_job
 
 @router.put("/{job_id}", response_model=JobResponse)
-def update_job(
+async def update_job(
     job_id: int,
     job_update: JobUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Update a job posting (only by the user who posted it)"""
-    db_job = db.query(Job).filter(Job.id == job_id).first()
+    db_job = await db.get(Job, job_id)
     if not db_job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -110,19 +312,20 @@ def update_job(
     for field, value in job_update.dict(exclude_unset=True).items():
         setattr(db_job, field, value)
 
-    db.commit()
-    db.refresh(db_job)
+    await db.commit()
+    await response_cache.invalidate(JOBS_CACHE_NAMESPACE)
+    await db.refresh(db_job)
     return db_job
 
 @router.patch("/{job_id}/status", response_model=JobResponse)
-def update_job_status(
+async def update_job_status(
     job_id: int,
     status: JobStatus,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Update job status (publish draft, close job, etc.)"""
-    db_job = db.query(Job).filter(Job.id == job_id).first()
+    db_job = await db.get(Job, job_id)
     if not db_job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -130,24 +333,26 @@ def update_job_status(
         raise HTTPException(status_code=403, detail="Not authorized to update this job")
 
     db_job.status = status
-    db.commit()
-    db.refresh(db_job)
+    await db.commit()
+    await response_cache.invalidate(JOBS_CACHE_NAMESPACE)
+    await db.refresh(db_job)
     return db_job
 
 @router.delete("/{job_id}")
-def delete_job(
+async def delete_job(
     job_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Permanently delete a job - Admin only"""
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Only administrators can delete jobs")
 
-    db_job = db.query(Job).filter(Job.id == job_id).first()
+    db_job = await db.get(Job, job_id)
     if not db_job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    db.delete(db_job)
-    db.commit()
+    await db.delete(db_job)
+    await db.commit()
+    await response_cache.invalidate(JOBS_CACHE_NAMESPACE)
     return {"message": "Job deleted successfully"}
\ No newline at end of file
@@ -1,47 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import AsyncIterator, Optional, List
+from dataclasses import asdict
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import json
 
-from app.database import get_db
-from app.models import Job, User
-from app.auth import get_current_admin_user
-from app.services.scrapers.indeed_scraper import IndeedScraper
+from app.database import get_async_db
+from app.models import JobSource, ScrapeRun, ScrapeTask, ScrapeTaskStatus
+from app.auth import CurrentUser, get_current_admin_user
+from app.pagination import encode_cursor, decode_cursor
+from app.services.job_aggregator import JobAggregator, active_scrapers
+from app.services.job_counts import job_counts
+from app.services.scrape_pipeline import iter_jobs, scrape_stream
+from app.services.scrape_queue import enqueue_scrape, requeue
+from app.services.scrapers.executor import ClientDisconnected, ScraperExecutorStopped, preview_key, scraper_executor
+from app.services.scrapers.http_cache import http_cache
+from app.services.scrapers.registry import SCRAPERS, make_scraper
 
 router = APIRouter(prefix="/admin/scraping", tags=["admin-scraping"])
 
-SCRAPERS = {
-    "indeed": IndeedScraper,
-}
-
 @router.get("/sources")
-async def get_available_sources(current_admin: User = Depends(get_current_admin_user)):
+async def get_available_sources(
+    current_admin: CurrentUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
+):
     """Get list of available job board sources (Admin only)"""
-    return {
-        "sources": [
-            {
-                "value": "indeed",
-                "label": "Indeed",
-                "description": "World's #1 job site",
-                "status": "active",
-                "rate_limit_seconds": 2,
-                "max_recommended_limit": 100
-            },
-        ]
-    }
+    result = await db.execute(select(JobSource).where(JobSource.name.in_(list(SCRAPERS))))
+    job_sources = {job_source.name: job_source for job_source in result.scalars()}
+    sources = []
+    for name in SCRAPERS:
+        job_source = job_sources.get(name)
+        info = make_scraper(name, job_source).get_source_info()
+        sources.append({
+            "value": name,
+            "label": info["display_name"],
+            "description": info["description"],
+            "status": "active" if job_source is None or job_source.is_active else "inactive",
+            "rate_limit_seconds": info["rate_limit_seconds"],
+            "max_recommended_limit": info["max_recommended_limit"],
+            "last_scraped_at": job_source.last_scraped_at if job_source is not None else None,
+        })
+    return {"sources": sources}
 
 @router.post("/trigger/{source}")
 async def trigger_scraping(
     source: str,
-    background_tasks: BackgroundTasks,
     query: str = "software engineer",
     location: str = "San Francisco, CA",
     limit: int = 20,
-    current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    incremental: bool = Query(False, description="Only fetch postings newer than this search's last run"),
+    current_admin: CurrentUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Trigger job scraping from specified source (Admin only)"""
+    """Queue a scraping run for the worker (Admin only)"""
 
     if source not in SCRAPERS:
         raise HTTPException(
@@ -49,30 +63,112 @@ async def trigger_scraping(
             detail=f"Source '{source}' not supported. Available: {list(SCRAPERS.keys())}"
         )
 
-    background_tasks.add_task(
-        scrape_and_save_jobs,
-        source, query, location, limit,
-        current_admin.id, db
+    task = await enqueue_scrape(
+        db, source, query, location, limit, requested_by_id=current_admin.id, incremental=incremental
     )
+    await db.commit()
 
     return {
-        "message": f"Scraping started from {source.title()}",
+        "message": f"Scraping queued for {source.title()}",
+        "task_id": task.id,
         "source": source,
         "query": query,
         "location": location,
         "limit": limit,
-        "status": "in_progress",
+        "incremental": incremental,
+        "status": task.status.value,
         "triggered_by": current_admin.first_name + current_admin.last_name
     }
 
+@router.get("/tasks/{task_id}")
+async def get_scrape_task(
+    task_id: int,
+    current_admin: CurrentUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get the state of a queued scraping run (Admin only)"""
+    task = await db.get(ScrapeTask, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Scrape task not found")
+    return scrape_task_dict(task)
+
+@router.post("/tasks/{task_id}/retry")
+async def retry_scrape_task(
+    task_id: int,
+    current_admin: CurrentUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Queue a finished scraping run again (Admin only)"""
+    task = await db.get(ScrapeTask, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Scrape task not found")
+    if task.status in (ScrapeTaskStatus.QUEUED, ScrapeTaskStatus.RUNNING):
+        raise HTTPException(status_code=409, detail=f"Scrape task is already {task.status.value}")
+
+    requeue(task)
+    await db.commit()
+    return scrape_task_dict(task)
+
+def scrape_task_dict(task: ScrapeTask) -> dict:
+    return {
+        "task_id": task.id,
+        "source": task.source,
+        "query": task.query,
+        "location": task.location,
+        "limit": task.limit,
+        "incremental": task.incremental,
+        "status": task.status.value,
+        "attempts": task.attempts,
+        "max_attempts": task.max_attempts,
+        "jobs_found": task.jobs_found,
+        "last_error": task.last_error,
+        "run_after": task.run_after,
+        "started_at": task.started_at,
+        "finished_at": task.finished_at,
+    }
+
 @router.get("/preview/{source}")
-async def preview_scraping(source: str, query: str, location: str, limit: int = 5, current_admin: User = Depends(get_current_admin_user)):
-    scraper_class = SCRAPERS[source]
-    scraper = scraper_class()
+async def preview_scraping(
+    request: Request,
+    source: str,
+    query: str,
+    location: str,
+    limit: int = 5,
+    stream: str = Query("json", pattern="^(json|ndjson|sse)$", description="ndjson/sse send each job as its page arrives"),
+    current_admin: CurrentUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if source not in SCRAPERS:
+        raise HTTPException(status_code=404, detail=f"Source '{source}' not supported")
+    if not scraper_executor.running:
+        raise HTTPException(status_code=503, detail="Scraping is not available")
+
+    result = await db.execute(select(JobSource).where(JobSource.name == source))
+    scraper = make_scraper(source, result.scalars().first())
+    key = preview_key(source, query, location, limit)
+
+    def scrape_jobs():
+        return iter_jobs(scrape_stream(scraper, query, location, limit))
+
+    if stream == "ndjson":
+        return StreamingResponse(_ndjson_events(scraper_executor.stream(key, scrape_jobs)), media_type="application/x-ndjson")
+    if stream == "sse":
+        return StreamingResponse(
+            _sse_events(scraper_executor.stream(key, scrape_jobs)),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
-    loop = asyncio.get_event_loop()
-    with ThreadPoolExecutor() as executor:
-        jobs = await loop.run_in_executor(executor, scraper.search_jobs, query, location, limit)
+    async def collect_jobs():
+        return [job async for job in scrape_jobs()]
+
+    try:
+        jobs = await scraper_executor.run(key, collect_jobs, is_disconnected=request.is_disconnected)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Preview timed out")
+    except ClientDisconnected:
+        # Nobody is listening; 499 only shows up in the access log
+        return Response(status_code=499)
 
     return {
         "preview": True,
@@ -84,38 +180,101 @@ async def preview_scraping(source: str, query: str, location: str, limit: int =
         "previewed_by": current_admin.first_name
     }
 
+async def _ndjson_events(jobs: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    try:
+        async for job in jobs:
+            yield json.dumps(job, default=str).encode() + b"\n"
+    except asyncio.TimeoutError:
+        yield json.dumps({"error": "Preview timed out"}).encode() + b"\n"
+
+async def _sse_events(jobs: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    count = 0
+    try:
+        async for job in jobs:
+            count += 1
+            yield f"event: job\ndata: {json.dumps(job, default=str)}\n\n".encode()
+    except asyncio.TimeoutError:
+        yield f"event: error\ndata: {json.dumps({'error': 'Preview timed out', 'count': count})}\n\n".encode()
+        return
+    yield f"event: done\ndata: {json.dumps({'count': count})}\n\n".encode()
+
+@router.get("/search")
+async def search_all_sources(
+    query: str,
+    location: str,
+    limit: int = Query(10, ge=1, le=100, description="Jobs per source"),
+    current_admin: CurrentUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Search every active source at once and merge the results (Admin only)"""
+    aggregator = JobAggregator(await active_scrapers(db))
+    try:
+        async with scraper_executor.slot():
+            jobs = await aggregator.search(query, location, limit)
+    except ScraperExecutorStopped:
+        raise HTTPException(status_code=503, detail="Scraping is not available")
+
+    return {
+        "query": query,
+        "location": location,
+        "count": len(jobs),
+        "duplicates": aggregator.duplicates,
+        "sources": [asdict(report) for report in aggregator.reports.values()],
+        "jobs": jobs,
+    }
+
 @router.get("/history")
 async def get_scraping_history(
-    current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_admin: CurrentUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get recent scraping history (Admin only)"""
+    """Get recent scraping history, newest first (Admin only)"""
+    query = select(ScrapeRun).options(selectinload(ScrapeRun.triggered_by))
+    if cursor:
+        (last_id,) = decode_cursor(cursor, 1)
+        if not isinstance(last_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(ScrapeRun.id < last_id)
+
+    rows = (await db.execute(query.order_by(ScrapeRun.id.desc()).limit(limit + 1))).scalars().all()
+    runs = rows[:limit]
+    next_cursor = encode_cursor([runs[-1].id]) if len(rows) > limit else None
     return {
-        "recent_scrapes": [
-            {
-                "id": 1,
-                "source": "indeed",
-                "query": "software engineer",
-                "location": "San Francisco, CA",
-                "jobs_found": 15,
-                "jobs_saved": 12,
-                "triggered_by": "Admin User",
-                "started_at": "2024-01-15T10:30:00Z",
-                "completed_at": "2024-01-15T10:32:30Z",
-                "status": "completed"
-            }
-        ]
+        "recent_scrapes": [scrape_run_dict(run) for run in runs],
+        "next_cursor": next_cursor,
+    }
+
+def scrape_run_dict(run: ScrapeRun) -> dict:
+    triggered_by = run.triggered_by
+    return {
+        "id": run.id,
+        "task_id": run.task_id,
+        "source": run.source,
+        "query": run.query,
+        "location": run.location,
+        "jobs_found": run.jobs_found,
+        "jobs_saved": run.jobs_saved,
+        "jobs_duplicated": run.jobs_duplicated,
+        "pages_fetched": run.pages_fetched,
+        "bytes_downloaded": run.bytes_downloaded,
+        "triggered_by": f"{triggered_by.first_name} {triggered_by.last_name}" if triggered_by else None,
+        "started_at": run.started_at,
+        "completed_at": run.completed_at,
+        "status": run.status.value,
+        "error": run.error,
     }
 
 @router.get("/stats")
 async def get_scraping_stats(
-    current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    current_admin: CurrentUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get scraping statistics (Admin only)"""
-    total_jobs = db.query(Job).count()
-
-    scraped_jobs = db.query(Job).filter(Job.external_url.isnot(None)).count()
+    counts = await job_counts(db)
+    total_jobs = counts["jobs_total"]
+    scraped_jobs = counts["jobs_scraped"]
     manual_jobs = total_jobs - scraped_jobs
 
     return {
@@ -123,63 +282,6 @@ async def get_scraping_stats(
         "scraped_jobs": scraped_jobs,
         "manual_jobs": manual_jobs,
         "scraping_enabled": True,
-        "available_sources": len(SCRAPERS)
+        "available_sources": len(SCRAPERS),
+        "http_cache": asdict(http_cache.stats) if http_cache is not None else None,
     }
-
-def scrape_and_save_jobs(
-    source: str,
-    query: str,
-    location: str,
-    limit: int,
-    admin_id: int,
-    db: Session
-):
-    """Background task to scrape and save jobs"""
-    print(f"Starting scrape: {source} | {query} in {location} | triggered by admin {admin_id}")
-
-    scraper_class = SCRAPERS.get(source)
-    if not scraper_class:
-        print(f"No scraper found for source: {source}")
-        return
-
-    try:
-        scraper = scraper_class()
-        scraped_jobs = scraper.search_jobs(query, location, limit)
-
-        saved_count = 0
-        duplicate_count = 0
-
-        for job_data in scraped_jobs:
-            try:
-                existing_job = db.query(Job).filter(
-                    Job.title == job_data['title'],
-                    Job.company == job_data['company']
-                ).first()
-
-                if not existing_job:
-                    db_job = Job(
-                        title=job_data['title'],
-                        company=job_data['company'],
-                        description=job_data['description'],
-                        location=job_data['location'],
-                        salary_range=job_data.get('salary_range'),
-                        external_url=job_data.get('external_url'),
-                        is_scraped=True,
-                        source_name=source
-                    )
-                    db.add(db_job)
-                    saved_count += 1
-                else:
-                    duplicate_count += 1
-
-            except Exception as e:
-                print(f"Error saving job {job_data['title']}: {e}")
-                continue
-
-        db.commit()
-
-        print(f"Scraping completed: {saved_count} new jobs saved, {duplicate_count} duplicates skipped")
-
-    except Exception as e:
-        print(f"Error during scraping: {e}")
-        db.rollback()
\ No newline at end of file
@@ -1,47 +1,58 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models import User
 from app.schemas import UserLogin, UserRegistration, UserResponse
 from app.auth import (
-    get_password_hash, verify_password, create_access_token, get_current_user
+    CurrentUser, hash_password_async, verify_password_async, create_access_token, get_current_user, token_claims
 )
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.post("/register", response_model=UserResponse)
-def register_user(payload: UserRegistration, db: Session = Depends(get_db)):
+async def register_user(payload: UserRegistration, db: AsyncSession = Depends(get_async_db)):
     if payload.password != payload.confirm_password:
         raise HTTPException(status_code=400, detail="Passwords do not match")
 
-    if db.query(User).filter(User.email == payload.email).first():
+    existing = await db.execute(select(User.id).where(User.email == payload.email))
+    if existing.first():
         raise HTTPException(status_code=400, detail="Email already registered")
 
     user = User(
         first_name=payload.first_name,
         last_name=payload.last_name,
         email=payload.email,
-        password_hash=get_password_hash(payload.password),
+        password_hash=await hash_password_async(payload.password),
         is_admin=False,
         is_active=True,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 @router.post("/login")
-def login_user(payload: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login_user(payload: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(User).where(User.email == payload.email))
+    user = result.scalars().first()
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    valid, new_hash = await verify_password_async(payload.password, user.password_hash)
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive account")
 
+    if new_hash:
+        # Stored hash predates the current BCRYPT_ROUNDS; upgrade it while we have the password
+        user.password_hash = new_hash
+        await db.commit()
+
     token_expires = timedelta(minutes=30)
-    access_token = create_access_token(data={"sub": str(user.id)}, expires_delta=token_expires)
+    access_token = create_access_token(data=token_claims(user), expires_delta=token_expires)
 
     return {
         "access_token": access_token,
@@ -50,7 +61,7 @@ def login_user(payload: UserLogin, db: Session = Depends(get_db)):
     }
 
 @router.post("/refresh")
-def refresh_token(current_user: User = Depends(get_current_user)):
+async def refresh_token(current_user: CurrentUser = Depends(get_current_user)):
     """Refresh an access token"""
-    access_token = create_access_token(data={"sub": str(current_user.id)})
+    access_token = create_access_token(data=token_claims(current_user))
     return {"access_token": access_token, "token_type": "bearer"}
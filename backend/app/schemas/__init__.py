@@ -1,5 +1,5 @@
 # app/schemas/__init__.py
-from .job import JobCreate, JobUpdate, JobResponse, JobSummary
+from .job import JobCreate, JobUpdate, JobResponse, JobSummary, JobPage, FacetCount, JobFacets
 from .application import (
     ApplicationBase, ApplicationCreate, ApplicationUpdate,
     ApplicationResponse, ApplicationWithJob
@@ -10,7 +10,7 @@ from .user import (
 )
 
 __all__ = [
-    "JobCreate", "JobUpdate", "JobResponse", "JobSummary",
+    "JobCreate", "JobUpdate", "JobResponse", "JobSummary", "JobPage", "FacetCount", "JobFacets",
     "ApplicationBase", "ApplicationCreate", "ApplicationUpdate",
     "ApplicationResponse", "ApplicationWithJob",
     "UserBase", "UserCreate", "UserUpdate", "UserResponse",
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from app.models.job import JobStatus, CompanySize, ExperienceLevel
 
 class JobBase(BaseModel):
@@ -34,6 +34,11 @@ class JobResponse(JobBase):
     created_at: datetime
     updated_at: datetime
     posted_by_id: int
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    salary_currency: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -46,10 +51,34 @@ class JobSummary(BaseModel):
     description: Optional[str] = None
     location: Optional[str] = None
     salary_range: Optional[str] = None
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    salary_currency: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     company_size: Optional[CompanySize] = None
     experience_level: Optional[ExperienceLevel] = None
     status: JobStatus
     posted_date: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class JobPage(BaseModel):
+    items: List[JobSummary]
+    next_cursor: Optional[str] = None
+    # Set when requested with with_total; see app/services/job_counts.py
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class JobFacets(BaseModel):
+    total: int
+    company_size: List[FacetCount]
+    experience_level: List[FacetCount]
+    status: List[FacetCount]
+    location: List[FacetCount]
+    company: List[FacetCount]
@@ -0,0 +1,170 @@
+"""Full-text search for job listings.
+
+On Postgres, searches run against the trigger-maintained ``jobs.search_vector``
+column (GIN indexed) and are ranked with ``ts_rank_cd``. Other dialects (SQLite
+test runs) use an in-process inverted index with the same field weights and
+prefix-matching semantics, so results come back in the same shape.
+
+The fallback does not stem or drop stop words the way the ``english``
+configuration does: terms match raw lowercase tokens by prefix, so
+"engineer" finds "engineering" but "engineering" does not find "engineer",
+and a stop word like "the" is an ordinary (restrictive) term. Expect the two
+to disagree on such queries.
+"""
+import bisect
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import case, event, false, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+
+TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+MAX_SEARCH_TERMS = 8
+
+# Mirrors Postgres' default ts_rank weights for labels A, B and C
+FIELD_WEIGHTS = {"title": 1.0, "company": 0.4, "description": 0.2}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [token.lower() for token in TOKEN_RE.findall(text or "")]
+
+
+def search_terms(search: str) -> List[str]:
+    """Split user input into unique lowercase terms, capped at MAX_SEARCH_TERMS"""
+    terms = []
+    for token in tokenize(search):
+        if token not in terms:
+            terms.append(token)
+    return terms[:MAX_SEARCH_TERMS]
+
+
+def to_prefix_tsquery(terms: List[str]) -> str:
+    """AND every term together as a prefix match, e.g. 'senior:* & eng:*'"""
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+class InvertedIndex:
+    """Weighted in-memory inverted index used when Postgres FTS is unavailable (no stemming)"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._doc_tokens: Dict[int, Set[str]] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        self.loaded = False
+
+    def add(self, doc_id: int, title: Optional[str], company: Optional[str], description: Optional[str]):
+        fields = {"title": title, "company": company, "description": description}
+        scores: Dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(fields[field]):
+                scores[token] = scores.get(token, 0.0) + weight
+
+        with self._lock:
+            self._remove_locked(doc_id)
+            for token, score in scores.items():
+                self._postings[token][doc_id] = score
+            self._doc_tokens[doc_id] = set(scores)
+            self._vocabulary_dirty = True
+
+    def remove(self, doc_id: int):
+        with self._lock:
+            self._remove_locked(doc_id)
+
+    def _remove_locked(self, doc_id: int):
+        for token in self._doc_tokens.pop(doc_id, ()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary_dirty = True
+
+    def _expand(self, term: str) -> List[str]:
+        """Return every indexed token that starts with ``term``"""
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + "\uffff")
+        return self._vocabulary[start:end]
+
+    def search(self, terms: List[str]) -> List[int]:
+        """Return ids of documents matching every term, best match first"""
+        with self._lock:
+            totals: Optional[Dict[int, float]] = None
+            for term in terms:
+                matches: Dict[int, float] = {}
+                for token in self._expand(term):
+                    for doc_id, score in self._postings[token].items():
+                        matches[doc_id] = max(matches.get(doc_id, 0.0), score)
+                if totals is None:
+                    totals = matches
+                else:
+                    totals = {doc_id: totals[doc_id] + score for doc_id, score in matches.items() if doc_id in totals}
+                if not totals:
+                    return []
+
+        return sorted(totals, key=lambda doc_id: (-totals[doc_id], -doc_id))
+
+    def load(self, db: Session):
+        rows = db.query(Job.id, Job.title, Job.company, Job.description).all()
+        with self._lock:
+            self._postings.clear()
+            self._doc_tokens.clear()
+            for row in rows:
+                self.add(row.id, row.title, row.company, row.description)
+            self.loaded = True
+
+
+fallback_index = InvertedIndex()
+
+
+def uses_native_fts(db: AsyncSession) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+async def apply_search(stmt, db: AsyncSession, search: str) -> Tuple[object, Optional[object]]:
+    """Restrict the ``stmt`` select to jobs matching ``search``.
+
+    Returns the filtered statement and an ORDER BY expression ranking the
+    matches by relevance (None when there is nothing to rank).
+    """
+    terms = search_terms(search)
+    if not terms:
+        return stmt, None
+
+    if uses_native_fts(db):
+        ts_query = func.to_tsquery("english", to_prefix_tsquery(terms))
+        stmt = stmt.where(Job.search_vector.op("@@")(ts_query))
+        return stmt, func.ts_rank_cd(Job.search_vector, ts_query).desc()
+
+    if not fallback_index.loaded:
+        await db.run_sync(fallback_index.load)
+    ranked_ids = fallback_index.search(terms)
+    if not ranked_ids:
+        return stmt.where(false()), None
+    stmt = stmt.where(Job.id.in_(ranked_ids))
+    return stmt, case({job_id: rank for rank, job_id in enumerate(ranked_ids)}, value=Job.id)
+
+
+def _index_job(mapper, connection, target):
+    if fallback_index.loaded and connection.dialect.name != "postgresql":
+        fallback_index.add(target.id, target.title, target.company, target.description)
+
+
+def _unindex_job(mapper, connection, target):
+    if fallback_index.loaded and connection.dialect.name != "postgresql":
+        fallback_index.remove(target.id)
+
+
+event.listen(Job, "after_insert", _index_job)
+event.listen(Job, "after_update", _index_job)
+event.listen(Job, "after_delete", _unindex_job)
@@ -0,0 +1,288 @@
+"""Near-duplicate detection for scraped jobs with MinHash signatures and LSH.
+
+Each job is reduced to hashed word 3-gram shingles of its title, company
+and description and summarised by a ``NUM_HASHES``-slot MinHash signature. The
+signature is computed with one-permutation hashing (each shingle is hashed
+once and lands in one slot) plus rotation densification for empty slots,
+which keeps it cheap enough for pure Python.
+
+Signatures are split into ``LSH_BANDS`` bands; every band is hashed into a
+bucket and stored in ``job_lsh_buckets``. A new posting is only compared
+against jobs sharing at least one bucket with it, and counts as a duplicate
+when the estimated Jaccard similarity reaches ``NEAR_DUPLICATE_THRESHOLD``.
+
+Jobs written through the ORM are signed and bucketed by mapper events; the
+bulk ingest path does it itself. Backfill jobs created before this existed
+with::
+
+    python -m app.services.dedup --backfill
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import zlib
+from array import array
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import bindparam, delete, event, inspect, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Job, JobLshBucket
+from app.search import TOKEN_RE
+
+NUM_HASHES = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_HASHES // LSH_BANDS
+SHINGLE_SIZE = 3
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+
+_MASK32 = 0xFFFFFFFF
+_VALUE_MASK = (1 << 26) - 1
+_EMPTY = _MASK32 + 1
+_ROTATION_OFFSET = 0x9E3779B1
+
+Signature = List[int]
+
+
+def shingle_hashes(title: Optional[str], company: Optional[str], description: Optional[str]) -> Set[int]:
+    """CRC32 (stable across processes) of each word 3-gram of the posting"""
+    text = " ".join(part for part in (title, company, description) if part).lower()
+    tokens = TOKEN_RE.findall(text)
+    if len(tokens) < SHINGLE_SIZE:
+        return {zlib.crc32(" ".join(tokens).encode())} if tokens else set()
+    return {zlib.crc32(f"{a} {b} {c}".encode()) for a, b, c in zip(tokens, tokens[1:], tokens[2:])}
+
+
+def minhash(hashes: Iterable[int]) -> Signature:
+    slots = [_EMPTY] * NUM_HASHES
+    for h in hashes:
+        slot = h >> 26  # top 6 bits pick one of the 64 slots
+        value = h & _VALUE_MASK
+        if value < slots[slot]:
+            slots[slot] = value
+
+    if _EMPTY not in slots:
+        return slots
+    if slots.count(_EMPTY) == NUM_HASHES:
+        return [0] * NUM_HASHES
+
+    # Rotation densification: an empty slot borrows the next non-empty slot's
+    # value, offset by the distance so borrowed values stay distinguishable
+    signature = list(slots)
+    for i in range(NUM_HASHES):
+        if slots[i] != _EMPTY:
+            continue
+        distance = 1
+        while slots[(i + distance) % NUM_HASHES] == _EMPTY:
+            distance += 1
+        signature[i] = (slots[(i + distance) % NUM_HASHES] + _ROTATION_OFFSET * distance) & _MASK32
+    return signature
+
+
+def job_signature(title: Optional[str], company: Optional[str], description: Optional[str]) -> Signature:
+    return minhash(shingle_hashes(title, company, description))
+
+
+def pack_signature(signature: Signature) -> bytes:
+    return array("I", signature).tobytes()
+
+
+def unpack_signature(data: bytes) -> Signature:
+    values = array("I")
+    values.frombytes(data)
+    return values.tolist()
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of the two shingle sets"""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_HASHES
+
+
+def band_buckets(signature: Signature) -> List[Tuple[int, int]]:
+    """(band, bucket) pairs; buckets are signed 64-bit so they fit a BIGINT"""
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = array("I", signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]).tobytes()
+        digest = hashlib.blake2b(rows, digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, "little", signed=True)))
+    return buckets
+
+
+class LshIndex:
+    """In-memory LSH over signatures, for dedup within a batch"""
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[int, int], List[Hashable]] = defaultdict(list)
+        self._signatures: Dict[Hashable, Signature] = {}
+
+    def add(self, key: Hashable, signature: Signature):
+        self._signatures[key] = signature
+        for bucket in band_buckets(signature):
+            self._buckets[bucket].append(key)
+
+    def query(self, signature: Signature, threshold: float = NEAR_DUPLICATE_THRESHOLD) -> Optional[Tuple[Hashable, float]]:
+        """Most similar indexed key at or above ``threshold``, if any"""
+        best = None
+        seen = set()
+        for bucket in band_buckets(signature):
+            for key in self._buckets.get(bucket, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                score = similarity(signature, self._signatures[key])
+                if score >= threshold and (best is None or score > best[1]):
+                    best = (key, score)
+        return best
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+async def find_near_duplicates(
+    db: AsyncSession,
+    signatures: Dict[Hashable, Signature],
+    threshold: float = NEAR_DUPLICATE_THRESHOLD,
+) -> Dict[Hashable, Tuple[int, float]]:
+    """Map each key to the most similar stored job (job id, similarity) above ``threshold``.
+
+    One query fetches every job sharing a bucket with any of the signatures,
+    a second loads those candidates' signatures.
+    """
+    wanted: Dict[Tuple[int, int], List[Hashable]] = defaultdict(list)
+    for key, signature in signatures.items():
+        for bucket in band_buckets(signature):
+            wanted[bucket].append(key)
+    if not wanted:
+        return {}
+
+    candidates: Dict[Hashable, Set[int]] = defaultdict(set)
+    rows = await db.execute(
+        select(JobLshBucket.band, JobLshBucket.bucket, JobLshBucket.job_id)
+        .where(tuple_(JobLshBucket.band, JobLshBucket.bucket).in_(list(wanted)))
+    )
+    for band, bucket, job_id in rows:
+        for key in wanted[(band, bucket)]:
+            candidates[key].add(job_id)
+    if not candidates:
+        return {}
+
+    job_ids = set().union(*candidates.values())
+    stored = {
+        job_id: unpack_signature(data)
+        for job_id, data in await db.execute(select(Job.id, Job.minhash).where(Job.id.in_(job_ids)))
+        if data
+    }
+
+    matches = {}
+    for key, job_ids in candidates.items():
+        best = None
+        for job_id in job_ids:
+            if job_id not in stored:
+                continue
+            score = similarity(signatures[key], stored[job_id])
+            if score >= threshold and (best is None or score > best[1] or (score == best[1] and job_id < best[0])):
+                best = (job_id, score)
+        if best is not None:
+            matches[key] = best
+    return matches
+
+
+def _bucket_rows(job_signatures: Iterable[Tuple[int, Signature]]) -> List[Dict]:
+    return [
+        {"band": band, "bucket": bucket, "job_id": job_id}
+        for job_id, signature in job_signatures
+        for band, bucket in band_buckets(signature)
+    ]
+
+
+async def index_signatures(db: AsyncSession, job_signatures: List[Tuple[int, Signature]]):
+    """Bucket jobs whose ``minhash`` column was written outside the ORM"""
+    rows = _bucket_rows(job_signatures)
+    for start in range(0, len(rows), 1000):
+        await db.execute(insert(JobLshBucket.__table__).values(rows[start:start + 1000]))
+
+
+def _text_changed(target: Job) -> bool:
+    state = inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in ("title", "company", "description"))
+
+
+def _sign_new_job(mapper, connection, target):
+    if inspect(target).dict.get("minhash") is None:
+        target.minhash = pack_signature(job_signature(target.title, target.company, target.description))
+
+
+def _resign_job(mapper, connection, target):
+    if _text_changed(target):
+        target.minhash = pack_signature(job_signature(target.title, target.company, target.description))
+
+
+def _unbucket_job(mapper, connection, target):
+    # The FK cascades on Postgres; SQLite runs without foreign key enforcement
+    connection.execute(delete(JobLshBucket.__table__).where(JobLshBucket.job_id == target.id))
+
+
+def _bucket_job(mapper, connection, target):
+    if not _text_changed(target):
+        return
+    connection.execute(delete(JobLshBucket.__table__).where(JobLshBucket.job_id == target.id))
+    rows = _bucket_rows([(target.id, unpack_signature(target.minhash))])
+    connection.execute(insert(JobLshBucket.__table__), rows)
+
+
+event.listen(Job, "before_insert", _sign_new_job)
+event.listen(Job, "before_update", _resign_job)
+event.listen(Job, "after_insert", _bucket_job)
+event.listen(Job, "after_update", _bucket_job)
+event.listen(Job, "after_delete", _unbucket_job)
+
+
+async def backfill(batch_size: int = 1000) -> int:
+    """Sign and bucket every job that has no signature yet"""
+    from app.database import AsyncSessionLocal, async_engine
+
+    total = 0
+    last_id = 0
+    try:
+        async with AsyncSessionLocal() as db:
+            while True:
+                rows = (await db.execute(
+                    select(Job.id, Job.title, Job.company, Job.description)
+                    .where(Job.minhash.is_(None), Job.id > last_id)
+                    .order_by(Job.id)
+                    .limit(batch_size)
+                )).all()
+                if not rows:
+                    break
+                signed = [(row.id, job_signature(row.title, row.company, row.description)) for row in rows]
+                await db.execute(
+                    update(Job.__table__)
+                    .where(Job.__table__.c.id == bindparam("job_id"))
+                    .values(minhash=bindparam("signature")),
+                    [{"job_id": job_id, "signature": pack_signature(signature)} for job_id, signature in signed],
+                )
+                await db.execute(delete(JobLshBucket.__table__).where(JobLshBucket.job_id.in_([row.id for row in rows])))
+                await index_signatures(db, signed)
+                await db.commit()
+                total += len(rows)
+                last_id = rows[-1].id
+    finally:
+        await async_engine.dispose()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Near-duplicate signature maintenance")
+    parser.add_argument("--backfill", action="store_true", help="sign and bucket jobs without a signature")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    if not args.backfill:
+        parser.print_help()
+        return
+    print(f"Signed {asyncio.run(backfill(args.batch_size))} jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Location geocoding and radius search for jobs.
+
+Free-text locations ("San Francisco, CA 94105", "Hybrid remote in SF",
+"NYC") are resolved offline against the bundled gazetteer in
+app/data/gazetteer.csv and stored as ``jobs.latitude`` / ``longitude`` plus
+``geo_cell``, a 52-bit Z-order (geohash-style) cell: the bits of the
+longitude and latitude interleaved, so every prefix of the number is a
+rectangular cell and a cell is one contiguous integer range.
+
+A radius query picks the cell size that is at least as large as the circle's
+bounding box, so the circle is covered by at most four cells, and filters on
+those ``geo_cell`` ranges (ix_jobs_active_geo_cell) before the exact distance
+check. Searches that cross the antimeridian are clipped at it.
+
+Jobs written through the ORM are geocoded by mapper events; the bulk ingest
+path fills the columns itself. Backfill existing rows with::
+
+    python -m app.services.geo --backfill
+"""
+import argparse
+import asyncio
+import csv
+import math
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, event, inspect, or_, select, update
+
+from app.models import Job
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "gazetteer.csv")
+
+# Bits per axis in geo_cell; 26 gives ~0.3 m of latitude resolution
+CELL_BITS = 26
+KM_PER_DEGREE = 111.195
+
+_ZIP_RE = re.compile(r"\b\d{5}(?:-\d{4})?\b")
+_PREFIX_RE = re.compile(r"^(?:(?:hybrid|temporarily)\s+)?(?:remote\s+)?in\s+")
+_PAREN_RE = re.compile(r"\([^)]*\)")
+# Written-out names a location may use instead of the gazetteer's country code
+COUNTRY_NAMES = {
+    "us": ["usa", "united states"],
+    "gb": ["uk", "united kingdom", "england", "scotland"],
+    "ca": ["canada"],
+    "de": ["germany"],
+    "in": ["india"],
+    "au": ["australia"],
+}
+
+_POINT_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+class Place(NamedTuple):
+    name: str
+    region: str
+    country: str
+    latitude: float
+    longitude: float
+
+
+class Gazetteer:
+    def __init__(self, places: List[Place], aliases: Dict[str, Place]):
+        self.by_name_region: Dict[Tuple[str, str], Place] = {}
+        self.by_name: Dict[str, Place] = {}
+        for place in places:
+            name = place.name.lower()
+            # The first (largest) city of a name wins the bare-name lookup
+            self.by_name.setdefault(name, place)
+            self.by_name_region.setdefault((name, place.region.lower()), place)
+            for country in [place.country.lower(), *COUNTRY_NAMES.get(place.country.lower(), [])]:
+                self.by_name_region.setdefault((name, country), place)
+        for alias, place in aliases.items():
+            self.by_name.setdefault(alias, place)
+
+    def lookup(self, text: Optional[str]) -> Optional[Place]:
+        """Place named by a free-text location, or None (remote, unknown, empty)"""
+        if not text:
+            return None
+        text = _PAREN_RE.sub(" ", text.lower())
+        text = _ZIP_RE.sub(" ", text)
+        text = _PREFIX_RE.sub("", " ".join(text.split()))
+        parts = [part.strip(" .") for part in text.split(",") if part.strip(" .")]
+        if not parts:
+            return None
+        name = parts[0]
+        if len(parts) > 1:
+            for region in (parts[1], parts[1].split()[0]):
+                place = self.by_name_region.get((name, region))
+                if place is not None:
+                    return place
+        return self.by_name.get(name) or self.by_name.get(", ".join(parts))
+
+
+@lru_cache(maxsize=1)
+def gazetteer() -> Gazetteer:
+    places = []
+    aliases = {}
+    with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            place = Place(row["name"], row["region"], row["country"], float(row["latitude"]), float(row["longitude"]))
+            places.append(place)
+            for alias in filter(None, (row["aliases"] or "").split(";")):
+                aliases.setdefault(alias.strip().lower(), place)
+    return Gazetteer(places, aliases)
+
+
+@lru_cache(maxsize=4096)
+def geocode(text: Optional[str]) -> Optional[Place]:
+    return gazetteer().lookup(text)
+
+
+def resolve_point(text: str) -> Optional[Tuple[float, float]]:
+    """(lat, lon) of a place name or a literal "lat,lon" pair"""
+    match = _POINT_RE.match(text)
+    if match:
+        lat, lon = float(match.group(1)), float(match.group(2))
+        if -90 <= lat <= 90 and -180 <= lon <= 180:
+            return lat, lon
+        return None
+    place = geocode(text)
+    return (place.latitude, place.longitude) if place else None
+
+
+def _spread_bits(value: int) -> int:
+    """Insert a zero bit above each of the low 32 bits of ``value``"""
+    value &= 0xFFFFFFFF
+    value = (value | (value << 16)) & 0x0000FFFF0000FFFF
+    value = (value | (value << 8)) & 0x00FF00FF00FF00FF
+    value = (value | (value << 4)) & 0x0F0F0F0F0F0F0F0F
+    value = (value | (value << 2)) & 0x3333333333333333
+    value = (value | (value << 1)) & 0x5555555555555555
+    return value
+
+
+def _interleave(x: int, y: int) -> int:
+    # Longitude takes the higher bit of each pair, as in geohash
+    return (_spread_bits(x) << 1) | _spread_bits(y)
+
+
+def _axis_index(value: float, low: float, span: float, bits: int) -> int:
+    cells = 1 << bits
+    return min(cells - 1, max(0, int((value - low) / span * cells)))
+
+
+def encode_cell(latitude: float, longitude: float) -> int:
+    return _interleave(
+        _axis_index(longitude, -180.0, 360.0, CELL_BITS),
+        _axis_index(latitude, -90.0, 180.0, CELL_BITS),
+    )
+
+
+def cell_ranges(latitude: float, longitude: float, radius_km: float) -> List[Tuple[int, int]]:
+    """Merged inclusive ``geo_cell`` ranges covering the circle's bounding box"""
+    dlat = radius_km / KM_PER_DEGREE
+    dlon = dlat / max(math.cos(math.radians(latitude)), 1e-6)
+    # Coarsest level whose cells are at least as large as the bounding box
+    bits = CELL_BITS
+    while bits > 0 and (180.0 / (1 << bits) < 2 * dlat or 360.0 / (1 << bits) < 2 * dlon):
+        bits -= 1
+    lat_cells = range(
+        _axis_index(max(latitude - dlat, -90.0), -90.0, 180.0, bits),
+        _axis_index(min(latitude + dlat, 90.0), -90.0, 180.0, bits) + 1,
+    )
+    lon_cells = range(
+        _axis_index(max(longitude - dlon, -180.0), -180.0, 360.0, bits),
+        _axis_index(min(longitude + dlon, 180.0), -180.0, 360.0, bits) + 1,
+    )
+    shift = 2 * (CELL_BITS - bits)
+    ranges = sorted(
+        (_interleave(x, y) << shift, ((_interleave(x, y) + 1) << shift) - 1)
+        for x in lon_cells for y in lat_cells
+    )
+    merged = [ranges[0]]
+    for low, high in ranges[1:]:
+        if low == merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], high)
+        else:
+            merged.append((low, high))
+    return merged
+
+
+def within_radius(latitude: float, longitude: float, radius_km: float):
+    """Filter for jobs within ``radius_km`` of a point.
+
+    The ``geo_cell`` ranges select the candidates through the index; the
+    distance check is equirectangular, which is plain arithmetic in every
+    dialect and accurate to well under 1% at job-search radii.
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    scale = math.cos(math.radians(latitude))
+    return and_(
+        or_(*(Job.geo_cell.between(low, high) for low, high in cell_ranges(latitude, longitude, radius_km))),
+        (Job.latitude - latitude) * (Job.latitude - latitude)
+        + (Job.longitude - longitude) * (Job.longitude - longitude) * (scale * scale)
+        <= dlat * dlat,
+    )
+
+
+def geo_columns(location: Optional[str]) -> Dict[str, Optional[object]]:
+    place = geocode(location)
+    if place is None:
+        return {"latitude": None, "longitude": None, "geo_cell": None}
+    return {
+        "latitude": place.latitude,
+        "longitude": place.longitude,
+        "geo_cell": encode_cell(place.latitude, place.longitude),
+    }
+
+
+def _set_geo_columns(target: Job):
+    for name, value in geo_columns(target.location).items():
+        setattr(target, name, value)
+
+
+def _geocode_new_job(mapper, connection, target):
+    if target.geo_cell is None:
+        _set_geo_columns(target)
+
+
+def _regeocode_job(mapper, connection, target):
+    if inspect(target).attrs.location.history.has_changes():
+        _set_geo_columns(target)
+
+
+event.listen(Job, "before_insert", _geocode_new_job)
+event.listen(Job, "before_update", _regeocode_job)
+
+
+async def backfill(batch_size: int = 1000) -> int:
+    """Geocode the location of every job, one chunk per transaction"""
+    from app.database import AsyncSessionLocal, async_engine
+
+    total = 0
+    last_id = 0
+    try:
+        async with AsyncSessionLocal() as db:
+            while True:
+                rows = (await db.execute(
+                    select(Job.id, Job.location)
+                    .where(Job.location.isnot(None), Job.id > last_id)
+                    .order_by(Job.id)
+                    .limit(batch_size)
+                )).all()
+                if not rows:
+                    break
+                params = []
+                for row in rows:
+                    columns = geo_columns(row.location)
+                    params.append({
+                        "job_id": row.id,
+                        "lat": columns["latitude"],
+                        "lon": columns["longitude"],
+                        "cell": columns["geo_cell"],
+                    })
+                await db.execute(
+                    update(Job.__table__)
+                    .where(Job.__table__.c.id == bindparam("job_id"))
+                    .values(latitude=bindparam("lat"), longitude=bindparam("lon"), geo_cell=bindparam("cell")),
+                    params,
+                )
+                await db.commit()
+                total += len(rows)
+                last_id = rows[-1].id
+    finally:
+        await async_engine.dispose()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job geocoding maintenance")
+    parser.add_argument("--backfill", action="store_true", help="geocode the location of existing jobs")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    if not args.backfill:
+        parser.print_help()
+        return
+    print(f"Geocoded {asyncio.run(backfill(args.batch_size))} jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""Batched ingest of scraped jobs into ``jobs``.
+
+Each batch is deduplicated with one set-based lookup (same source and
+external id, or same title and company as an existing job) and an LSH
+candidate lookup for near-duplicates (app/services/dedup.py); the survivors
+are written with a single multi-row ``INSERT ... ON CONFLICT DO NOTHING`` on
+``(source_id, external_id)``, so concurrent scrapes of the same source can't
+double-insert either. Title/company matches have no such constraint, so on
+Postgres each batch first takes transaction-scoped advisory locks on the
+(title, company) pairs, hashed into ``TITLE_COMPANY_LOCK_BUCKETS`` buckets; a
+concurrent writer of the same pair waits for the first to commit and then
+sees its job. Two pairs sharing a bucket only cost each other a short wait.
+"""
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, and_, bindparam, func, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Job, JobSource
+from app.search import fallback_index, uses_native_fts
+from app.services.dedup import (
+    LshIndex,
+    Signature,
+    find_near_duplicates,
+    index_signatures,
+    job_signature,
+    pack_signature,
+    unpack_signature,
+)
+from app.services.geo import geo_columns
+from app.services.salary import salary_columns
+
+INGEST_BATCH_SIZE = 500
+# Advisory lock space for title/company dedup: (class, bucket) keys, so a
+# batch takes at most this many locks however many pairs it holds
+TITLE_COMPANY_LOCK_CLASS = 0x4A42  # "JB"
+TITLE_COMPANY_LOCK_BUCKETS = 1024
+
+
+@dataclass
+class IngestResult:
+    inserted: int = 0
+    duplicates: int = 0
+
+    def __iadd__(self, other: "IngestResult") -> "IngestResult":
+        self.inserted += other.inserted
+        self.duplicates += other.duplicates
+        return self
+
+
+@dataclass
+class BatchOutcome:
+    """What happened to each external key of a batch"""
+    # key -> id of the job inserted for it
+    created: Dict[str, int] = field(default_factory=dict)
+    # key -> id of the job it duplicates (None when it lost an insert race to another writer)
+    matched: Dict[str, Optional[int]] = field(default_factory=dict)
+    # key -> estimated similarity to that job (1.0 for exact matches)
+    similarity: Dict[str, float] = field(default_factory=dict)
+    # key -> MinHash signature, for candidates that weren't exact duplicates
+    signatures: Dict[str, Signature] = field(default_factory=dict)
+
+
+def external_key(job_data: Dict) -> str:
+    """The scraper's own job id, or a content hash for sources that don't expose one"""
+    if job_data.get("external_id"):
+        return str(job_data["external_id"])
+    parts = (job_data.get("title"), job_data.get("company"), job_data.get("location"))
+    digest = hashlib.sha1("\x1f".join((p or "").strip().lower() for p in parts).encode()).hexdigest()
+    return f"sha1:{digest}"
+
+
+def dialect_insert(db: AsyncSession):
+    """``insert()`` with ON CONFLICT support for the session's dialect"""
+    return postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+
+
+def title_company(job_data: Dict) -> Tuple[str, str]:
+    """(title, company) as stored in ``jobs``, truncated to the column widths"""
+    return job_data["title"][:255], job_data["company"][:255]
+
+
+def _pair_lock_bucket(title: str, company: str) -> int:
+    digest = hashlib.blake2b(f"{title}\0{company}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % TITLE_COMPANY_LOCK_BUCKETS
+
+
+async def lock_title_company_pairs(db: AsyncSession, pairs: Iterable[Tuple[str, str]]):
+    """Hold the advisory lock of each pair's bucket until the transaction ends (Postgres only).
+
+    Buckets are locked in sorted order so two batches can't deadlock on each other.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    buckets = sorted({_pair_lock_bucket(title, company) for title, company in pairs})
+    if not buckets:
+        return
+    lock_buckets = (
+        func.unnest(bindparam("buckets", buckets, type_=postgresql.ARRAY(Integer)))
+        .table_valued("bucket")
+        .render_derived()
+    )
+    await db.execute(
+        select(func.pg_advisory_xact_lock(TITLE_COMPANY_LOCK_CLASS, lock_buckets.c.bucket)).select_from(lock_buckets)
+    )
+
+
+async def get_or_create_source(db: AsyncSession, info: Dict) -> JobSource:
+    result = await db.execute(select(JobSource).where(JobSource.name == info["name"]))
+    job_source = result.scalars().first()
+    if job_source is None:
+        job_source = JobSource(
+            name=info["name"],
+            display_name=info.get("display_name", info["name"]),
+            base_url=info["base_url"],
+        )
+        db.add(job_source)
+        await db.flush()
+    return job_source
+
+
+async def ingest_jobs(
+    db: AsyncSession,
+    job_source: JobSource,
+    scraped_jobs: Iterable[Dict],
+    posted_by_id: int,
+) -> IngestResult:
+    """Insert new scraped jobs for ``job_source`` and count the rest as duplicates.
+
+    The caller owns the transaction; nothing is committed here.
+    """
+    result = IngestResult()
+    batch: List[Dict] = []
+    for job_data in scraped_jobs:
+        batch.append(job_data)
+        if len(batch) >= INGEST_BATCH_SIZE:
+            result += await _ingest_batch(db, job_source, batch, posted_by_id)
+            batch = []
+    if batch:
+        result += await _ingest_batch(db, job_source, batch, posted_by_id)
+
+    await db.execute(
+        update(JobSource).where(JobSource.id == job_source.id).values(last_scraped_at=datetime.now(timezone.utc))
+    )
+    await refresh_source_totals(db, [job_source.id])
+    return result
+
+
+async def refresh_source_totals(db: AsyncSession, source_ids: Iterable[int]):
+    """Recount ``total_jobs_scraped`` of ``source_ids`` from ``jobs``.
+
+    The total is derived rather than incremented, so concurrent writers never
+    read-modify-write it; run it after their inserts commit.
+    """
+    source_ids = sorted(source_ids)
+    if not source_ids:
+        return
+    await db.execute(
+        update(JobSource)
+        .where(JobSource.id.in_(source_ids))
+        .values(total_jobs_scraped=select(func.count(Job.id)).where(Job.source_id == JobSource.id).scalar_subquery())
+    )
+
+
+async def _ingest_batch(db: AsyncSession, job_source: JobSource, batch: List[Dict], posted_by_id: int) -> IngestResult:
+    candidates: Dict[str, Tuple[Dict, int]] = {}
+    for job_data in batch:
+        candidates.setdefault(external_key(job_data), (job_data, posted_by_id))
+
+    outcome = await insert_new_jobs(db, job_source, candidates)
+    inserted = len(outcome.created)
+    return IngestResult(inserted=inserted, duplicates=len(batch) - inserted)
+
+
+async def insert_new_jobs(
+    db: AsyncSession,
+    job_source: JobSource,
+    candidates: Dict[str, Tuple[Dict, int]],
+) -> BatchOutcome:
+    """Dedupe ``candidates`` (external key -> (job data, poster id)) and insert the new ones"""
+    outcome = BatchOutcome()
+    if not candidates:
+        return outcome
+
+    pairs = {title_company(job_data) for job_data, _ in candidates.values()}
+    await lock_title_company_pairs(db, pairs)
+    existing = await db.execute(
+        select(Job.id, Job.external_id, Job.title, Job.company).where(or_(
+            and_(Job.source_id == job_source.id, Job.external_id.in_(list(candidates))),
+            tuple_(Job.title, Job.company).in_(pairs),
+        ))
+    )
+    known_keys: Dict[str, int] = {}
+    known_pairs: Dict[Tuple[str, str], int] = {}
+    for row in existing:
+        known_keys.setdefault(row.external_id, row.id)
+        known_pairs.setdefault((row.title, row.company), row.id)
+
+    rows = []
+    # key -> key of the earlier candidate in this batch it duplicates
+    repeats: Dict[str, str] = {}
+    pending_pairs: Dict[Tuple[str, str], str] = {}
+    fresh: Dict[str, Dict] = {}
+    for key, (job_data, posted_by_id) in candidates.items():
+        pair = title_company(job_data)
+        if key in known_keys:
+            outcome.matched[key] = known_keys[key]
+        elif pair in known_pairs:
+            outcome.matched[key] = known_pairs[pair]
+        elif pair in pending_pairs:
+            repeats[key] = pending_pairs[pair]
+        else:
+            pending_pairs[pair] = key
+            fresh[key] = _job_row(job_source, key, job_data, posted_by_id)
+            outcome.signatures[key] = _signature(job_data, fresh[key])
+    for key in outcome.matched:
+        outcome.similarity[key] = 1.0
+    for key in repeats:
+        outcome.similarity[key] = 1.0
+
+    # Reposts that aren't exact matches: compare against LSH candidates in
+    # the table, then against earlier candidates of this batch
+    near = await find_near_duplicates(db, {key: outcome.signatures[key] for key in fresh})
+    batch_index = LshIndex()
+    for key, row in fresh.items():
+        signature = outcome.signatures[key]
+        match = near.get(key)
+        if match is not None:
+            outcome.matched[key], outcome.similarity[key] = match
+            continue
+        match = batch_index.query(signature)
+        if match is not None:
+            repeats[key], outcome.similarity[key] = match
+            continue
+        batch_index.add(key, signature)
+        row["minhash"] = pack_signature(signature)
+        rows.append(row)
+
+    if rows:
+        outcome.created = {key: job_id for job_id, key in await _insert_ignoring_conflicts(db, rows)}
+        await index_signatures(db, [(job_id, outcome.signatures[key]) for key, job_id in outcome.created.items()])
+    for row in rows:
+        if row["external_id"] not in outcome.created:
+            outcome.matched[row["external_id"]] = None
+    for key, first_key in repeats.items():
+        outcome.matched[key] = outcome.created.get(first_key) or outcome.matched.get(first_key)
+
+    if not uses_native_fts(db) and fallback_index.loaded:
+        # Core inserts skip the ORM events that normally keep this index current
+        for key, job_id in outcome.created.items():
+            row = fresh[key]
+            fallback_index.add(job_id, row["title"], row["company"], row["description"])
+
+    return outcome
+
+
+def _signature(job_data: Dict, row: Dict) -> Signature:
+    if job_data.get("minhash"):
+        return unpack_signature(job_data["minhash"])
+    return job_signature(row["title"], row["company"], row["description"])
+
+
+def _job_row(job_source: JobSource, key: str, job_data: Dict, posted_by_id: int) -> Dict:
+    external_url: Optional[str] = job_data.get("external_url")
+    salary_range: Optional[str] = job_data.get("salary_range")
+    salary_range = salary_range[:100] if salary_range else None
+    title, company = title_company(job_data)
+    return {
+        "title": title,
+        "company": company,
+        "description": job_data.get("description") or "No description available",
+        "location": job_data.get("location"),
+        **geo_columns(job_data.get("location")),
+        "salary_range": salary_range,
+        **salary_columns(salary_range),
+        "application_url": external_url or job_source.base_url,
+        "external_url": external_url,
+        "external_id": key,
+        "source_id": job_source.id,
+        "posted_by_id": posted_by_id,
+        "is_scraped": True,
+    }
+
+
+async def _insert_ignoring_conflicts(db: AsyncSession, rows: List[Dict]) -> List[tuple]:
+    """One multi-row INSERT; returns (id, external_id) for the rows actually written"""
+    stmt = (
+        dialect_insert(db)(Job.__table__)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["source_id", "external_id"])
+        .returning(Job.__table__.c.id, Job.__table__.c.external_id)
+    )
+    result = await db.execute(stmt)
+    return [tuple(row) for row in result]
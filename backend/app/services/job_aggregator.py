@@ -0,0 +1,154 @@
+"""Search every active job board at once.
+
+``JobAggregator`` fans one query out to a scraper per source and merges the
+result pages into a single stream as they arrive, dropping postings that
+another board already produced: exact (title, company) repeats and, through
+MinHash LSH (app/services/dedup.py), reposts with slightly different text.
+
+Each source gets its own time budget. A board that is slow or down only
+loses the pages it hadn't delivered when the budget ran out, so a search
+takes about as long as the slowest source within budget rather than the sum
+of all of them.
+"""
+import asyncio
+import os
+import time
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import JobSource
+from app.services.dedup import NEAR_DUPLICATE_THRESHOLD, LshIndex, job_signature
+from app.services.scrape_pipeline import scrape_stream
+from app.services.scrapers.base import BaseScraper
+from app.services.scrapers.registry import SCRAPERS, make_scraper
+
+AGGREGATOR_SOURCE_BUDGET_SECONDS = float(os.getenv("AGGREGATOR_SOURCE_BUDGET_SECONDS", "20"))
+
+
+@dataclass
+class SourceReport:
+    """How one source did in an aggregated search"""
+    source: str
+    jobs_found: int = 0
+    jobs_kept: int = 0
+    elapsed_seconds: float = 0.0
+    timed_out: bool = False
+    error: Optional[str] = None
+
+
+async def active_scrapers(db: AsyncSession) -> Dict[str, BaseScraper]:
+    """A scraper for every registered source not switched off in ``job_sources``"""
+    job_sources = {
+        job_source.name: job_source
+        for job_source in (await db.execute(select(JobSource).where(JobSource.name.in_(list(SCRAPERS))))).scalars()
+    }
+    return {
+        name: make_scraper(name, job_sources.get(name))
+        for name in SCRAPERS
+        # Sources without a row yet haven't been configured, so they count as active
+        if name not in job_sources or job_sources[name].is_active
+    }
+
+
+class JobAggregator:
+    """Merged, deduplicated search over several scrapers.
+
+    ``reports`` and ``duplicates`` describe the last ``stream``/``search`` call.
+    """
+
+    def __init__(
+        self,
+        scrapers: Dict[str, BaseScraper],
+        budget_seconds: float = AGGREGATOR_SOURCE_BUDGET_SECONDS,
+        threshold: float = NEAR_DUPLICATE_THRESHOLD,
+    ):
+        self.scrapers = scrapers
+        self.budget_seconds = budget_seconds
+        self.threshold = threshold
+        self.reports: Dict[str, SourceReport] = {}
+        self.duplicates = 0
+
+    async def search(self, query: str, location: str, limit_per_source: int = 10) -> List[Dict]:
+        return [job async for job in self.stream(query, location, limit_per_source)]
+
+    async def stream(self, query: str, location: str, limit_per_source: int = 10) -> AsyncIterator[Dict]:
+        """Yield unique jobs from all sources in arrival order, tagged with ``source_name``"""
+        self.reports = {name: SourceReport(source=name) for name in self.scrapers}
+        self.duplicates = 0
+        # (source name, page) per delivered page, (source name, None) when a source finishes
+        pages: asyncio.Queue = asyncio.Queue()
+        tasks = [
+            asyncio.ensure_future(self._run_source(name, scraper, query, location, limit_per_source, pages))
+            for name, scraper in self.scrapers.items()
+        ]
+
+        seen_pairs = set()
+        index = LshIndex()
+        running = len(tasks)
+        try:
+            while running:
+                name, page_jobs = await pages.get()
+                if page_jobs is None:
+                    running -= 1
+                    continue
+                report = self.reports[name]
+                for job_data in page_jobs:
+                    report.jobs_found += 1
+                    if not self._is_new(job_data, seen_pairs, index):
+                        self.duplicates += 1
+                        continue
+                    report.jobs_kept += 1
+                    yield {**job_data, "source_name": name}
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _is_new(self, job_data: Dict, seen_pairs: set, index: LshIndex) -> bool:
+        pair = _normalized_pair(job_data)
+        if pair in seen_pairs:
+            return False
+        signature = job_signature(job_data.get("title"), job_data.get("company"), job_data.get("description"))
+        if index.query(signature, self.threshold) is not None:
+            return False
+        seen_pairs.add(pair)
+        index.add(len(index), signature)
+        return True
+
+    async def _run_source(
+        self,
+        name: str,
+        scraper: BaseScraper,
+        query: str,
+        location: str,
+        limit: int,
+        pages: asyncio.Queue,
+    ):
+        report = self.reports[name]
+        started = time.monotonic()
+
+        async def deliver():
+            async with aclosing(scrape_stream(scraper, query, location, limit)) as page_iter:
+                async for page_jobs in page_iter:
+                    await pages.put((name, page_jobs))
+
+        try:
+            await asyncio.wait_for(deliver(), timeout=self.budget_seconds)
+        except asyncio.TimeoutError:
+            report.timed_out = True
+        except Exception as e:
+            report.error = f"{type(e).__name__}: {e}"
+        finally:
+            report.elapsed_seconds = round(time.monotonic() - started, 3)
+            pages.put_nowait((name, None))
+
+
+def _normalized_pair(job_data: Dict) -> Tuple[str, str]:
+    return (
+        " ".join((job_data.get("title") or "").lower().split()),
+        " ".join((job_data.get("company") or "").lower().split()),
+    )
@@ -0,0 +1,71 @@
+"""Job row counts for dashboards and listing totals.
+
+On Postgres the dashboard counts come from ``job_counters``, which
+triggers on ``jobs`` keep current, so reading them sums a few sharded
+counter rows instead of scanning the table. Other databases (the SQLite dev setup)
+fall back to ``COUNT(*)``.
+
+Listing totals (``matching_count``) count at most
+``JOB_COUNT_EXACT_THRESHOLD + 1`` rows. Result sets up to the threshold get
+an exact total; larger ones get the planner's row estimate on Postgres and
+the capped count (a lower bound) elsewhere, flagged as estimates.
+"""
+import json
+import os
+from typing import Dict, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.models import Job, JobCounter
+from app.models.job_counter import JOB_COUNTER_NAMES
+
+JOB_COUNT_EXACT_THRESHOLD = int(os.getenv("JOB_COUNT_EXACT_THRESHOLD", "10000"))
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, keeping its bind parameters"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def job_counts(db: AsyncSession) -> Dict[str, int]:
+    """``{"jobs_total": ..., "jobs_scraped": ...}``; scraped jobs are those with an external URL"""
+    if db.get_bind().dialect.name == "postgresql":
+        counters = dict((await db.execute(
+            select(JobCounter.name, func.sum(JobCounter.value))
+            .where(JobCounter.name.in_(JOB_COUNTER_NAMES))
+            .group_by(JobCounter.name)
+        )).all())
+        if len(counters) == len(JOB_COUNTER_NAMES):
+            return counters
+
+    row = (await db.execute(select(func.count(Job.id), func.count(Job.external_url)))).one()
+    return {"jobs_total": row[0], "jobs_scraped": row[1]}
+
+
+async def matching_count(db: AsyncSession, query, threshold: int = JOB_COUNT_EXACT_THRESHOLD) -> Tuple[int, bool]:
+    """(total, is_estimate) for the jobs selected by the filtered, unordered ``query``"""
+    ids = query.with_only_columns(Job.id)
+    capped = (await db.execute(
+        select(func.count()).select_from(ids.limit(threshold + 1).subquery())
+    )).scalar_one()
+    if capped <= threshold:
+        return capped, False
+
+    if db.get_bind().dialect.name == "postgresql":
+        plan = (await db.execute(Explain(ids))).scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        # The planner can underestimate; the capped count is a known lower bound
+        return max(int(plan[0]["Plan"]["Plan Rows"]), capped), True
+    return capped, True
@@ -0,0 +1,101 @@
+"""Per-value job counts for the listing filters, in one grouped query.
+
+The caller passes the filtered jobs as a subquery over ``FACET_COLUMNS``.
+On Postgres every facet, and the total, is counted in a single
+``GROUP BY GROUPING SETS`` pass over it; other databases (the SQLite dev
+setup) get the equivalent ``UNION ALL`` of one ``GROUP BY`` per facet and a
+``count(*)``. A window function then keeps
+the ``JOB_FACET_LIMIT`` most common values of each facet, which matters for
+the free-text location and company columns.
+"""
+import os
+from typing import Dict, List
+
+from sqlalchemy import String, case, cast, func, literal_column, null, or_, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Job
+
+JOB_FACET_LIMIT = int(os.getenv("JOB_FACET_LIMIT", "20"))
+
+FACET_COLUMNS = {
+    "company_size": Job.company_size,
+    "experience_level": Job.experience_level,
+    "status": Job.status,
+    "location": Job.location,
+    "company": Job.company,
+}
+
+
+# Facet name of the row holding the number of jobs
+TOTAL = "total"
+
+
+def _facet_name(name: str):
+    # Inlined rather than bound: Postgres can't infer the type of a bind that only appears in CASE ... THEN
+    return literal_column(f"'{name}'", String)
+
+
+def _grouping_sets(jobs):
+    grouped = {name: func.grouping(jobs.c[name]) == 0 for name in FACET_COLUMNS}
+    return (
+        select(
+            case(
+                *((grouped[name], _facet_name(name)) for name in FACET_COLUMNS),
+                else_=_facet_name(TOTAL),
+            ).label("facet"),
+            case(*((grouped[name], cast(jobs.c[name], String)) for name in FACET_COLUMNS)).label("value"),
+            func.count().label("count"),
+        )
+        # The empty grouping set is the grand total
+        .group_by(func.grouping_sets(*(tuple_(jobs.c[name]) for name in FACET_COLUMNS), tuple_()))
+    )
+
+
+def _union_all(jobs):
+    return union_all(
+        *(
+            select(
+                _facet_name(name).label("facet"),
+                cast(jobs.c[name], String).label("value"),
+                func.count().label("count"),
+            ).group_by(jobs.c[name])
+            for name in FACET_COLUMNS
+        ),
+        select(_facet_name(TOTAL).label("facet"), cast(null(), String).label("value"), func.count().label("count"))
+        .select_from(jobs),
+    )
+
+
+async def facet_counts(db: AsyncSession, jobs, limit: int = JOB_FACET_LIMIT) -> Dict:
+    """``{"total": n, facet: [{"value": ..., "count": ...}, ...], ...}`` for the ``jobs`` subquery.
+
+    Values are ordered by count, then value; jobs with no value for a facet
+    are left out of it. ``total`` is the number of jobs, counted in the
+    same pass rather than summed from a (possibly truncated) facet.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        counts = _grouping_sets(jobs).subquery()
+    else:
+        counts = _union_all(jobs).subquery()
+
+    rank = func.row_number().over(partition_by=counts.c.facet, order_by=(counts.c["count"].desc(), counts.c.value))
+    ranked = (
+        select(counts.c.facet, counts.c.value, counts.c["count"], rank.label("rank"))
+        .where(or_(counts.c.value.isnot(None), counts.c.facet == TOTAL))
+        .subquery()
+    )
+    result = await db.execute(
+        select(ranked.c.facet, ranked.c.value, ranked.c["count"])
+        .where(ranked.c.rank <= limit)
+        .order_by(ranked.c.facet, ranked.c.rank)
+    )
+
+    total = 0
+    facets: Dict[str, List[Dict]] = {name: [] for name in FACET_COLUMNS}
+    for facet, value, count in result:
+        if facet == TOTAL:
+            total = count
+        else:
+            facets[facet].append({"value": value, "count": count})
+    return {"total": total, **facets}
@@ -0,0 +1,40 @@
+"""Projection queries for job listings.
+
+``list_jobs`` used to load full ``Job`` entities (every column, including the
+unbounded description), register them in the identity map and validate each
+one into ``JobSummary`` before serializing. Listings now select only the
+``JobSummary`` columns as plain rows, optionally cut the description to a
+snippet in SQL, and hand the row dicts to ``pydantic_core.to_json``, which
+writes datetimes and enums exactly like the schema serializer would.
+
+benchmarks/bench_list_jobs_projection.py compares the two paths.
+"""
+from typing import Dict, List, Optional
+
+from pydantic_core import to_json
+from sqlalchemy import func, select
+
+from app.models import Job
+from app.schemas import JobSummary
+
+SUMMARY_FIELDS = tuple(JobSummary.model_fields)
+
+
+def summary_query(description_chars: Optional[int] = None):
+    """``select`` of the JobSummary columns, with the description cut to ``description_chars`` if given"""
+    columns = []
+    for name in SUMMARY_FIELDS:
+        if name == "description" and description_chars is not None:
+            columns.append(func.substr(Job.description, 1, description_chars).label("description"))
+        else:
+            columns.append(getattr(Job, name))
+    return select(*columns)
+
+
+def summary_rows(result) -> List[Dict]:
+    return [dict(row) for row in result.mappings()]
+
+
+def dump_json(content) -> bytes:
+    """JSON bytes of summary rows (or a page dict of them), without schema validation"""
+    return to_json(content)
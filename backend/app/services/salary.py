@@ -0,0 +1,203 @@
+"""Salary normalization: free-text ``salary_range`` to annualized numbers.
+
+``parse_salary`` turns strings like "$120,000 - $160,000 a year", "$50 an
+hour", "Up to $80K", "$1.2M" or "£40,000 per annum" into an annual (min, max,
+currency) triple, which is stored in the indexed ``jobs.salary_min`` /
+``salary_max`` / ``salary_currency`` columns that the ``min_salary`` and
+``max_salary`` listing filters use. Scraped pages repeat the same few salary
+strings over and over, so ``parse_salaries`` parses each distinct string in a
+batch once and the per-string results are memoized.
+
+Jobs written through the ORM are parsed by mapper events; the bulk ingest
+path fills the columns itself. Backfill existing rows with::
+
+    python -m app.services.salary --backfill
+"""
+import argparse
+import asyncio
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import bindparam, event, inspect, select, update
+
+from app.models import Job
+
+# Working hours/days/weeks/months in a year
+PERIOD_MULTIPLIERS = {
+    "hour": 2080,
+    "day": 260,
+    "week": 52,
+    "month": 12,
+    "year": 1,
+}
+# Annual amounts outside this range are parse errors, not salaries
+MIN_ANNUAL_SALARY = 1_000
+MAX_ANNUAL_SALARY = 10_000_000
+# Bare amounts below this (no period given) are read as hourly rates
+HOURLY_GUESS_CEILING = 500
+# "$120K", "$1.2M"
+SUFFIX_MULTIPLIERS = {"k": 1_000, "m": 1_000_000}
+
+CURRENCY_SYMBOLS = {
+    "ca$": "CAD", "c$": "CAD", "a$": "AUD", "au$": "AUD",
+    "$": "USD", "£": "GBP", "€": "EUR", "₹": "INR", "¥": "JPY",
+}
+CURRENCY_CODES = {"usd", "cad", "aud", "gbp", "eur", "inr", "jpy", "chf", "sgd", "nzd"}
+
+_AMOUNT_RE = re.compile(
+    r"(?P<currency>ca\$|au\$|c\$|a\$|[$£€₹¥]|\b(?:%s)\b)?\s*"
+    r"(?P<number>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)\s*(?P<suffix>[km]\b)?" % "|".join(sorted(CURRENCY_CODES)),
+    re.IGNORECASE,
+)
+_PERIOD_RE = re.compile(
+    r"\b(?:an?|per|/)?\s*(?P<period>hour|hr|hourly|day|daily|week|weekly|month|monthly|mo|year|yr|annual|annually|annum)\b",
+    re.IGNORECASE,
+)
+_PERIOD_ALIASES = {
+    "hr": "hour", "hourly": "hour", "daily": "day", "weekly": "week", "monthly": "month", "mo": "month",
+    "yr": "year", "annual": "year", "annually": "year", "annum": "year",
+}
+_UP_TO_RE = re.compile(r"\b(?:up to|max(?:imum)?)\b", re.IGNORECASE)
+_FROM_RE = re.compile(r"\b(?:from|starting at|min(?:imum)?)\b", re.IGNORECASE)
+
+
+class Salary(NamedTuple):
+    min: Optional[int]
+    max: Optional[int]
+    currency: Optional[str]
+
+
+@lru_cache(maxsize=4096)
+def parse_salary(text: Optional[str]) -> Optional[Salary]:
+    """Annualized salary range of ``text``, or None when it holds no usable amount"""
+    if not text:
+        return None
+    matches = list(_AMOUNT_RE.finditer(text))[:2]
+    if not matches:
+        return None
+
+    currency = None
+    amounts = []
+    suffixes = [(match.group("suffix") or "").lower() for match in matches]
+    for match, suffix in zip(matches, suffixes):
+        amounts.append(float(match.group("number").replace(",", "")) * SUFFIX_MULTIPLIERS.get(suffix, 1))
+        symbol = (match.group("currency") or "").lower()
+        if symbol and currency is None:
+            currency = CURRENCY_SYMBOLS.get(symbol) or symbol.upper()
+    # "$100 - 120K", "$1 - 1.5M": a trailing suffix applies to the whole range
+    if len(amounts) == 2 and suffixes[1] and not suffixes[0] and amounts[0] < 1000:
+        amounts[0] *= SUFFIX_MULTIPLIERS[suffixes[1]]
+
+    period_match = _PERIOD_RE.search(text)
+    if currency is None and period_match is None:
+        # A bare number ("401k match") is not a salary
+        return None
+    if period_match:
+        period = period_match.group("period").lower()
+        period = _PERIOD_ALIASES.get(period, period)
+    else:
+        period = "hour" if max(amounts) < HOURLY_GUESS_CEILING else "year"
+    annual = [round(amount * PERIOD_MULTIPLIERS[period]) for amount in amounts]
+    if any(not MIN_ANNUAL_SALARY <= amount <= MAX_ANNUAL_SALARY for amount in annual):
+        return None
+
+    if len(annual) == 2:
+        return Salary(min(annual), max(annual), currency)
+    if _UP_TO_RE.search(text):
+        return Salary(None, annual[0], currency)
+    if _FROM_RE.search(text):
+        return Salary(annual[0], None, currency)
+    return Salary(annual[0], annual[0], currency)
+
+
+def parse_salaries(texts: Iterable[Optional[str]]) -> List[Optional[Salary]]:
+    """``parse_salary`` over a batch, parsing each distinct string once"""
+    texts = list(texts)
+    parsed: Dict[Optional[str], Optional[Salary]] = {text: parse_salary(text) for text in set(texts)}
+    return [parsed[text] for text in texts]
+
+
+def salary_columns(text: Optional[str]) -> Dict[str, Optional[object]]:
+    salary = parse_salary(text)
+    if salary is None:
+        return {"salary_min": None, "salary_max": None, "salary_currency": None}
+    return {"salary_min": salary.min, "salary_max": salary.max, "salary_currency": salary.currency}
+
+
+def _set_salary_columns(target: Job):
+    for name, value in salary_columns(target.salary_range).items():
+        setattr(target, name, value)
+
+
+def _parse_new_job(mapper, connection, target):
+    if target.salary_min is None and target.salary_max is None:
+        _set_salary_columns(target)
+
+
+def _reparse_job(mapper, connection, target):
+    if inspect(target).attrs.salary_range.history.has_changes():
+        _set_salary_columns(target)
+
+
+event.listen(Job, "before_insert", _parse_new_job)
+event.listen(Job, "before_update", _reparse_job)
+
+
+async def backfill(batch_size: int = 1000) -> int:
+    """Parse ``salary_range`` of every job into the numeric columns, one chunk per transaction"""
+    from app.database import AsyncSessionLocal, async_engine
+
+    total = 0
+    last_id = 0
+    try:
+        async with AsyncSessionLocal() as db:
+            while True:
+                rows = (await db.execute(
+                    select(Job.id, Job.salary_range)
+                    .where(Job.salary_range.isnot(None), Job.id > last_id)
+                    .order_by(Job.id)
+                    .limit(batch_size)
+                )).all()
+                if not rows:
+                    break
+                salaries = parse_salaries(row.salary_range for row in rows)
+                await db.execute(
+                    update(Job.__table__)
+                    .where(Job.__table__.c.id == bindparam("job_id"))
+                    .values(
+                        salary_min=bindparam("min"),
+                        salary_max=bindparam("max"),
+                        salary_currency=bindparam("currency"),
+                    ),
+                    [
+                        {
+                            "job_id": row.id,
+                            "min": salary.min if salary else None,
+                            "max": salary.max if salary else None,
+                            "currency": salary.currency if salary else None,
+                        }
+                        for row, salary in zip(rows, salaries)
+                    ],
+                )
+                await db.commit()
+                total += len(rows)
+                last_id = rows[-1].id
+    finally:
+        await async_engine.dispose()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Salary column maintenance")
+    parser.add_argument("--backfill", action="store_true", help="parse salary_range of existing jobs")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    if not args.backfill:
+        parser.print_help()
+        return
+    print(f"Parsed salaries of {asyncio.run(backfill(args.batch_size))} jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Streaming scrape pipeline: fetch -> parse -> normalize -> dedupe -> persist.
+
+Every stage is an async iterator over result pages (lists of job dicts), so a
+page moves through the whole chain as soon as it is downloaded. Memory is
+bounded by the scraper's prefetch window, not by ``limit``, and persistence
+(``stage_job_pages``) commits page by page, starting on the first one::
+
+    pages = scrape_stream(scraper, query, location, limit, stats)
+    staged = await stage_job_pages(db, job_source, pages, scraped_by_id)
+
+``iter_jobs`` flattens a page stream for consumers that want single jobs,
+like the streaming preview.
+"""
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from app.services.ingest import external_key
+from app.services.scrapers.base import BaseScraper
+from app.services.scrapers.fetcher import FetchStats
+
+Pages = AsyncIterator[List[Dict]]
+
+
+async def limit_pages(pages: Pages, limit: int) -> Pages:
+    """Stop after ``limit`` jobs, trimming the last page.
+
+    Returns as soon as the limit is met rather than on the next page, so
+    the upstream stages aren't asked for a page nobody will use.
+    """
+    remaining = limit
+    async with aclosing(pages):
+        if remaining <= 0:
+            return
+        async for page_jobs in pages:
+            page_jobs = page_jobs[:remaining]
+            remaining -= len(page_jobs)
+            yield page_jobs
+            if remaining <= 0:
+                return
+
+
+async def normalize_pages(pages: Pages) -> Pages:
+    """Strip whitespace and give every job the key it will be deduped and staged under"""
+    async with aclosing(pages):
+        async for page_jobs in pages:
+            normalized = []
+            for job_data in page_jobs:
+                job_data = {k: v.strip() if isinstance(v, str) else v for k, v in job_data.items()}
+                job_data["external_id"] = external_key(job_data)
+                normalized.append(job_data)
+            yield normalized
+
+
+async def dedupe_pages(pages: Pages) -> Pages:
+    """Drop jobs already seen earlier in the stream (boards repeat promoted cards across pages)"""
+    seen = set()
+    async with aclosing(pages):
+        async for page_jobs in pages:
+            unique = []
+            for job_data in page_jobs:
+                if job_data["external_id"] not in seen:
+                    seen.add(job_data["external_id"])
+                    unique.append(job_data)
+            yield unique
+
+
+async def skip_known(pages: Pages, known: Set[str]) -> Pages:
+    """Drop already-seen jobs and stop at the first page that is entirely known"""
+    async with aclosing(pages):
+        async for page_jobs in pages:
+            fresh = [job_data for job_data in page_jobs if job_data["external_id"] not in known]
+            if page_jobs and not fresh:
+                return
+            yield fresh
+
+
+def scrape_stream(
+    scraper: BaseScraper,
+    query: str,
+    location: str,
+    limit: int,
+    stats: Optional[FetchStats] = None,
+    known: Optional[Set[str]] = None,
+) -> Pages:
+    """Normalized, deduplicated result pages of one search, as they arrive.
+
+    With ``known`` (the query's watermark, app/services/watermarks.py) the
+    board is asked for newest postings first and paging stops at the first
+    page of known ids; pages are then requested one at a time so nothing is
+    fetched past that point. ``limit`` counts unique jobs: repeats the
+    board shows on several pages are dropped before they are counted.
+    """
+    if known is None:
+        pages = scraper.iter_pages(query, location, limit, stats)
+        return limit_pages(dedupe_pages(normalize_pages(pages)), limit)
+
+    pages = scraper.iter_pages(query, location, limit, stats, newest_first=True, prefetch=1 if known else None)
+    return limit_pages(dedupe_pages(skip_known(normalize_pages(pages), known)), limit)
+
+
+async def iter_jobs(pages: Pages) -> AsyncIterator[Dict]:
+    async with aclosing(pages):
+        async for page_jobs in pages:
+            for job_data in page_jobs:
+                yield job_data
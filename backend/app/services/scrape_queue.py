@@ -0,0 +1,294 @@
+"""Persistent queue of scrape runs and the worker that executes them.
+
+The API only inserts a ``scrape_tasks`` row; workers started with::
+
+    python -m app.services.scrape_queue --concurrency 4
+
+claim queued tasks (``FOR UPDATE SKIP LOCKED`` plus a conditional status
+update, so two workers never run the same task), scrape, stage the results
+(app/services/staging.py) and record the outcome. Every attempt is logged as
+a ``scrape_runs`` row with its timings and fetch/ingest counts. A failed attempt is
+re-queued with exponential backoff until ``max_attempts`` is reached. Workers
+abandon a scrape after ``SCRAPE_TASK_DEADLINE_SECONDS``, so a task still
+``running`` ``SCRAPE_TASK_STALE_GRACE_SECONDS`` past that deadline lost its
+worker mid-run: its run is closed as failed and the task goes back to the
+queue, or fails once it has used up its attempts.
+
+Incremental tasks only fetch postings newer than the search's watermark
+(app/services/watermarks.py). Schedule refreshes of every known search from
+cron with::
+
+    python -m app.services.scrape_queue --enqueue-refreshes --max-age 3600
+"""
+import argparse
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal, async_engine
+from app.models import JobSource, ScrapeRun, ScrapeRunStatus, ScrapeTask, ScrapeTaskStatus
+from app.services.ingest import get_or_create_source
+from app.services.scrapers.fetcher import FetchStats
+from app.services.scrapers.registry import make_scraper
+from app.services.scrape_pipeline import scrape_stream
+from app.services.staging import STAGING_PROMOTE_INLINE, promote_and_invalidate, stage_job_pages
+from app.services.watermarks import advance_watermark, seen_ids, stale_watermarks
+
+SCRAPE_WORKER_CONCURRENCY = int(os.getenv("SCRAPE_WORKER_CONCURRENCY", "2"))
+SCRAPE_WORKER_POLL_SECONDS = float(os.getenv("SCRAPE_WORKER_POLL_SECONDS", "5"))
+# Longest a worker lets one scrape (fetch, stage and inline promotion) run
+SCRAPE_TASK_DEADLINE_SECONDS = float(os.getenv("SCRAPE_TASK_DEADLINE_SECONDS", "1800"))
+# Extra time past the deadline before a running task counts as orphaned
+SCRAPE_TASK_STALE_GRACE_SECONDS = float(os.getenv("SCRAPE_TASK_STALE_GRACE_SECONDS", "300"))
+SCRAPE_RETRY_BACKOFF_SECONDS = float(os.getenv("SCRAPE_RETRY_BACKOFF_SECONDS", "60"))
+SCRAPE_REFRESH_MAX_AGE_SECONDS = float(os.getenv("SCRAPE_REFRESH_MAX_AGE_SECONDS", "3600"))
+SCRAPE_REFRESH_LIMIT = int(os.getenv("SCRAPE_REFRESH_LIMIT", "100"))
+
+
+async def enqueue_scrape(
+    db: AsyncSession,
+    source: str,
+    query: str,
+    location: str,
+    limit: int,
+    requested_by_id: Optional[int],
+    incremental: bool = False,
+) -> ScrapeTask:
+    task = ScrapeTask(
+        source=source,
+        query=query,
+        location=location,
+        limit=limit,
+        requested_by_id=requested_by_id,
+        incremental=incremental,
+    )
+    db.add(task)
+    await db.flush()
+    return task
+
+
+def requeue(task: ScrapeTask):
+    """Put a finished task back in the queue with a fresh set of attempts"""
+    task.status = ScrapeTaskStatus.QUEUED
+    task.attempts = 0
+    task.run_after = datetime.now(timezone.utc)
+    task.locked_by = None
+    task.finished_at = None
+
+
+async def claim_task(db: AsyncSession, worker_id: str) -> Optional[ScrapeTask]:
+    """Mark the next runnable task as running for ``worker_id`` and commit the claim"""
+    while True:
+        now = datetime.now(timezone.utc)
+        task_id = (await db.execute(
+            select(ScrapeTask.id)
+            .where(ScrapeTask.status == ScrapeTaskStatus.QUEUED, ScrapeTask.run_after <= now)
+            .order_by(ScrapeTask.run_after, ScrapeTask.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )).scalar()
+        if task_id is None:
+            await db.rollback()
+            return None
+
+        # The status check keeps claims exclusive where SKIP LOCKED isn't available (SQLite)
+        claimed = await db.execute(
+            update(ScrapeTask)
+            .where(ScrapeTask.id == task_id, ScrapeTask.status == ScrapeTaskStatus.QUEUED)
+            .values(
+                status=ScrapeTaskStatus.RUNNING,
+                attempts=ScrapeTask.attempts + 1,
+                locked_by=worker_id,
+                started_at=now,
+            )
+        )
+        await db.commit()
+        if claimed.rowcount:
+            return await db.get(ScrapeTask, task_id, populate_existing=True)
+
+
+async def enqueue_refreshes(max_age_seconds: float, limit: int) -> int:
+    """Queue an incremental run for every watermarked search not refreshed within ``max_age_seconds``"""
+    async with AsyncSessionLocal() as db:
+        watermarks = await stale_watermarks(db, max_age_seconds)
+        for watermark in watermarks:
+            await enqueue_scrape(
+                db, watermark.source, watermark.query, watermark.location, limit,
+                requested_by_id=None, incremental=True,
+            )
+        await db.commit()
+    return len(watermarks)
+
+
+async def requeue_stale_tasks(db: AsyncSession) -> int:
+    """Recover tasks whose worker died mid-run; returns how many were recovered"""
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=SCRAPE_TASK_DEADLINE_SECONDS + SCRAPE_TASK_STALE_GRACE_SECONDS)
+    stale = (await db.execute(
+        select(ScrapeTask.id)
+        .where(ScrapeTask.status == ScrapeTaskStatus.RUNNING, ScrapeTask.started_at < cutoff)
+        .with_for_update(skip_locked=True)
+    )).scalars().all()
+    if not stale:
+        await db.rollback()
+        return 0
+
+    error = "Worker timed out"
+    await db.execute(
+        update(ScrapeRun)
+        .where(ScrapeRun.task_id.in_(stale), ScrapeRun.status == ScrapeRunStatus.RUNNING)
+        .values(status=ScrapeRunStatus.FAILED, completed_at=now, error=error)
+    )
+    running = [ScrapeTask.id.in_(stale), ScrapeTask.status == ScrapeTaskStatus.RUNNING]
+    await db.execute(
+        update(ScrapeTask)
+        .where(*running, ScrapeTask.attempts < ScrapeTask.max_attempts)
+        .values(status=ScrapeTaskStatus.QUEUED, locked_by=None, last_error=error, run_after=now)
+    )
+    await db.execute(
+        update(ScrapeTask)
+        .where(*running)
+        .values(status=ScrapeTaskStatus.FAILED, locked_by=None, last_error=error, finished_at=now)
+    )
+    await db.commit()
+    return len(stale)
+
+
+async def scrape_and_stage(task: ScrapeTask, run: ScrapeRun, stats: FetchStats) -> int:
+    """Run one scrape, staging each page as it arrives; returns the number of staged rows"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(JobSource).where(JobSource.name == task.source))
+        scraper = make_scraper(task.source, result.scalars().first())
+        job_source = await get_or_create_source(db, scraper.get_source_info())
+        known = await seen_ids(db, task.source, task.query, task.location) if task.incremental else None
+        await db.commit()
+
+        pages = scrape_stream(scraper, task.query, task.location, task.limit, stats, known=known)
+        staged = await stage_job_pages(
+            db, job_source, pages, scraped_by_id=task.requested_by_id, scrape_run_id=run.id
+        )
+        # Full runs advance the watermark too, so the next incremental run starts from them
+        await advance_watermark(db, task.source, task.query, task.location, run.id)
+        await db.commit()
+
+    # Deployments running dedicated promoters (python -m app.services.staging) turn this off
+    if STAGING_PROMOTE_INLINE:
+        await promote_and_invalidate()
+    return staged
+
+
+async def start_run(db: AsyncSession, task: ScrapeTask) -> ScrapeRun:
+    run = ScrapeRun(
+        task_id=task.id,
+        source=task.source,
+        query=task.query,
+        location=task.location,
+        triggered_by_id=task.requested_by_id,
+    )
+    db.add(run)
+    await db.commit()
+    return run
+
+
+def finish_run(run: ScrapeRun, stats: FetchStats, jobs_found: Optional[int], error: Optional[str]):
+    # jobs_saved/jobs_duplicated are added by the promoters, never written here
+    run.status = ScrapeRunStatus.FAILED if error else ScrapeRunStatus.COMPLETED
+    run.completed_at = datetime.now(timezone.utc)
+    run.pages_fetched = stats.pages_fetched
+    run.bytes_downloaded = stats.bytes_downloaded
+    run.jobs_found = jobs_found or 0
+    run.error = error
+
+
+async def run_task(db: AsyncSession, task: ScrapeTask):
+    print(f"Starting scrape task {task.id}: {task.source} | {task.query} in {task.location} (attempt {task.attempts})")
+    run = await start_run(db, task)
+    stats = FetchStats()
+    try:
+        task.jobs_found = await asyncio.wait_for(scrape_and_stage(task, run, stats), SCRAPE_TASK_DEADLINE_SECONDS)
+    except Exception as e:
+        if isinstance(e, asyncio.TimeoutError):
+            task.last_error = f"Scrape exceeded its {SCRAPE_TASK_DEADLINE_SECONDS:g}s deadline"
+        else:
+            task.last_error = f"{type(e).__name__}: {e}"
+        finish_run(run, stats, None, task.last_error)
+        task.locked_by = None
+        if task.attempts < task.max_attempts:
+            task.status = ScrapeTaskStatus.QUEUED
+            backoff = SCRAPE_RETRY_BACKOFF_SECONDS * 2 ** (task.attempts - 1)
+            task.run_after = datetime.now(timezone.utc) + timedelta(seconds=backoff)
+        else:
+            task.status = ScrapeTaskStatus.FAILED
+            task.finished_at = datetime.now(timezone.utc)
+        print(f"Scrape task {task.id} failed: {task.last_error}")
+    else:
+        task.status = ScrapeTaskStatus.SUCCEEDED
+        task.finished_at = datetime.now(timezone.utc)
+        task.last_error = None
+        finish_run(run, stats, task.jobs_found, None)
+        print(f"Scrape task {task.id} completed: {task.jobs_found} jobs staged")
+    await db.commit()
+
+
+async def worker_loop(worker_id: str, poll_seconds: float, stop: asyncio.Event):
+    async with AsyncSessionLocal() as db:
+        while not stop.is_set():
+            await requeue_stale_tasks(db)
+            task = await claim_task(db, worker_id)
+            if task is None:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await run_task(db, task)
+
+
+async def run_worker(concurrency: int, poll_seconds: float, stop: Optional[asyncio.Event] = None):
+    """Run ``concurrency`` task loops until ``stop`` is set"""
+    stop = stop or asyncio.Event()
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    try:
+        await asyncio.gather(*(
+            worker_loop(f"{prefix}:{n}", poll_seconds, stop) for n in range(concurrency)
+        ))
+    finally:
+        await async_engine.dispose()
+
+
+async def run_enqueue_refreshes(max_age_seconds: float, limit: int) -> int:
+    try:
+        return await enqueue_refreshes(max_age_seconds, limit)
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued scrape tasks")
+    parser.add_argument("--concurrency", type=int, default=SCRAPE_WORKER_CONCURRENCY,
+                        help="tasks run at the same time by this process")
+    parser.add_argument("--poll", type=float, default=SCRAPE_WORKER_POLL_SECONDS,
+                        help="seconds to wait before checking an empty queue again")
+    parser.add_argument("--enqueue-refreshes", action="store_true",
+                        help="queue incremental runs for stale searches and exit (for cron)")
+    parser.add_argument("--max-age", type=float, default=SCRAPE_REFRESH_MAX_AGE_SECONDS,
+                        help="with --enqueue-refreshes, refresh searches older than this many seconds")
+    parser.add_argument("--refresh-limit", type=int, default=SCRAPE_REFRESH_LIMIT,
+                        help="with --enqueue-refreshes, result limit of each refresh run")
+    args = parser.parse_args()
+    if args.enqueue_refreshes:
+        print(f"Queued {asyncio.run(run_enqueue_refreshes(args.max_age, args.refresh_limit))} refresh runs")
+        return
+    try:
+        asyncio.run(run_worker(args.concurrency, args.poll))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Scraper plugin interface.
+
+A job board plugs in by subclassing ``BaseScraper`` and decorating the class
+with ``@register_scraper``. The base class owns fetching (rate limits,
+concurrency, retries through ``AsyncFetcher``) and pagination; a plugin only
+says how to request one result page and how to parse it::
+
+    @register_scraper
+    class ExampleScraper(BaseScraper):
+        name = "example"
+        display_name = "Example"
+        default_base_url = "https://jobs.example.com"
+
+        def page_request(self, query, location, start, newest_first=False):
+            return f"{self.base_url}/search", {"q": query, "l": location, "offset": start}
+
+        def parse_page(self, html):
+            ...
+"""
+import abc
+import asyncio
+from collections import deque
+from contextlib import aclosing
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple, Type
+
+import httpx
+
+from app.services.scrapers.fetcher import AsyncFetcher, FetchStats
+from app.services.scrapers.http_cache import HttpCache, http_cache
+
+# name -> scraper class, filled by @register_scraper
+SCRAPERS: Dict[str, Type["BaseScraper"]] = {}
+
+
+class BaseScraper(abc.ABC):
+    """Base class for job board scrapers"""
+    name: str
+    display_name: str
+    default_base_url: str
+    description: str = ""
+    default_rate_limit_seconds: float = 2
+    page_size: int = 10
+    max_recommended_limit: int = 100
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+    }
+
+    def __init__(
+        self,
+        rate_limit_seconds: Optional[float] = None,
+        base_url: Optional[str] = None,
+        max_concurrency: int = 4,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        prefetch_pages: Optional[int] = None,
+        cache: Optional[HttpCache] = http_cache,
+    ):
+        self.base_url = (base_url or self.default_base_url).rstrip("/")
+        self.rate_limit_seconds = self.default_rate_limit_seconds if rate_limit_seconds is None else rate_limit_seconds
+        self.max_concurrency = max_concurrency
+        self.prefetch_pages = prefetch_pages or max_concurrency
+        # Lets tests point the scraper at a local stub (httpx.MockTransport or similar)
+        self.transport = transport
+        # The shared on-disk cache by default; None fetches everything
+        self.cache = cache
+
+    @abc.abstractmethod
+    def page_request(self, query: str, location: str, start: int, newest_first: bool = False) -> Tuple[str, Dict]:
+        """URL and query parameters of the result page beginning at offset ``start``.
+
+        ``newest_first`` asks for results sorted by posting date, which
+        incremental scrapes rely on to stop early.
+        """
+
+    @abc.abstractmethod
+    def parse_page(self, html: bytes) -> List[Dict]:
+        """Extract job dicts from one result page"""
+
+    def search_jobs(self, query: str = "software engineer", location: str = "San Francisco, CA", limit: int = 10) -> List[Dict]:
+        """Blocking wrapper around search_jobs_async for threads and scripts"""
+        return asyncio.run(self.search_jobs_async(query, location, limit))
+
+    async def search_jobs_async(
+        self,
+        query: str = "software engineer",
+        location: str = "San Francisco, CA",
+        limit: int = 10,
+        stats: Optional[FetchStats] = None,
+    ) -> List[Dict]:
+        """Fetch every result page concurrently within the source's rate limit"""
+        jobs = []
+        async with aclosing(self.iter_pages(query, location, limit, stats)) as pages:
+            async for page_jobs in pages:
+                jobs.extend(page_jobs[:limit - len(jobs)])
+        return jobs
+
+    async def iter_pages(
+        self,
+        query: str,
+        location: str,
+        limit: int,
+        stats: Optional[FetchStats] = None,
+        newest_first: bool = False,
+        prefetch: Optional[int] = None,
+    ) -> AsyncIterator[List[Dict]]:
+        """Yield result pages in order as they arrive.
+
+        Up to ``prefetch`` (default ``prefetch_pages``) pages are requested
+        ahead of the one being consumed, so downloads overlap with processing
+        while memory stays bounded however large ``limit`` is. Closing the
+        iterator cancels whatever is still in flight.
+        """
+        starts = iter(range(0, limit, self.page_size))
+        window: Deque[asyncio.Future] = deque()
+        async with self._fetcher(stats) as fetcher:
+
+            def schedule():
+                start = next(starts, None)
+                if start is not None:
+                    window.append(asyncio.ensure_future(
+                        self._scrape_page(fetcher, query, location, start, newest_first)
+                    ))
+
+            for _ in range(prefetch or self.prefetch_pages):
+                schedule()
+            try:
+                found = 0
+                while window:
+                    page_jobs = await window.popleft()
+                    found += len(page_jobs)
+                    # A short page is the last one; anything after it is past the end of the results
+                    if len(page_jobs) < self.page_size or found >= limit:
+                        yield page_jobs
+                        break
+                    schedule()
+                    yield page_jobs
+            finally:
+                for task in window:
+                    task.cancel()
+                await asyncio.gather(*window, return_exceptions=True)
+
+    def _fetcher(self, stats: Optional[FetchStats] = None) -> AsyncFetcher:
+        return AsyncFetcher(
+            rate_limit_seconds=self.rate_limit_seconds,
+            max_concurrency=self.max_concurrency,
+            headers=self.headers,
+            transport=self.transport,
+            stats=stats,
+            cache=self.cache,
+        )
+
+    async def _scrape_page(
+        self,
+        fetcher: AsyncFetcher,
+        query: str,
+        location: str,
+        start: int,
+        newest_first: bool = False,
+    ) -> List[Dict]:
+        """Scrape a single page; failures are logged and yield no jobs"""
+        url, params = self.page_request(query, location, start, newest_first)
+
+        try:
+            response = await fetcher.get(url, params=params)
+        except httpx.HTTPError as e:
+            print(f"Failed to scrape {self.name} page starting at {start}: {e}")
+            return []
+
+        try:
+            return self.parse_page(response.content)
+        except Exception as e:
+            print(f"Error parsing {self.name} page starting at {start}: {e}")
+            return []
+
+    def get_source_info(self) -> Dict:
+        """Return information about this scraper source"""
+        return {
+            'name': self.name,
+            'display_name': self.display_name,
+            'description': self.description,
+            'base_url': self.base_url,
+            'rate_limit_seconds': self.rate_limit_seconds,
+            'supports_pagination': True,
+            'max_recommended_limit': self.max_recommended_limit
+        }
+
+
+def register_scraper(scraper_class: Type[BaseScraper]) -> Type[BaseScraper]:
+    """Class decorator making a scraper available under its ``name``"""
+    if scraper_class.name in SCRAPERS and SCRAPERS[scraper_class.name] is not scraper_class:
+        raise ValueError(f"Scraper '{scraper_class.name}' is already registered")
+    SCRAPERS[scraper_class.name] = scraper_class
+    return scraper_class
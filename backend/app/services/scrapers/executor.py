@@ -0,0 +1,189 @@
+"""App-lifetime executor for scrapes run inside API requests (previews, aggregated search).
+
+``scraper_executor`` is started and stopped by the FastAPI lifespan in
+app/main.py. It bounds how many scrapes the API runs at once
+(``SCRAPER_EXECUTOR_WORKERS`` slots; further requests wait for a slot), gives
+each request a deadline, cancels a scrape once every client waiting on it has
+disconnected, and keeps finished previews for a short TTL. Identical previews
+that arrive while one is running share it instead of scraping twice.
+"""
+import asyncio
+import os
+from contextlib import aclosing, asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+from app.cache import TTLCache
+
+SCRAPER_EXECUTOR_WORKERS = int(os.getenv("SCRAPER_EXECUTOR_WORKERS", "4"))
+SCRAPER_PREVIEW_DEADLINE_SECONDS = float(os.getenv("SCRAPER_PREVIEW_DEADLINE_SECONDS", "30"))
+SCRAPER_PREVIEW_CACHE_TTL_SECONDS = float(os.getenv("SCRAPER_PREVIEW_CACHE_TTL_SECONDS", "120"))
+SCRAPER_PREVIEW_CACHE_MAX_ENTRIES = int(os.getenv("SCRAPER_PREVIEW_CACHE_MAX_ENTRIES", "256"))
+
+# How often a waiting request checks whether its client has gone away
+DISCONNECT_POLL_SECONDS = 0.5
+
+
+class ScraperExecutorStopped(RuntimeError):
+    pass
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+class _Inflight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class ScraperExecutor:
+    def __init__(
+        self,
+        max_workers: int = SCRAPER_EXECUTOR_WORKERS,
+        deadline_seconds: float = SCRAPER_PREVIEW_DEADLINE_SECONDS,
+        cache_ttl: float = SCRAPER_PREVIEW_CACHE_TTL_SECONDS,
+        cache_size: int = SCRAPER_PREVIEW_CACHE_MAX_ENTRIES,
+    ):
+        self.max_workers = max_workers
+        self.deadline_seconds = deadline_seconds
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Hashable, _Inflight] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._slots is not None
+
+    async def start(self):
+        self._slots = asyncio.Semaphore(self.max_workers)
+
+    async def stop(self):
+        """Cancel every scrape still running and refuse new ones"""
+        self._slots = None
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._inflight.clear()
+        self.cache.clear()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the ``max_workers`` scrape slots"""
+        if self._slots is None:
+            raise ScraperExecutorStopped("Scraper executor is not running")
+        async with self._slots:
+            yield
+
+    async def run(
+        self,
+        key: Hashable,
+        scrape: Callable[[], Awaitable[List[Dict]]],
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+        deadline_seconds: Optional[float] = None,
+    ) -> List[Dict]:
+        """Result of ``scrape()``, from the cache or a (possibly shared) run.
+
+        Raises ``asyncio.TimeoutError`` when the run misses its deadline (time
+        spent waiting for a slot counts) and ``ClientDisconnected`` when
+        ``is_disconnected`` reports the client has gone.
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        if self._slots is None:
+            raise ScraperExecutorStopped("Scraper executor is not running")
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            deadline = self.deadline_seconds if deadline_seconds is None else deadline_seconds
+            task = asyncio.ensure_future(self._run(key, scrape, deadline))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            inflight = self._inflight[key] = _Inflight(task)
+
+        inflight.waiters += 1
+        try:
+            return await self._wait(inflight.task, is_disconnected)
+        finally:
+            inflight.waiters -= 1
+            if inflight.waiters == 0 and not inflight.task.done():
+                # Nobody wants the result any more
+                inflight.task.cancel()
+
+    async def stream(
+        self,
+        key: Hashable,
+        items: Callable[[], AsyncIterator[Dict]],
+        deadline_seconds: Optional[float] = None,
+    ) -> AsyncIterator[Dict]:
+        """Yield the cached result for ``key``, or stream ``items()`` while holding a slot.
+
+        A stream that runs to completion is cached like a ``run`` result. The
+        response machinery closes the generator when the client disconnects,
+        which cancels the scrape.
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            for item in cached:
+                yield item
+            return
+
+        deadline = self.deadline_seconds if deadline_seconds is None else deadline_seconds
+        collected = []
+        async with self.slot():
+            async with aclosing(with_deadline(items(), deadline)) as limited:
+                async for item in limited:
+                    collected.append(item)
+                    yield item
+        self.cache.set(key, collected)
+
+    async def _run(self, key: Hashable, scrape: Callable[[], Awaitable[List[Dict]]], deadline: float) -> List[Dict]:
+        async def run_in_slot():
+            async with self.slot():
+                return await scrape()
+
+        try:
+            jobs = await asyncio.wait_for(run_in_slot(), timeout=deadline)
+            self.cache.set(key, jobs)
+            return jobs
+        finally:
+            inflight = self._inflight.get(key)
+            if inflight is not None and inflight.task is asyncio.current_task():
+                del self._inflight[key]
+
+    async def _wait(self, task: asyncio.Task, is_disconnected: Optional[Callable[[], Awaitable[bool]]]) -> List[Dict]:
+        if is_disconnected is None:
+            return await asyncio.shield(task)
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await is_disconnected():
+                raise ClientDisconnected()
+
+
+async def with_deadline(items: AsyncIterator, deadline_seconds: float) -> AsyncIterator:
+    """Pass ``items`` through until ``deadline_seconds`` have elapsed; raises ``asyncio.TimeoutError`` then"""
+    loop = asyncio.get_running_loop()
+    expires_at = loop.time() + deadline_seconds
+    try:
+        while True:
+            remaining = expires_at - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            try:
+                yield await asyncio.wait_for(items.__anext__(), timeout=remaining)
+            except StopAsyncIteration:
+                return
+    finally:
+        await items.aclose()
+
+
+def preview_key(source: str, query: str, location: str, limit: int) -> tuple:
+    return (source, " ".join(query.lower().split()), " ".join(location.lower().split()), limit)
+
+
+scraper_executor = ScraperExecutor()
@@ -0,0 +1,167 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.services.scrapers.http_cache import CacheMiss, HttpCache
+
+# Requests a host may receive back-to-back before the per-host rate applies
+SCRAPER_RATE_BURST = int(os.getenv("SCRAPER_RATE_BURST", "1"))
+SCRAPER_MAX_CONNECTIONS = int(os.getenv("SCRAPER_MAX_CONNECTIONS", "10"))
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchStats:
+    """Successful downloads and body bytes seen by a fetcher, plus responses served by the HTTP cache"""
+    pages_fetched: int = 0
+    bytes_downloaded: int = 0
+    cache_hits: int = 0
+
+
+class TokenBucket:
+    """Async token bucket: refills ``rate`` tokens per second up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """Pooled keep-alive HTTP client with per-host rate limiting and retries.
+
+    One fetcher spans a scrape: requests to the same host share a token bucket
+    that allows one request every ``rate_limit_seconds`` (after an initial
+    ``burst``), while up to ``max_concurrency`` requests are in flight at once.
+    With an ``HttpCache`` (app/services/scrapers/http_cache.py), fresh cached
+    pages skip the network and the rate limit, and stale ones are revalidated
+    with conditional requests.
+    """
+
+    def __init__(
+        self,
+        rate_limit_seconds: float = 1.0,
+        burst: int = SCRAPER_RATE_BURST,
+        max_concurrency: int = 4,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10.0,
+        retries: int = 3,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        stats: Optional[FetchStats] = None,
+        cache: Optional[HttpCache] = None,
+    ):
+        self.rate_limit_seconds = rate_limit_seconds
+        self.stats = stats if stats is not None else FetchStats()
+        self.cache = cache
+        self.burst = burst
+        # At least one attempt, so get() always returns a response or raises
+        self.retries = max(retries, 1)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=SCRAPER_MAX_CONNECTIONS,
+                max_keepalive_connections=max_concurrency,
+            ),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    def _bucket(self, url: str) -> Optional[TokenBucket]:
+        if self.rate_limit_seconds <= 0:
+            return None
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(rate=1 / self.rate_limit_seconds, capacity=self.burst)
+        return self._buckets[host]
+
+    async def _request(
+        self,
+        bucket: Optional[TokenBucket],
+        url: str,
+        params: Optional[dict],
+        headers: Optional[Dict[str, str]],
+    ) -> httpx.Response:
+        async with self._semaphore:
+            if bucket is not None:
+                await bucket.acquire()
+            return await self._client.get(url, params=params, headers=headers)
+
+    async def get(self, url: str, params: Optional[dict] = None) -> httpx.Response:
+        """GET ``url``, retrying connection errors, 429s and 5xx with exponential backoff"""
+        entry = None
+        if self.cache is not None:
+            entry = await self.cache.lookup(url, params)
+            if entry is not None and self.cache.is_fresh(entry):
+                content = await self.cache.body(entry)
+                if content is not None:
+                    self.cache.stats.hits += 1
+                    self.stats.cache_hits += 1
+                    return self.cache.response(entry, content, url, params)
+            if self.cache.offline:
+                self.cache.stats.misses += 1
+                raise CacheMiss(f"No cached response for {url}")
+
+        bucket = self._bucket(url)
+        for attempt in range(self.retries):
+            last_attempt = attempt == self.retries - 1
+            headers = self.cache.conditional_headers(entry) if entry is not None else None
+            try:
+                response = await self._request(bucket, url, params, headers)
+                if response.status_code == 304 and entry is not None:
+                    content = await self.cache.body(entry)
+                    if content is not None:
+                        await self.cache.touch(url, params, entry)
+                        self.cache.stats.revalidated += 1
+                        self.stats.cache_hits += 1
+                        return self.cache.response(entry, content, url, params)
+                    # The stored body is gone; ask again right away without validators
+                    entry = None
+                    response = await self._request(bucket, url, params, None)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES or last_attempt:
+                    response.raise_for_status()
+                    self.stats.pages_fetched += 1
+                    self.stats.bytes_downloaded += len(response.content)
+                    if self.cache is not None:
+                        self.cache.stats.misses += 1
+                        if "no-store" not in response.headers.get("cache-control", ""):
+                            await self.cache.store(url, params, response.content, response.headers)
+                    return response
+
+            wait_time = 2 ** attempt
+            print(f"Request failed (attempt {attempt + 1}), retrying in {wait_time}s...")
+            await asyncio.sleep(wait_time)
@@ -0,0 +1,210 @@
+"""On-disk HTTP cache for scraper fetches.
+
+Entries are keyed by request (URL plus sorted query parameters) and point at
+gzip-compressed bodies stored under the SHA-256 of their content, so result
+pages that come back byte-identical are stored once. ``AsyncFetcher``
+consults the cache before each GET:
+
+* fresh entry (younger than ``SCRAPER_HTTP_CACHE_TTL_SECONDS``): served from
+  disk, no request and no rate-limit token;
+* stale entry with an ETag/Last-Modified: conditional request; a 304
+  refreshes the entry and serves the stored body;
+* otherwise a normal request whose response is stored (unless it says
+  ``Cache-Control: no-store``).
+
+``SCRAPER_HTTP_CACHE_MODE`` is ``on`` (default), ``off`` or ``offline``.
+Offline mode never touches the network: every request is answered from the
+cache regardless of age, and uncached ones fail with ``CacheMiss``. Together
+with ``HttpCache.store`` this replays a scrape from saved HTML.
+
+Prune old entries and unreferenced bodies with::
+
+    python -m app.services.scrapers.http_cache --prune 86400
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qsl
+
+import httpx
+
+SCRAPER_HTTP_CACHE_MODE = os.getenv("SCRAPER_HTTP_CACHE_MODE", "on").lower()
+SCRAPER_HTTP_CACHE_DIR = os.getenv("SCRAPER_HTTP_CACHE_DIR", ".cache/scraper-http")
+SCRAPER_HTTP_CACHE_TTL_SECONDS = float(os.getenv("SCRAPER_HTTP_CACHE_TTL_SECONDS", "900"))
+
+
+class CacheMiss(httpx.TransportError):
+    """Raised in offline mode for a request that was never cached"""
+
+
+@dataclass
+class HttpCacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    stored: int = 0
+    bytes_served: int = 0
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    body: str  # SHA-256 of the uncompressed body
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_type: Optional[str] = None
+
+
+class HttpCache:
+    def __init__(self, directory: str, ttl: float = SCRAPER_HTTP_CACHE_TTL_SECONDS, offline: bool = False):
+        self.directory = directory
+        self.ttl = ttl
+        self.offline = offline
+        self.stats = HttpCacheStats()
+
+    @staticmethod
+    def request_key(url: str, params: Optional[dict] = None) -> str:
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        query.extend((str(k), str(v)) for k, v in (params or {}).items())
+        normalized = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(sorted(query)), ""))
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, "entries", key[:2], f"{key}.json")
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "bodies", digest[:2], f"{digest}.gz")
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return self.offline or time.time() - entry.stored_at < self.ttl
+
+    async def lookup(self, url: str, params: Optional[dict] = None) -> Optional[CacheEntry]:
+        return await asyncio.to_thread(self._read_entry, self.request_key(url, params))
+
+    async def body(self, entry: CacheEntry) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read_body, entry.body)
+
+    async def store(
+        self,
+        url: str,
+        params: Optional[dict],
+        content: bytes,
+        headers: Optional[httpx.Headers] = None,
+    ) -> CacheEntry:
+        headers = headers or httpx.Headers()
+        entry = CacheEntry(
+            url=url,
+            body=hashlib.sha256(content).hexdigest(),
+            stored_at=time.time(),
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            content_type=headers.get("content-type"),
+        )
+        await asyncio.to_thread(self._write, self.request_key(url, params), entry, content)
+        self.stats.stored += 1
+        return entry
+
+    async def touch(self, url: str, params: Optional[dict], entry: CacheEntry):
+        """Mark ``entry`` fresh again after a 304"""
+        entry.stored_at = time.time()
+        await asyncio.to_thread(self._write_entry, self.request_key(url, params), entry)
+
+    def conditional_headers(self, entry: CacheEntry) -> Dict[str, str]:
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def response(self, entry: CacheEntry, content: bytes, url: str, params: Optional[dict]) -> httpx.Response:
+        self.stats.bytes_served += len(content)
+        headers = {"X-Cache": "HIT"}
+        if entry.content_type:
+            headers["Content-Type"] = entry.content_type
+        return httpx.Response(200, content=content, headers=headers, request=httpx.Request("GET", url, params=params))
+
+    def _read_entry(self, key: str) -> Optional[CacheEntry]:
+        try:
+            with open(self._entry_path(key)) as f:
+                return CacheEntry(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _read_body(self, digest: str) -> Optional[bytes]:
+        try:
+            with gzip.open(self._body_path(digest), "rb") as f:
+                return f.read()
+        except (OSError, EOFError):
+            return None
+
+    def _write(self, key: str, entry: CacheEntry, content: bytes):
+        body_path = self._body_path(entry.body)
+        if not os.path.exists(body_path):
+            _atomic_write(body_path, gzip.compress(content))
+        self._write_entry(key, entry)
+
+    def _write_entry(self, key: str, entry: CacheEntry):
+        _atomic_write(self._entry_path(key), json.dumps(asdict(entry)).encode())
+
+    def prune(self, max_age: float) -> int:
+        """Delete entries older than ``max_age`` seconds and bodies no entry uses; returns entries removed"""
+        cutoff = time.time() - max_age
+        removed = 0
+        referenced = set()
+        for root, _, files in os.walk(os.path.join(self.directory, "entries")):
+            for name in files:
+                path = os.path.join(root, name)
+                entry = self._read_entry(name[:-len(".json")])
+                if entry is None or entry.stored_at < cutoff:
+                    os.remove(path)
+                    removed += 1
+                else:
+                    referenced.add(entry.body)
+        for root, _, files in os.walk(os.path.join(self.directory, "bodies")):
+            for name in files:
+                if name[:-len(".gz")] not in referenced:
+                    os.remove(os.path.join(root, name))
+        return removed
+
+
+def _atomic_write(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def create_http_cache() -> Optional[HttpCache]:
+    if SCRAPER_HTTP_CACHE_MODE == "off":
+        return None
+    if SCRAPER_HTTP_CACHE_MODE in ("on", "offline"):
+        return HttpCache(SCRAPER_HTTP_CACHE_DIR, offline=SCRAPER_HTTP_CACHE_MODE == "offline")
+    raise RuntimeError(f"Unknown SCRAPER_HTTP_CACHE_MODE '{SCRAPER_HTTP_CACHE_MODE}'")
+
+
+http_cache = create_http_cache()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper HTTP cache maintenance")
+    parser.add_argument("--prune", type=float, metavar="SECONDS", help="remove entries older than SECONDS")
+    args = parser.parse_args()
+    if args.prune is None or http_cache is None:
+        parser.print_help()
+        return
+    print(f"Removed {http_cache.prune(args.prune)} cache entries")
+
+
+if __name__ == "__main__":
+    main()
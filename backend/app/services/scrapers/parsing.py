@@ -0,0 +1,106 @@
+"""Job-card extraction shared by the HTML scrapers.
+
+A ``CardParser`` subclass declares, once, which elements are job cards and
+which elements inside a card hold each field (in fallback order). Pages are
+parsed with lxml when it is installed, and only the card subtrees are built
+into a tree; every field is then resolved in a single walk over each card.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+@dataclass(frozen=True)
+class Selector:
+    """Matches a tag by name, an optional class regex and an optional required attribute"""
+    tag: str
+    class_pattern: Optional[str] = None
+    has_attr: Optional[str] = None
+
+    def compile(self) -> "CompiledSelector":
+        pattern = re.compile(self.class_pattern) if self.class_pattern else None
+        return CompiledSelector(self.tag, pattern, self.has_attr)
+
+
+@dataclass(frozen=True)
+class CompiledSelector:
+    tag: str
+    class_re: Optional[Pattern]
+    has_attr: Optional[str]
+
+    def matches(self, element: Tag) -> bool:
+        if element.name != self.tag:
+            return False
+        if self.has_attr is not None and element.get(self.has_attr) is None:
+            return False
+        if self.class_re is not None:
+            classes = element.get("class") or []
+            # Same rule as BeautifulSoup's class_ matching: any single class, or the whole value
+            if not any(self.class_re.search(c) for c in classes) and not self.class_re.search(" ".join(classes)):
+                return False
+        return True
+
+
+class CardParser:
+    """Base class for per-site card parsers.
+
+    Subclasses set ``card`` and ``fields``; the selectors are compiled once,
+    when the subclass is defined.
+    """
+    card: Selector
+    fields: Dict[str, Tuple[Selector, ...]] = {}
+
+    _card: CompiledSelector
+    _fields: List[Tuple[str, Tuple[CompiledSelector, ...]]]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._card = cls.card.compile()
+        cls._fields = [
+            (name, tuple(selector.compile() for selector in selectors))
+            for name, selectors in cls.fields.items()
+        ]
+
+    def iter_cards(self, html) -> Iterator[Tag]:
+        """Yield the outermost card elements; nested matches belong to their parent card"""
+        strainer = SoupStrainer(self._card.tag, class_=self._card.class_re)
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=strainer)
+        for element in soup.children:
+            if isinstance(element, Tag) and self._card.matches(element):
+                yield element
+
+    def extract(self, card: Tag) -> Dict[str, Tag]:
+        """Resolve every field in one walk over the card's descendants.
+
+        For each field the first element (in document order) matching its
+        highest-priority selector wins, exactly as chained ``card.find`` calls
+        would pick it.
+        """
+        found: Dict[str, Tuple[int, Tag]] = {}
+        for element in card.descendants:
+            if not isinstance(element, Tag):
+                continue
+            for name, selectors in self._fields:
+                current = found.get(name)
+                limit = len(selectors) if current is None else current[0]
+                for priority in range(limit):
+                    if selectors[priority].matches(element):
+                        found[name] = (priority, element)
+                        break
+        return {name: element for name, (_, element) in found.items()}
+
+    def parse(self, html) -> Iterator[Dict[str, Tag]]:
+        for card in self.iter_cards(html):
+            yield self.extract(card)
+
+
+def element_text(element: Optional[Tag], default: Optional[str] = None) -> Optional[str]:
+    return element.get_text(strip=True) if element is not None else default
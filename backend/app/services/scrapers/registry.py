@@ -0,0 +1,22 @@
+"""Lookup of the registered scraper plugins (see app/services/scrapers/base.py).
+
+Importing this module imports every bundled plugin so they register
+themselves; add new scraper modules to the import list below.
+"""
+from typing import Dict, List, Optional
+
+from app.models import JobSource
+from app.services.scrapers.base import SCRAPERS, BaseScraper
+from app.services.scrapers import indeed_scraper  # noqa: F401  (registers "indeed")
+
+
+def make_scraper(source: str, job_source: Optional[JobSource] = None) -> BaseScraper:
+    """Instantiate the scraper for ``source``, honouring the JobSource rate limit when configured"""
+    scraper_class = SCRAPERS[source]
+    if job_source is not None and job_source.rate_limit_seconds is not None:
+        return scraper_class(rate_limit_seconds=job_source.rate_limit_seconds)
+    return scraper_class()
+
+
+def available_sources() -> List[Dict]:
+    return [scraper_class().get_source_info() for scraper_class in SCRAPERS.values()]
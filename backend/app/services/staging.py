@@ -0,0 +1,284 @@
+"""Staged scrape ingestion.
+
+Scrapes only append raw rows to ``scraped_jobs``; promotion workers then
+claim unprocessed rows in chunks with ``FOR UPDATE SKIP LOCKED`` (so several
+workers drain the backlog in parallel without waiting on each other) and run
+them through the batched ingest in ``app.services.ingest``. Every staged row
+ends up either linked to the job it created or flagged as a duplicate.
+Claims don't write ``job_sources``: each drain recounts
+``total_jobs_scraped`` once its batches have committed.
+
+Run dedicated promoters with::
+
+    python -m app.services.staging --workers 4
+
+and set ``STAGING_PROMOTE_INLINE=false`` so scrape tasks stop promoting on
+their own. SQLite has no row locks, so use a single worker there. Cached
+job listings can only be invalidated from these processes with
+``RESPONSE_CACHE_BACKEND=redis``.
+"""
+import argparse
+import asyncio
+import os
+from collections import defaultdict
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import false, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import JOBS_CACHE_NAMESPACE, response_cache
+from app.database import AsyncSessionLocal, async_engine
+from app.models import JobSource, ScrapedJob, ScrapeRun, User
+from app.services.dedup import pack_signature
+from app.services.ingest import INGEST_BATCH_SIZE, external_key, insert_new_jobs, refresh_source_totals
+
+STAGING_CLAIM_BATCH_SIZE = int(os.getenv("STAGING_CLAIM_BATCH_SIZE", "200"))
+STAGING_PROMOTE_INLINE = os.getenv("STAGING_PROMOTE_INLINE", "true").lower() == "true"
+
+
+@dataclass
+class PromotionResult:
+    claimed: int = 0
+    promoted: int = 0
+    duplicates: int = 0
+    # Sources whose staged rows were processed
+    source_ids: Set[int] = field(default_factory=set)
+
+    def __iadd__(self, other: "PromotionResult") -> "PromotionResult":
+        self.claimed += other.claimed
+        self.promoted += other.promoted
+        self.duplicates += other.duplicates
+        self.source_ids |= other.source_ids
+        return self
+
+
+async def stage_jobs(
+    db: AsyncSession,
+    job_source: JobSource,
+    scraped_jobs: Iterable[Dict],
+    scraped_by_id: Optional[int],
+    scrape_run_id: Optional[int] = None,
+) -> int:
+    """Append scraped jobs to ``scraped_jobs`` with multi-row inserts; returns the row count"""
+    rows = [_staged_row(job_source, job_data, scraped_by_id, scrape_run_id) for job_data in scraped_jobs]
+    for start in range(0, len(rows), INGEST_BATCH_SIZE):
+        await db.execute(insert(ScrapedJob.__table__).values(rows[start:start + INGEST_BATCH_SIZE]))
+    # A blind UPDATE rather than an ORM flush of a loaded row
+    await db.execute(
+        update(JobSource).where(JobSource.id == job_source.id).values(last_scraped_at=datetime.now(timezone.utc))
+    )
+    return len(rows)
+
+
+async def stage_job_pages(
+    db: AsyncSession,
+    job_source: JobSource,
+    pages: AsyncIterator[List[Dict]],
+    scraped_by_id: Optional[int],
+    scrape_run_id: Optional[int] = None,
+) -> int:
+    """Stage and commit each page as it arrives; returns the total row count.
+
+    Promoters can pick up the first pages while later ones are still downloading.
+    """
+    staged = 0
+    async with aclosing(pages):
+        async for page_jobs in pages:
+            if page_jobs:
+                staged += await stage_jobs(db, job_source, page_jobs, scraped_by_id, scrape_run_id)
+                await db.commit()
+    return staged
+
+
+def _staged_row(
+    job_source: JobSource,
+    job_data: Dict,
+    scraped_by_id: Optional[int],
+    scrape_run_id: Optional[int],
+) -> Dict:
+    salary_range = job_data.get("salary_range")
+    return {
+        "source_id": job_source.id,
+        "external_id": external_key(job_data),
+        "external_url": job_data.get("external_url"),
+        "title": job_data["title"][:255],
+        "company": job_data["company"][:255],
+        "description": job_data.get("description"),
+        "location": job_data.get("location"),
+        "salary_range": salary_range[:100] if salary_range else None,
+        "raw_data": job_data,
+        "is_processed": False,
+        "is_duplicate": False,
+        "confidence_score": job_data.get("confidence_score", 100),
+        "has_description": bool(job_data.get("description")),
+        "has_salary": bool(salary_range),
+        "has_location": bool(job_data.get("location")),
+        "scraped_by_id": scraped_by_id,
+        "scrape_run_id": scrape_run_id,
+    }
+
+
+async def promote_batch(db: AsyncSession, batch_size: int = STAGING_CLAIM_BATCH_SIZE) -> PromotionResult:
+    """Claim up to ``batch_size`` unprocessed rows and promote them into ``jobs``.
+
+    The claim holds row locks until the caller commits.
+    """
+    claimed: List[ScrapedJob] = (await db.execute(
+        select(ScrapedJob)
+        .where(ScrapedJob.is_processed == false())
+        .order_by(ScrapedJob.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )).scalars().all()
+    if not claimed:
+        return PromotionResult()
+
+    by_source: Dict[int, List[ScrapedJob]] = defaultdict(list)
+    for staged in claimed:
+        by_source[staged.source_id].append(staged)
+    sources = {
+        job_source.id: job_source
+        for job_source in (await db.execute(select(JobSource).where(JobSource.id.in_(list(by_source))))).scalars()
+    }
+    default_owner_id = None
+    if any(staged.scraped_by_id is None for staged in claimed):
+        default_owner_id = await _default_owner_id(db)
+
+    result = PromotionResult(claimed=len(claimed), source_ids=set(by_source))
+    # scrape run id -> [saved, duplicated]
+    run_outcomes: Dict[int, List[int]] = defaultdict(lambda: [0, 0])
+    processed_at = datetime.now(timezone.utc)
+    for source_id, staged_rows in by_source.items():
+        job_source = sources[source_id]
+        candidates = {}
+        for staged in staged_rows:
+            candidates.setdefault(staged.external_id, (_job_data(staged), staged.scraped_by_id or default_owner_id))
+        outcome = await insert_new_jobs(db, job_source, candidates)
+
+        linked = set()
+        for staged in staged_rows:
+            key = staged.external_id
+            staged.is_processed = True
+            staged.processed_at = processed_at
+            if key in outcome.created and key not in linked:
+                staged.job_id = outcome.created[key]
+                linked.add(key)
+                result.promoted += 1
+                if staged.scrape_run_id is not None:
+                    run_outcomes[staged.scrape_run_id][0] += 1
+            else:
+                staged.is_duplicate = True
+                staged.duplicate_of_job_id = outcome.created.get(key) or outcome.matched.get(key)
+                staged.confidence_score = round(outcome.similarity.get(key, 1.0) * 100)
+                result.duplicates += 1
+                if staged.scrape_run_id is not None:
+                    run_outcomes[staged.scrape_run_id][1] += 1
+            if key in outcome.signatures:
+                staged.minhash = pack_signature(outcome.signatures[key])
+
+    # In id order, so promoters sharing scrape runs can't deadlock on their rows
+    for run_id, (saved, duplicated) in sorted(run_outcomes.items()):
+        await db.execute(
+            update(ScrapeRun)
+            .where(ScrapeRun.id == run_id)
+            .values(
+                jobs_saved=ScrapeRun.jobs_saved + saved,
+                jobs_duplicated=ScrapeRun.jobs_duplicated + duplicated,
+            )
+        )
+    await db.flush()
+    return result
+
+
+def _job_data(staged: ScrapedJob) -> Dict:
+    return {
+        "title": staged.title,
+        "company": staged.company,
+        "description": staged.description,
+        "location": staged.location,
+        "salary_range": staged.salary_range,
+        "external_url": staged.external_url,
+        "minhash": staged.minhash,
+    }
+
+
+async def _default_owner_id(db: AsyncSession) -> int:
+    """Owner for rows whose triggering admin has since been deleted"""
+    owner_id = (await db.execute(
+        select(User.id).where(User.is_admin.is_(True)).order_by(User.id).limit(1)
+    )).scalar()
+    if owner_id is None:
+        raise RuntimeError("No admin user available to own promoted jobs")
+    return owner_id
+
+
+async def drain_staged_jobs(
+    batch_size: int = STAGING_CLAIM_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+) -> PromotionResult:
+    """Promote batches, committing after each, until the backlog is empty"""
+    total = PromotionResult()
+    batches = 0
+    async with AsyncSessionLocal() as db:
+        while max_batches is None or batches < max_batches:
+            try:
+                result = await promote_batch(db, batch_size)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+            if not result.claimed:
+                break
+            total += result
+            batches += 1
+        if total.promoted:
+            # Once, after the batches commit, instead of a job_sources write in every claim
+            await refresh_source_totals(db, total.source_ids)
+            await db.commit()
+    return total
+
+
+async def promote_and_invalidate(batch_size: int = STAGING_CLAIM_BATCH_SIZE) -> PromotionResult:
+    """Drain the backlog and drop cached job listings if anything was promoted.
+
+    Promoters run outside the API processes, so only a shared (redis) cache
+    can be invalidated from here; with the per-process memory backend the
+    new jobs appear once the cached listings expire.
+    """
+    result = await drain_staged_jobs(batch_size)
+    if result.promoted and response_cache.shared:
+        await response_cache.invalidate(JOBS_CACHE_NAMESPACE)
+    return result
+
+
+async def run_promoters(workers: int, batch_size: int, follow: bool, interval: float):
+    try:
+        while True:
+            results = await asyncio.gather(*(promote_and_invalidate(batch_size) for _ in range(workers)))
+            total = PromotionResult()
+            for result in results:
+                total += result
+            if total.claimed:
+                print(f"Promoted {total.promoted} staged jobs, {total.duplicates} duplicates")
+            if not follow:
+                return
+            await asyncio.sleep(interval)
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Promote staged scraped jobs into jobs")
+    parser.add_argument("--workers", type=int, default=1, help="concurrent promoters in this process")
+    parser.add_argument("--batch-size", type=int, default=STAGING_CLAIM_BATCH_SIZE)
+    parser.add_argument("--follow", action="store_true", help="keep polling for new staged rows")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between polls with --follow")
+    args = parser.parse_args()
+    asyncio.run(run_promoters(args.workers, args.batch_size, args.follow, args.interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Per-source, per-query high-water marks for incremental scraping.
+
+After every run the external ids it staged are prepended to the query's
+``scrape_watermarks`` row (capped at ``SCRAPE_WATERMARK_MAX_IDS``). An
+incremental run asks the board for the newest postings first, drops jobs
+whose ids are in the watermark and stops paging at the first page with
+nothing new, so a refresh costs a page or two instead of the full result set.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Set
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import JobSource, ScrapedJob, ScrapeTask, ScrapeTaskStatus, ScrapeWatermark
+from app.services.ingest import dialect_insert
+
+SCRAPE_WATERMARK_MAX_IDS = int(os.getenv("SCRAPE_WATERMARK_MAX_IDS", "2000"))
+
+
+def normalize_search(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+async def get_watermark(db: AsyncSession, source: str, query: str, location: str) -> Optional[ScrapeWatermark]:
+    result = await db.execute(select(ScrapeWatermark).where(
+        ScrapeWatermark.source == source,
+        ScrapeWatermark.query == normalize_search(query),
+        ScrapeWatermark.location == normalize_search(location),
+    ))
+    return result.scalars().first()
+
+
+async def seen_ids(db: AsyncSession, source: str, query: str, location: str) -> Set[str]:
+    watermark = await get_watermark(db, source, query, location)
+    return set(watermark.seen_external_ids) if watermark is not None else set()
+
+
+async def advance_watermark(db: AsyncSession, source: str, query: str, location: str, scrape_run_id: int) -> int:
+    """Fold the ids staged by ``scrape_run_id`` into the watermark; returns how many were new"""
+    staged = (await db.execute(
+        select(ScrapedJob.external_id).where(ScrapedJob.scrape_run_id == scrape_run_id).order_by(ScrapedJob.id)
+    )).scalars().all()
+
+    key = {"source": source, "query": normalize_search(query), "location": normalize_search(location)}
+    # Runs of the same search can finish at the same time; create the row if
+    # needed and lock it, so each merges its ids into what the other wrote
+    await db.execute(
+        dialect_insert(db)(ScrapeWatermark)
+        .values(**key, seen_external_ids=[])
+        .on_conflict_do_nothing(index_elements=["source", "query", "location"])
+    )
+    watermark = (await db.execute(
+        select(ScrapeWatermark)
+        .filter_by(**key)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )).scalar_one()
+
+    previous = watermark.seen_external_ids or []
+    known = set(previous)
+    new_ids = list(dict.fromkeys(key for key in staged if key not in known))
+    # Assign a new list so the JSON column is flagged as changed
+    watermark.seen_external_ids = (new_ids + previous)[:SCRAPE_WATERMARK_MAX_IDS]
+    watermark.last_scraped_at = datetime.now(timezone.utc)
+    watermark.last_new_jobs = len(new_ids)
+    return len(new_ids)
+
+
+async def stale_watermarks(db: AsyncSession, max_age_seconds: float) -> List[ScrapeWatermark]:
+    """Watermarks of active sources not refreshed for ``max_age_seconds`` and with no run pending"""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
+    # Tasks keep the search as it was typed, so match them on the normalized form
+    pending = {
+        (task_source, normalize_search(task_query), normalize_search(task_location))
+        for task_source, task_query, task_location in (await db.execute(
+            select(ScrapeTask.source, ScrapeTask.query, ScrapeTask.location)
+            .where(ScrapeTask.status.in_([ScrapeTaskStatus.QUEUED, ScrapeTaskStatus.RUNNING]))
+        )).all()
+    }
+    result = await db.execute(
+        select(ScrapeWatermark)
+        .outerjoin(JobSource, JobSource.name == ScrapeWatermark.source)
+        .where(
+            or_(JobSource.id.is_(None), JobSource.is_active.is_(True)),
+            or_(ScrapeWatermark.last_scraped_at.is_(None), ScrapeWatermark.last_scraped_at < cutoff),
+        )
+        .order_by(ScrapeWatermark.last_scraped_at)
+    )
+    return [
+        watermark for watermark in result.scalars()
+        if (watermark.source, normalize_search(watermark.query), normalize_search(watermark.location)) not in pending
+    ]
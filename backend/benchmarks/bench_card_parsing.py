@@ -0,0 +1,137 @@
+"""Measure job-card parsing throughput for the Indeed scraper.
+
+Parses a corpus of saved search result pages twice: once the way the scraper
+used to (whole-page html.parser tree, one ``card.find`` per field with freshly
+compiled patterns) and once through ``IndeedCardParser``. Reports cards/sec
+for both and checks that they extract the same jobs.
+
+    python benchmarks/bench_card_parsing.py --corpus path/to/pages/
+    python benchmarks/bench_card_parsing.py --pages 200   # synthetic pages
+
+Any ``*.html`` file in the corpus directory is treated as one result page.
+"""
+import argparse
+import pathlib
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from app.services.scrapers.indeed_scraper import IndeedScraper  # noqa: E402
+from app.services.scrapers.parsing import HTML_PARSER  # noqa: E402
+
+CARDS_PER_PAGE = 15
+
+
+def synthetic_page(page: int) -> bytes:
+    """A result page padded with the navigation and script noise real pages carry"""
+    rng = random.Random(page)
+    cards = []
+    for i in range(CARDS_PER_PAGE):
+        jk = f"{page:05d}{i:02d}"
+        salary = f'<span class="estimated-salary">${rng.randint(60, 200)},000 a year</span>' if i % 3 else ""
+        cards.append(f"""
+        <div class="job_seen_beacon"><table class="jobCard_mainContent"><tbody><tr><td class="resultContent">
+          <div class="css-1m4cuuf"><h2 class="jobTitle css-14z7akl"><a data-jk="{jk}" href="/rc/clk?jk={jk}&amp;from=serp">
+            <span title="Engineer {jk}">Engineer {jk}</span></a></h2></div>
+          <div class="company_location"><span class="companyName">Company {rng.randint(1, 500)}</span>
+            <div class="companyLocation">{rng.choice(['Remote', 'Austin, TX', 'San Francisco, CA'])}</div></div>
+          <div class="metadata salary-snippet-container">{salary}</div>
+        </td></tr></tbody></table>
+        <div class="job-snippet"><ul><li>Work on {' '.join(rng.choice(['python', 'sql', 'apis', 'infra']) for _ in range(12))}</li></ul></div>
+        </div>""")
+    nav = "".join(f'<li class="nav-item"><a href="/q-{n}">Related search {n}</a></li>' for n in range(80))
+    script = "<script>window.mosaic = {" + ",".join(f'"k{n}": {n}' for n in range(400)) + "};</script>"
+    return (
+        "<!DOCTYPE html><html><head><title>Jobs</title>" + script + "</head><body>"
+        f"<nav><ul>{nav}</ul></nav><div id='mosaic-jobResults'>{''.join(cards)}</div>"
+        f"<footer><ul>{nav}</ul></footer></body></html>"
+    ).encode()
+
+
+def legacy_parse(scraper: IndeedScraper, html: bytes):
+    """The pre-CardParser extraction path, kept here as the baseline"""
+    soup = BeautifulSoup(html, 'html.parser')
+    jobs = []
+    for card in soup.find_all('div', {'class': re.compile(r'job_seen_beacon|slider_container|jobsearch-SerpJobCard')}):
+        title_elem = (card.find('h2', {'class': re.compile(r'jobTitle')}) or
+                      card.find('a', {'data-jk': True}) or
+                      card.find('span', {'title': True}))
+        company_elem = (card.find('span', {'class': re.compile(r'companyName')}) or
+                        card.find('div', {'class': re.compile(r'company')}) or
+                        card.find('a', {'class': re.compile(r'company')}))
+        location_elem = (card.find('div', {'class': re.compile(r'companyLocation')}) or
+                         card.find('span', {'class': re.compile(r'location')}))
+        salary_elem = card.find('span', {'class': re.compile(r'salary|estimated')})
+        snippet_elem = (card.find('div', {'class': re.compile(r'job-snippet')}) or
+                        card.find('span', title=True) or
+                        card.find('div', {'class': re.compile(r'summary')}))
+        link_elem = card.find('h2', {'class': re.compile(r'jobTitle')})
+        a_tag = link_elem.find('a') if link_elem else None
+        jobs.append((
+            title_elem.get_text(strip=True) if title_elem else "Unknown Title",
+            company_elem.get_text(strip=True) if company_elem else "Unknown Company",
+            location_elem.get_text(strip=True) if location_elem else "Remote",
+            salary_elem.get_text(strip=True) if salary_elem else None,
+            snippet_elem.get_text(strip=True) if snippet_elem else "No description available",
+            scraper.base_url + a_tag['href'] if a_tag and a_tag.get('href') else None,
+        ))
+    return jobs
+
+
+def card_parser_parse(scraper: IndeedScraper, html: bytes):
+    return [
+        (job['title'], job['company'], job['location'], job['salary_range'], job['description'], job['external_url'])
+        for job in scraper.parse_page(html)
+    ]
+
+
+def load_corpus(args):
+    if args.corpus:
+        paths = sorted(pathlib.Path(args.corpus).glob("*.html"))
+        if not paths:
+            sys.exit(f"No *.html pages found in {args.corpus}")
+        return [path.read_bytes() for path in paths]
+    return [synthetic_page(page) for page in range(args.pages)]
+
+
+def measure(parse, scraper, pages, repeat):
+    best = None
+    cards = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cards = sum(len(parse(scraper, html)) for html in pages)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return cards, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of saved result pages (*.html)")
+    parser.add_argument("--pages", type=int, default=200, help="synthetic pages to generate when --corpus is not given")
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes over the corpus (best is reported)")
+    args = parser.parse_args()
+
+    pages = load_corpus(args)
+    scraper = IndeedScraper()
+    print(f"{len(pages)} pages, {sum(len(p) for p in pages) / 1024:.0f} KiB; CardParser uses '{HTML_PARSER}'")
+
+    if [legacy_parse(scraper, html) for html in pages[:5]] != [card_parser_parse(scraper, html) for html in pages[:5]]:
+        print("warning: legacy and CardParser extraction differ on the first pages")
+
+    print(f"\n{'path':<12} {'cards':>8} {'seconds':>9} {'cards/sec':>11}")
+    results = {}
+    for name, parse in (("legacy", legacy_parse), ("CardParser", card_parser_parse)):
+        cards, elapsed = measure(parse, scraper, pages, args.repeat)
+        results[name] = cards / elapsed
+        print(f"{name:<12} {cards:>8} {elapsed:>9.3f} {cards / elapsed:>11.0f}")
+    print(f"\nspeedup: {results['CardParser'] / results['legacy']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
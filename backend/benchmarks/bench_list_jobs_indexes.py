@@ -0,0 +1,158 @@
+"""Compare list_jobs query plans and latencies with and without the filter indexes.
+
+Builds a throwaway ``bench_jobs`` table with the same shape as ``jobs``, fills it
+with generated rows, then runs the queries list_jobs issues before and after
+creating the list_jobs indexes (migrations d1b66d621f87 and 28f088b6a828, as
+left by a3f7d92c1b60).
+
+    python benchmarks/bench_list_jobs_indexes.py --rows 1000000
+
+Needs a Postgres database (BENCH_DATABASE_URL, falling back to DATABASE_URL).
+
+Medians from ``--rows 1000000 --repeat 5`` on a local PostgreSQL 18.6:
+
+    query                 before (ms)   after (ms)   speedup
+    active listing             323.58         1.75    184.5x
+    company_size               235.97         1.81    130.6x
+    experience_level           236.29         1.00    235.3x
+    size + level               227.29         1.00    227.7x
+    location ILIKE             385.27         0.99    390.0x
+    company ILIKE              406.54        42.87      9.5x
+
+The active listing is an index scan backward on (status, posted_date, id); a
+separate partial (posted_date, id) WHERE status = 'active' index adds nothing.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+TABLE = "bench_jobs"
+
+CREATE_TABLE = f"""
+CREATE TABLE {TABLE} (
+    id SERIAL PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    company VARCHAR(255) NOT NULL,
+    description TEXT NOT NULL,
+    location VARCHAR(255),
+    company_size VARCHAR(8),
+    experience_level VARCHAR(11),
+    status VARCHAR(6) NOT NULL,
+    posted_date TIMESTAMP WITH TIME ZONE NOT NULL
+)
+"""
+
+# ~70% active, 20% closed, 10% draft; posted over the last two years
+FILL_TABLE = f"""
+INSERT INTO {TABLE} (title, company, description, location, company_size, experience_level, status, posted_date)
+SELECT
+    (ARRAY['Software Engineer', 'Data Scientist', 'Product Manager', 'UX Designer', 'DevOps Engineer',
+           'Sales Representative', 'Frontend Developer', 'Engineering Manager'])[1 + g % 8] || ' ' || (g % 997),
+    'Company ' || (g % 20000),
+    'Generated description for posting ' || g,
+    (ARRAY['San Francisco, CA', 'New York, NY', 'Seattle, WA', 'Austin, TX', 'Chicago, IL', 'Remote',
+           'Boston, MA', 'Denver, CO', 'Portland, OR', 'Atlanta, GA'])[1 + (g * 7) % 10],
+    (ARRAY['1-10', '11-50', '51-200', '201-1000', '1000+'])[1 + (g * 3) % 5],
+    (ARRAY['entry_level', 'associate', 'mid_level', 'senior', 'lead', 'principal', 'executive'])[1 + (g * 11) % 7],
+    CASE WHEN g % 10 < 7 THEN 'active' WHEN g % 10 < 9 THEN 'closed' ELSE 'draft' END,
+    now() - ((g * 37) % 63072000) * interval '1 second'
+FROM generate_series(1, :rows) AS g
+"""
+
+# Same definitions as the jobs indexes, against the bench table
+INDEXES = [
+    f"CREATE INDEX ix_{TABLE}_status_posted_date_id ON {TABLE} (status, posted_date, id)",
+    f"CREATE INDEX ix_{TABLE}_status_company_size_posted_date ON {TABLE} (status, company_size, posted_date)",
+    f"CREATE INDEX ix_{TABLE}_status_experience_level_posted_date ON {TABLE} (status, experience_level, posted_date)",
+    f"CREATE INDEX ix_{TABLE}_location_trgm ON {TABLE} USING gin (location gin_trgm_ops)",
+    f"CREATE INDEX ix_{TABLE}_company_trgm ON {TABLE} USING gin (company gin_trgm_ops)",
+]
+
+LISTING = "SELECT * FROM " + TABLE + " WHERE status = 'active' {extra} ORDER BY posted_date DESC, id DESC LIMIT 20"
+
+QUERIES = {
+    "active listing": LISTING.format(extra=""),
+    "company_size": LISTING.format(extra="AND company_size = '51-200'"),
+    "experience_level": LISTING.format(extra="AND experience_level = 'senior'"),
+    "size + level": LISTING.format(extra="AND company_size = '1000+' AND experience_level = 'lead'"),
+    "location ILIKE": LISTING.format(extra="AND location ILIKE '%francisco%'"),
+    "company ILIKE": LISTING.format(extra="AND company ILIKE '%company 1234%'"),
+}
+
+
+def setup(conn, rows):
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    conn.execute(text(CREATE_TABLE))
+    started = time.perf_counter()
+    conn.execute(text(FILL_TABLE), {"rows": rows})
+    conn.execute(text(f"ANALYZE {TABLE}"))
+    print(f"Generated {rows:,} rows in {time.perf_counter() - started:.1f}s")
+
+
+def run_queries(conn, repeat):
+    results = {}
+    for name, sql in QUERIES.items():
+        plan = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}")).scalars().all()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            conn.execute(text(sql)).all()
+            timings.append((time.perf_counter() - started) * 1000)
+        results[name] = (statistics.median(timings), plan)
+    return results
+
+
+def print_plans(label, results):
+    print(f"\n=== {label} ===")
+    for name, (_, plan) in results.items():
+        print(f"\n-- {name}")
+        print("\n".join(plan))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per query (median is reported)")
+    parser.add_argument("--keep", action="store_true", help=f"leave the {TABLE} table in place")
+    args = parser.parse_args()
+
+    url = os.getenv("BENCH_DATABASE_URL") or os.getenv("DATABASE_URL")
+    if not url or not url.startswith("postgresql"):
+        sys.exit("Set BENCH_DATABASE_URL (or DATABASE_URL) to a Postgres database")
+
+    engine = create_engine(url, future=True)
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        setup(conn, args.rows)
+
+        before = run_queries(conn, args.repeat)
+        print_plans("Plans without indexes", before)
+
+        started = time.perf_counter()
+        for ddl in INDEXES:
+            conn.execute(text(ddl))
+        conn.execute(text(f"ANALYZE {TABLE}"))
+        print(f"\nBuilt {len(INDEXES)} indexes in {time.perf_counter() - started:.1f}s")
+
+        after = run_queries(conn, args.repeat)
+        print_plans("Plans with indexes", after)
+
+        print(f"\n{'query':<20} {'before (ms)':>12} {'after (ms)':>12} {'speedup':>9}")
+        for name in QUERIES:
+            before_ms, after_ms = before[name][0], after[name][0]
+            print(f"{name:<20} {before_ms:>12.2f} {after_ms:>12.2f} {before_ms / max(after_ms, 0.001):>8.1f}x")
+
+        if not args.keep:
+            conn.execute(text(f"DROP TABLE {TABLE}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Rows/sec of the job listing query: ORM entities vs. the summary projection.
+
+Fills a scratch database with generated active jobs (descriptions of
+``--description-chars`` characters), then pages through them the way
+list_jobs does, once per path, a fresh session per page:
+
+* orm:        ``select(Job)`` entities, validated into ``List[JobSummary]``
+              and dumped by pydantic (the previous list_jobs path);
+* projection: ``summary_query()`` rows dumped by ``dump_json``
+              (app/services/job_listing.py);
+* snippet:    the projection with descriptions cut to ``--snippet`` chars
+              in SQL.
+
+Checks that orm and projection produce identical JSON before timing.
+
+    python benchmarks/bench_list_jobs_projection.py --rows 200000 --page-size 100
+
+Uses a temporary SQLite file unless BENCH_DATABASE_URL names a scratch
+database (async URL, e.g. postgresql+asyncpg://...); tables are created
+there if missing and the generated rows are deleted afterwards.
+"""
+import argparse
+import asyncio
+import os
+import pathlib
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import delete, insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.models import BaseModel, Job, JobStatus, User  # noqa: E402
+from app.schemas import JobSummary  # noqa: E402
+from app.services.job_listing import dump_json, summary_query, summary_rows  # noqa: E402
+
+BENCH_COMPANY_PREFIX = "Bench Company"
+WORDS = ["python", "sql", "apis", "infra", "design", "testing", "cloud", "data", "teams", "product", "scale"]
+SIZES = ["1-10", "11-50", "51-200", "201-1000", "1000+", None]
+LEVELS = ["entry_level", "associate", "mid_level", "senior", "lead", "principal", "executive", None]
+
+_summary_adapter = TypeAdapter(List[JobSummary])
+
+
+def generated_jobs(rows: int, description_chars: int, posted_by_id: int, seed: int):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    for i in range(rows):
+        description = " ".join(rng.choice(WORDS) for _ in range(description_chars // 6 + 1))[:description_chars]
+        yield {
+            "title": f"Engineer {i}",
+            "company": f"{BENCH_COMPANY_PREFIX} {i % 5000}",
+            "description": description,
+            "location": rng.choice(["San Francisco, CA", "Austin, TX", "Remote", None]),
+            "salary_range": f"${rng.randint(60, 200)},000 a year",
+            "application_url": f"https://example.com/jobs/{i}",
+            "company_size": rng.choice(SIZES),
+            "experience_level": rng.choice(LEVELS),
+            "status": JobStatus.ACTIVE,
+            "posted_date": now - timedelta(seconds=rng.randint(0, 60 * 86400)),
+            "posted_by_id": posted_by_id,
+        }
+
+
+def listing(query, page: int, page_size: int):
+    return (
+        query.where(Job.status == JobStatus.ACTIVE)
+        .order_by(Job.posted_date.desc(), Job.id.desc())
+        .offset(page * page_size)
+        .limit(page_size)
+    )
+
+
+async def orm_page(db, page: int, page_size: int) -> bytes:
+    jobs = (await db.execute(listing(select(Job), page, page_size))).scalars().all()
+    return _summary_adapter.dump_json(_summary_adapter.validate_python(jobs, from_attributes=True))
+
+
+async def projection_page(db, page: int, page_size: int, description_chars=None) -> bytes:
+    result = await db.execute(listing(summary_query(description_chars), page, page_size))
+    return dump_json(summary_rows(result))
+
+
+async def setup(engine, sessions, args) -> int:
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+    async with sessions() as db:
+        user = User(first_name="Bench", last_name="User", email=f"bench-{time.time_ns()}@example.com",
+                    password_hash="x")
+        db.add(user)
+        await db.flush()
+        started = time.perf_counter()
+        batch = []
+        for row in generated_jobs(args.rows, args.description_chars, user.id, args.seed):
+            batch.append(row)
+            if len(batch) == 5000:
+                await db.execute(insert(Job.__table__), batch)
+                batch = []
+        if batch:
+            await db.execute(insert(Job.__table__), batch)
+        await db.commit()
+        print(f"Generated {args.rows:,} jobs in {time.perf_counter() - started:.1f}s")
+        return user.id
+
+
+async def run(label: str, sessions, pages: int, page_size: int, fetch) -> float:
+    rows = 0
+    started = time.perf_counter()
+    for page in range(pages):
+        async with sessions() as db:
+            body = await fetch(db, page, page_size)
+        rows += body.count(b'"id":')
+    elapsed = time.perf_counter() - started
+    print(f"{label:<12} {elapsed:8.2f}s  {rows / elapsed:12,.0f} rows/sec")
+    return rows / elapsed
+
+
+async def main_async(args):
+    url = os.getenv("BENCH_DATABASE_URL")
+    scratch = None
+    if not url:
+        scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        url = f"sqlite+aiosqlite:///{scratch.name}"
+    engine = create_async_engine(url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+    user_id = await setup(engine, sessions, args)
+    try:
+        pages = min(args.pages, max(1, args.rows // args.page_size))
+        async with sessions() as db:
+            if await orm_page(db, 0, args.page_size) != await projection_page(db, 0, args.page_size):
+                sys.exit("orm and projection listings differ")
+
+        print(f"\n{pages:,} pages of {args.page_size}, descriptions of {args.description_chars} chars")
+        orm = await run("orm", sessions, pages, args.page_size, orm_page)
+        projection = await run("projection", sessions, pages, args.page_size, projection_page)
+        snippet = await run(
+            "snippet", sessions, pages, args.page_size,
+            lambda db, page, size: projection_page(db, page, size, args.snippet),
+        )
+        print(f"\nprojection {projection / orm:.1f}x, snippet {snippet / orm:.1f}x the orm path")
+    finally:
+        async with sessions() as db:
+            await db.execute(delete(Job).where(Job.posted_by_id == user_id))
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await engine.dispose()
+        if scratch is not None:
+            os.remove(scratch.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--pages", type=int, default=500, help="listing pages fetched per path")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--description-chars", type=int, default=4000)
+    parser.add_argument("--snippet", type=int, default=200, help="description length for the snippet path")
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
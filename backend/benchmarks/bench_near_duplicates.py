@@ -0,0 +1,148 @@
+"""Throughput and accuracy of the MinHash/LSH near-duplicate detector.
+
+Generates a synthetic corpus of job postings in which a fraction are reposts
+(an earlier posting with a reworded title, a few words swapped and a line
+appended), then streams it through the detector the way ingest does: query
+the LSH buckets for each posting, verify candidates by estimated similarity,
+and index it when it's new. Reports postings/sec, candidates per query and
+precision/recall against the known reposts.
+
+    python benchmarks/bench_near_duplicates.py --jobs 1000000
+
+Runs in memory; the index mirrors the job_lsh_buckets table (band, bucket ->
+job ids) with packed signatures standing in for jobs.minhash.
+"""
+import argparse
+import pathlib
+import random
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from app.services.dedup import (  # noqa: E402
+    LSH_BANDS,
+    NEAR_DUPLICATE_THRESHOLD,
+    band_buckets,
+    job_signature,
+    pack_signature,
+    similarity,
+    unpack_signature,
+)
+
+SENIORITY = ["Junior", "Senior", "Staff", "Lead", "Principal", ""]
+ROLES = ["Software Engineer", "Data Scientist", "Product Manager", "Designer", "DevOps Engineer",
+         "Sales Representative", "Frontend Developer", "Backend Developer", "Data Engineer", "Recruiter"]
+APPENDIX = ["Apply today.", "Remote friendly.", "Competitive salary and equity.", "Visa sponsorship available."]
+
+
+class BucketIndex:
+    """band -> bucket -> job id(s), plus packed signatures by job id"""
+
+    def __init__(self):
+        self.bands = [dict() for _ in range(LSH_BANDS)]
+        self.signatures = []
+
+    def query(self, signature, threshold):
+        candidates = set()
+        for band, bucket in band_buckets(signature):
+            hit = self.bands[band].get(bucket)
+            if hit is None:
+                continue
+            if isinstance(hit, list):
+                candidates.update(hit)
+            else:
+                candidates.add(hit)
+        best = None
+        for job_id in candidates:
+            score = similarity(signature, unpack_signature(self.signatures[job_id]))
+            if score >= threshold and (best is None or score > best[1]):
+                best = (job_id, score)
+        return best, len(candidates)
+
+    def add(self, signature):
+        job_id = len(self.signatures)
+        self.signatures.append(pack_signature(signature))
+        for band, bucket in band_buckets(signature):
+            hit = self.bands[band].get(bucket)
+            if hit is None:
+                self.bands[band][bucket] = job_id
+            elif isinstance(hit, list):
+                hit.append(job_id)
+            else:
+                self.bands[band][bucket] = [hit, job_id]
+        return job_id
+
+
+def corpus(count, repost_rate, seed):
+    """Yield (title, company, description, index of the original or None)"""
+    rng = random.Random(seed)
+    vocabulary = [f"w{n}" for n in range(20000)]
+    originals = []
+    for index in range(count):
+        if originals and rng.random() < repost_rate:
+            source = rng.choice(originals)
+            title, company, words = source[1], source[2], list(source[3])
+            title = f"{rng.choice(SENIORITY)} {title.split(' ', 1)[-1]}".strip()
+            for _ in range(max(1, len(words) // 40)):
+                words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            yield title, company, " ".join(words) + " " + rng.choice(APPENDIX), source[0]
+        else:
+            words = rng.sample(vocabulary, rng.randint(60, 160))
+            title = f"{rng.choice(SENIORITY)} {rng.choice(ROLES)}".strip()
+            company = f"Company {rng.randint(1, 50000)}"
+            originals.append((index, title, company, words))
+            if len(originals) > 50000:
+                originals.pop(rng.randrange(len(originals)))
+            yield title, company, " ".join(words), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--repost-rate", type=float, default=0.05)
+    parser.add_argument("--threshold", type=float, default=NEAR_DUPLICATE_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    index = BucketIndex()
+    # corpus position -> job id in the index, for postings that were indexed
+    job_ids = {}
+    true_positive = false_positive = missed = candidates_seen = 0
+    signing = querying = 0.0
+
+    started = time.perf_counter()
+    for position, (title, company, description, original) in enumerate(corpus(args.jobs, args.repost_rate, args.seed)):
+        t0 = time.perf_counter()
+        signature = job_signature(title, company, description)
+        t1 = time.perf_counter()
+        match, candidates = index.query(signature, args.threshold)
+        signing += t1 - t0
+        querying += time.perf_counter() - t1
+        candidates_seen += candidates
+
+        if match is None:
+            job_ids[position] = index.add(signature)
+            if original is not None:
+                missed += 1
+        elif original is not None and job_ids.get(original) == match[0]:
+            true_positive += 1
+        else:
+            false_positive += 1
+
+        if (position + 1) % 100_000 == 0:
+            print(f"  {position + 1:>9,} postings  {(position + 1) / (time.perf_counter() - started):,.0f}/sec")
+
+    elapsed = time.perf_counter() - started
+    reposts = true_positive + missed
+    flagged = true_positive + false_positive
+    print(f"\n{args.jobs:,} postings, {reposts:,} reposts, threshold {args.threshold}")
+    print(f"total        {elapsed:8.1f}s  {args.jobs / elapsed:10,.0f} postings/sec")
+    print(f"signatures   {signing:8.1f}s  {args.jobs / signing:10,.0f} /sec")
+    print(f"LSH queries  {querying:8.1f}s  {args.jobs / querying:10,.0f} /sec, {candidates_seen / args.jobs:.2f} candidates/query")
+    print(f"precision    {true_positive / flagged if flagged else 1.0:8.4f}")
+    print(f"recall       {true_positive / reposts if reposts else 1.0:8.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,19 @@
+import os
+
+from dotenv import load_dotenv
+
+# Load .env first, so a BCRYPT_ROUNDS set there wins over the seed default
+load_dotenv()
+# Demo accounts are hashed cheaply; logins upgrade them to the app's BCRYPT_ROUNDS
+os.environ.setdefault("BCRYPT_ROUNDS", os.getenv("SEED_BCRYPT_ROUNDS", "4"))
+
 from sqlalchemy.orm import Session
 from app.database import SessionLocal, engine
 from app.models import Job, BaseModel
 from app.models.user import User
 from app.models.job_source import JobSource
 from app.models.job import CompanySize, ExperienceLevel
-from app.auth import get_password_hash
+from app.auth import hash_passwords
 
 BaseModel.metadata.create_all(bind=engine)
 
@@ -37,15 +46,25 @@ def create_users():
     ]
 
     created_users = {}
+    existing_users = {
+        user.email: user
+        for user in db.query(User).filter(User.email.in_([user_data["email"] for user_data in users_data]))
+    }
+    # Only hash the passwords of users that will actually be inserted
+    new_users = [user_data for user_data in users_data if user_data["email"] not in existing_users]
+    password_hashes = dict(zip(
+        (user_data["email"] for user_data in new_users),
+        hash_passwords([user_data["password"] for user_data in new_users]),
+    ))
 
     for user_data in users_data:
-        existing_user = db.query(User).filter(User.email == user_data["email"]).first()
+        existing_user = existing_users.get(user_data["email"])
         if not existing_user:
             user = User(
                 first_name=user_data["first_name"],
                 last_name=user_data["last_name"],
                 email=user_data["email"],
-                password_hash=get_password_hash(user_data["password"]),
+                password_hash=password_hashes[user_data["email"]],
                 is_admin=user_data["is_admin"]
             )
             db.add(user)
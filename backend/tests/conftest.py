@@ -0,0 +1,117 @@
+import asyncio
+import os
+import shutil
+import tempfile
+
+# Settings are read when app modules are imported, so point them at a scratch
+# database before anything from app is loaded: a temporary SQLite file, or
+# TEST_DATABASE_URL (a throwaway Postgres database; every table is dropped
+# after each test) to also run the tests that need row locks
+_DB_DIR = tempfile.mkdtemp(prefix="jobboard-tests-")
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+os.environ["SCRAPER_HTTP_CACHE_MODE"] = "off"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.auth import _claims_revoked_at, create_access_token, get_password_hash, token_claims, user_cache  # noqa: E402
+from app.database import AsyncSessionLocal, SessionLocal, async_engine, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import BaseModel, Job, JobStatus, User  # noqa: E402
+from app.search import fallback_index  # noqa: E402
+
+
+def pytest_sessionfinish(session, exitstatus):
+    asyncio.run(async_engine.dispose())
+    engine.dispose()
+    shutil.rmtree(_DB_DIR, ignore_errors=True)
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "postgres: needs Postgres (row locks, SKIP LOCKED); set TEST_DATABASE_URL")
+
+
+def pytest_collection_modifyitems(config, items):
+    if engine.dialect.name == "postgresql":
+        return
+    skip = pytest.mark.skip(reason="needs Postgres; set TEST_DATABASE_URL")
+    for item in items:
+        if "postgres" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Fresh tables for every test"""
+    BaseModel.metadata.create_all(engine)
+    yield
+    BaseModel.metadata.drop_all(engine)
+    user_cache.clear()
+    _claims_revoked_at.clear()
+    fallback_index.loaded = False
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def async_db():
+    return AsyncSessionLocal
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_user(db):
+    def make(email="user@example.com", is_admin=False) -> User:
+        user = User(
+            first_name="Test",
+            last_name="User",
+            email=email,
+            password_hash=get_password_hash("password"),
+            is_admin=is_admin,
+        )
+        db.add(user)
+        db.commit()
+        return user
+    return make
+
+
+@pytest.fixture
+def auth_headers():
+    def headers(user) -> dict:
+        return {"Authorization": f"Bearer {create_access_token(token_claims(user))}"}
+    return headers
+
+
+@pytest.fixture
+def make_job(db, make_user):
+    owner = []
+
+    def make(title="Software Engineer", company="Acme", description="Build things", **columns) -> Job:
+        if not owner:
+            owner.append(make_user(email="owner@example.com", is_admin=True))
+        columns.setdefault("application_url", "https://example.com/apply")
+        columns.setdefault("status", JobStatus.ACTIVE)
+        job = Job(title=title, company=company, description=description, posted_by_id=owner[0].id, **columns)
+        db.add(job)
+        db.commit()
+        return job
+    return make
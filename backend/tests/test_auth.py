@@ -0,0 +1,90 @@
+import pytest
+
+from app import auth
+from app.auth import user_cache
+
+ADMIN_ONLY = "/health/db-pool"
+
+
+@pytest.fixture
+def trust_claims(monkeypatch):
+    monkeypatch.setattr(auth, "TRUST_TOKEN_CLAIMS", True)
+
+
+def test_claims_are_not_trusted_by_default(client, db, make_user, auth_headers):
+    user = make_user(is_admin=True)
+    headers = auth_headers(user)
+    # Flags changed behind the ORM's back: no invalidation event fires
+    db.execute(auth.User.__table__.update().values(is_admin=False))
+    db.commit()
+
+    assert client.get(ADMIN_ONLY, headers=headers).status_code == 403
+
+
+def test_principal_is_cached_until_the_user_changes(client, db, make_user, auth_headers):
+    user = make_user()
+    headers = auth_headers(user)
+
+    assert client.post("/users/refresh", headers=headers).status_code == 200
+    assert user_cache.get(user.id).first_name == "Test"
+
+    user.first_name = "Renamed"
+    db.commit()
+    assert user_cache.get(user.id) is None
+
+    assert client.post("/users/refresh", headers=headers).status_code == 200
+    assert user_cache.get(user.id).first_name == "Renamed"
+
+
+def test_demoted_admin_loses_access_immediately(client, db, make_user, auth_headers):
+    user = make_user(is_admin=True)
+    headers = auth_headers(user)
+    assert client.get(ADMIN_ONLY, headers=headers).status_code == 200
+
+    user.is_admin = False
+    db.commit()
+
+    assert client.get(ADMIN_ONLY, headers=headers).status_code == 403
+
+
+def test_deactivated_user_is_rejected(client, db, make_user, auth_headers):
+    user = make_user()
+    headers = auth_headers(user)
+    assert client.post("/users/refresh", headers=headers).status_code == 200
+
+    user.is_active = False
+    db.commit()
+
+    assert client.post("/users/refresh", headers=headers).status_code == 400
+
+
+def test_deleted_user_is_rejected(client, db, make_user, auth_headers):
+    user = make_user()
+    headers = auth_headers(user)
+    assert client.post("/users/refresh", headers=headers).status_code == 200
+
+    db.delete(user)
+    db.commit()
+
+    assert client.post("/users/refresh", headers=headers).status_code == 401
+
+
+def test_trusted_claims_skip_the_users_table(client, db, make_user, auth_headers, trust_claims):
+    user = make_user(is_admin=True)
+    headers = auth_headers(user)
+    db.execute(auth.User.__table__.update().values(is_admin=False))
+    db.commit()
+
+    # Nothing revoked the token, so its admin claim still counts
+    assert client.get(ADMIN_ONLY, headers=headers).status_code == 200
+
+
+def test_flag_change_revokes_trusted_claims(client, db, make_user, auth_headers, trust_claims):
+    user = make_user(is_admin=True)
+    headers = auth_headers(user)
+    assert client.get(ADMIN_ONLY, headers=headers).status_code == 200
+
+    user.is_admin = False
+    db.commit()
+
+    assert client.get(ADMIN_ONLY, headers=headers).status_code == 403
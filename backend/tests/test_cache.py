@@ -0,0 +1,123 @@
+import time
+
+import pytest
+
+from app.cache import MemoryCacheBackend, ResponseCache, TTLCache, etag_matches, response_cache
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    """The anonymous response cache, on a fresh in-process backend"""
+    monkeypatch.setattr(response_cache, "backend", MemoryCacheBackend(maxsize=100, ttl=60))
+    return response_cache
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("fresh", 1)
+    cache.set("stale", 2, ttl=-1)
+
+    assert cache.get("fresh") == 1
+    assert cache.get("stale", "missing") == "missing"
+    assert len(cache) == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert len(cache) == 2
+
+
+@pytest.mark.parametrize("if_none_match, matches", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"other", "abc"', True),
+    ("*", True),
+    ('"other"', False),
+])
+def test_etag_matches(if_none_match, matches):
+    assert etag_matches(if_none_match, '"abc"') is matches
+
+
+@pytest.mark.anyio
+async def test_invalidate_moves_keys_to_a_new_generation():
+    cache = ResponseCache(MemoryCacheBackend(maxsize=10, ttl=60), ttl=60)
+    key = await cache.key("jobs", {"skip": 0, "search": "  python  dev "})
+    assert key == await cache.key("jobs", {"search": "python dev", "skip": 0, "limit": None})
+    await cache.set(key, b"[]")
+
+    await cache.invalidate("jobs")
+
+    new_key = await cache.key("jobs", {"skip": 0, "search": "python dev"})
+    assert new_key != key
+    assert await cache.get(new_key) is None
+
+
+def test_unchanged_listing_revalidates_with_304(client, make_job, memory_cache):
+    make_job(title="Cached")
+    first = client.get("/jobs/")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert [job["title"] for job in first.json()] == ["Cached"]
+
+    second = client.get("/jobs/", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+
+
+def test_cached_listing_is_served_without_the_database(client, db, make_job, memory_cache):
+    job = make_job(title="Cached")
+    client.get("/jobs/")
+    # Changed behind the API's back: nothing invalidates the cache
+    db.execute(job.__table__.update().values(title="Renamed"))
+    db.commit()
+
+    assert [job["title"] for job in client.get("/jobs/").json()] == ["Cached"]
+
+
+def test_write_through_the_api_invalidates_cached_listings(client, make_job, make_user, auth_headers, memory_cache):
+    job = make_job(title="Before")
+    etag = client.get("/jobs/").headers["ETag"]
+    detail_etag = client.get(f"/jobs/{job.id}").headers["ETag"]
+    headers = auth_headers(make_user())
+
+    response = client.post("/jobs/", headers=headers, json={
+        "title": "After", "company": "Acme", "description": "New", "application_url": "https://example.com/2",
+    })
+    assert response.status_code == 200
+
+    listing = client.get("/jobs/", headers={"If-None-Match": etag})
+    assert listing.status_code == 200
+    assert listing.headers["ETag"] != etag
+    assert sorted(job["title"] for job in listing.json()) == ["After", "Before"]
+    # Same body, same ETag: the regenerated detail still revalidates
+    assert client.get(f"/jobs/{job.id}", headers={"If-None-Match": detail_etag}).status_code == 304
+
+
+def test_update_through_the_api_invalidates_the_cached_detail(client, make_job, auth_headers, memory_cache):
+    job = make_job(title="Before")
+    detail_etag = client.get(f"/jobs/{job.id}").headers["ETag"]
+    owner_headers = auth_headers(job.posted_by)
+
+    assert client.put(f"/jobs/{job.id}", headers=owner_headers, json={"title": "After"}).status_code == 200
+
+    detail = client.get(f"/jobs/{job.id}", headers={"If-None-Match": detail_etag})
+    assert detail.status_code == 200
+    assert detail.json()["title"] == "After"
+
+
+def test_authenticated_listings_bypass_the_cache(client, make_job, make_user, auth_headers, memory_cache):
+    make_job()
+    response = client.get("/jobs/", headers=auth_headers(make_user()))
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
@@ -0,0 +1,76 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app import database
+from app.database import PoolStats, engine_options, instrumented_pool
+
+OPEN_SECONDS = 0.05
+
+
+@pytest.fixture
+def pool_and_stats():
+    stats = PoolStats("test")
+
+    def slow_connect():
+        time.sleep(OPEN_SECONDS)
+        return sqlite3.connect(":memory:", check_same_thread=False)
+
+    pool = instrumented_pool(QueuePool, stats)(slow_connect, pool_size=1, max_overflow=0, timeout=0.2)
+    yield pool, stats
+    pool.dispose()
+
+
+def test_opening_a_connection_is_not_counted_as_wait(pool_and_stats):
+    pool, stats = pool_and_stats
+
+    pool.connect().close()
+    pool.connect().close()
+
+    assert stats.checkouts == 2
+    assert stats.opens == 1
+    assert stats.open_seconds_max >= OPEN_SECONDS
+    assert stats.wait_seconds_max < OPEN_SECONDS
+
+
+def test_waiting_for_a_checked_in_connection_is_wait(pool_and_stats):
+    pool, stats = pool_and_stats
+    held = pool.connect()
+    threading.Timer(0.1, held.close).start()
+
+    pool.connect().close()
+
+    assert stats.opens == 1
+    assert stats.timeouts == 0
+    assert 0.05 <= stats.wait_seconds_max < 0.2
+
+
+def test_exhausted_pool_counts_a_timeout(pool_and_stats):
+    pool, stats = pool_and_stats
+    held = pool.connect()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    held.close()
+
+    assert (stats.checkouts, stats.timeouts) == (2, 1)
+    assert stats.wait_seconds_max >= 0.2
+
+
+@pytest.mark.parametrize("url, connect_args", [
+    ("postgresql+psycopg://db/app", {"prepare_threshold": None}),
+    ("postgresql+psycopg_async://db/app", {"prepare_threshold": None}),
+    ("postgresql+psycopg2://db/app", None),
+    ("postgresql://db/app", None),
+])
+def test_pgbouncer_disables_prepared_statements_for_psycopg_only(monkeypatch, url, connect_args):
+    monkeypatch.setattr(database, "DB_PGBOUNCER", True)
+
+    options = engine_options(url, QueuePool, PoolStats("test"))
+
+    assert options.get("connect_args") == connect_args
+    assert options["poolclass"].__name__ == "NullPool"
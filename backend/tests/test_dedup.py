@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.models import JobLshBucket
+from app.services.dedup import (
+    LSH_BANDS,
+    NUM_HASHES,
+    LshIndex,
+    find_near_duplicates,
+    job_signature,
+    pack_signature,
+    similarity,
+    unpack_signature,
+)
+
+DESCRIPTION = (
+    "We are hiring a backend engineer to design and operate the services behind our job board. "
+    "You will own the ingestion pipeline, tune Postgres queries, review pull requests and mentor "
+    "two junior engineers. Experience with Python, asyncio and SQLAlchemy is expected; Kubernetes "
+    "and Terraform are a plus. The role is fully remote within US time zones."
+)
+REPOST = DESCRIPTION + " Apply by Friday."
+UNRELATED = (
+    "Our bakery is looking for an early-morning pastry chef to laminate croissant dough, manage the "
+    "proofing schedule and train seasonal staff on sourdough starters and wood-fired ovens."
+)
+
+
+def test_signature_shape_and_round_trip():
+    signature = job_signature("Backend Engineer", "Acme", DESCRIPTION)
+
+    assert len(signature) == NUM_HASHES
+    assert unpack_signature(pack_signature(signature)) == signature
+    assert signature == job_signature("Backend Engineer", "Acme", DESCRIPTION)
+
+
+def test_similarity_separates_reposts_from_unrelated_jobs():
+    original = job_signature("Backend Engineer", "Acme", DESCRIPTION)
+
+    assert similarity(original, original) == 1.0
+    assert similarity(original, job_signature("Backend Engineer", "Acme", REPOST)) >= 0.8
+    assert similarity(original, job_signature("Pastry Chef", "Crumb", UNRELATED)) < 0.3
+
+
+def test_lsh_index_finds_the_closest_indexed_job():
+    index = LshIndex()
+    index.add("original", job_signature("Backend Engineer", "Acme", DESCRIPTION))
+    index.add("bakery", job_signature("Pastry Chef", "Crumb", UNRELATED))
+
+    key, score = index.query(job_signature("Backend Engineer", "Acme", REPOST))
+
+    assert key == "original"
+    assert score >= 0.8
+    assert index.query(job_signature("Data Analyst", "Globex", "Spreadsheets, dashboards and SQL reports.")) is None
+    assert len(index) == 2
+
+
+def test_orm_writes_sign_and_bucket_jobs(db, make_job):
+    job = make_job(title="Backend Engineer", company="Acme", description=DESCRIPTION)
+    signature = unpack_signature(job.minhash)
+    assert signature == job_signature("Backend Engineer", "Acme", DESCRIPTION)
+
+    def buckets():
+        return db.execute(select(func.count()).select_from(JobLshBucket).where(JobLshBucket.job_id == job.id)).scalar_one()
+
+    assert buckets() == LSH_BANDS
+
+    job.description = UNRELATED
+    db.commit()
+    assert unpack_signature(job.minhash) != signature
+    assert buckets() == LSH_BANDS
+
+    db.delete(job)
+    db.commit()
+    assert buckets() == 0
+
+
+@pytest.mark.anyio
+async def test_find_near_duplicates_matches_stored_jobs(async_db, make_job):
+    original = make_job(title="Backend Engineer", company="Acme", description=DESCRIPTION)
+    make_job(title="Pastry Chef", company="Crumb", description=UNRELATED)
+
+    async with async_db() as db:
+        matches = await find_near_duplicates(db, {
+            "repost": job_signature("Backend Engineer", "Acme", REPOST),
+            "new": job_signature("Data Analyst", "Globex", "Spreadsheets, dashboards and SQL reports."),
+        })
+
+    assert set(matches) == {"repost"}
+    job_id, score = matches["repost"]
+    assert job_id == original.id
+    assert score >= 0.8
@@ -0,0 +1,159 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from app.services.scrapers import executor as executor_module
+from app.services.scrapers.executor import (
+    ClientDisconnected,
+    ScraperExecutor,
+    ScraperExecutorStopped,
+    preview_key,
+    with_deadline,
+)
+
+pytestmark = pytest.mark.anyio
+
+JOBS = [{"title": "Backend Engineer"}, {"title": "Data Analyst"}]
+
+
+@pytest.fixture
+async def executor():
+    executor = ScraperExecutor(max_workers=1, deadline_seconds=1, cache_ttl=60)
+    await executor.start()
+    yield executor
+    await executor.stop()
+
+
+class Scrape:
+    """Counts calls and records whether the scrape was cancelled"""
+
+    def __init__(self, seconds=0.0, jobs=JOBS):
+        self.seconds = seconds
+        self.jobs = jobs
+        self.calls = 0
+        self.cancelled = False
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.seconds)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.jobs
+
+    async def items(self):
+        self.calls += 1
+        try:
+            for job in self.jobs:
+                await asyncio.sleep(self.seconds)
+                yield job
+        except (asyncio.CancelledError, GeneratorExit):
+            self.cancelled = True
+            raise
+
+
+async def test_finished_preview_is_served_from_the_cache(executor):
+    scrape = Scrape()
+
+    assert await executor.run("key", scrape) == JOBS
+    assert await executor.run("key", scrape) == JOBS
+    assert scrape.calls == 1
+
+
+async def test_identical_concurrent_previews_share_one_scrape(executor):
+    scrape = Scrape(seconds=0.05)
+
+    results = await asyncio.gather(*(executor.run("key", scrape) for _ in range(3)))
+
+    assert results == [JOBS] * 3
+    assert scrape.calls == 1
+
+
+async def test_missed_deadline_raises_and_caches_nothing(executor):
+    scrape = Scrape(seconds=10)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await executor.run("key", scrape, deadline_seconds=0.05)
+
+    assert scrape.cancelled
+    assert executor.cache.get("key") is None
+
+
+async def test_waiting_for_a_slot_counts_against_the_deadline(executor):
+    busy = asyncio.ensure_future(executor.run("busy", Scrape(seconds=0.3)))
+    await asyncio.sleep(0)
+    queued = Scrape()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await executor.run("queued", queued, deadline_seconds=0.05)
+
+    assert queued.calls == 0
+    assert await busy == JOBS
+
+
+async def test_scrape_is_cancelled_once_its_client_disconnects(executor, monkeypatch):
+    monkeypatch.setattr(executor_module, "DISCONNECT_POLL_SECONDS", 0.01)
+    scrape = Scrape(seconds=10)
+
+    async def is_disconnected():
+        return True
+
+    with pytest.raises(ClientDisconnected):
+        await executor.run("key", scrape, is_disconnected=is_disconnected)
+    # Let the cancellation reach the scrape
+    await asyncio.sleep(0.01)
+
+    assert scrape.cancelled
+    assert executor._inflight == {}
+
+
+async def test_completed_stream_is_cached(executor):
+    scrape = Scrape()
+
+    assert [job async for job in executor.stream("key", scrape.items)] == JOBS
+    assert [job async for job in executor.stream("key", scrape.items)] == JOBS
+    assert scrape.calls == 1
+
+
+async def test_stream_past_its_deadline_raises_after_the_items_so_far(executor):
+    scrape = Scrape(seconds=0.04)
+    received = []
+
+    with pytest.raises(asyncio.TimeoutError):
+        async for job in executor.stream("key", scrape.items, deadline_seconds=0.06):
+            received.append(job)
+
+    assert received == JOBS[:1]
+    assert scrape.cancelled
+    assert executor.cache.get("key") is None
+
+
+async def test_with_deadline_closes_the_source():
+    scrape = Scrape()
+
+    async with aclosing(with_deadline(scrape.items(), 1)) as items:
+        assert await items.__anext__() == JOBS[0]
+
+    assert scrape.cancelled
+
+
+async def test_stopped_executor_refuses_work_and_cancels_running_scrapes(executor):
+    scrape = Scrape(seconds=10)
+    running = asyncio.ensure_future(executor.run("key", scrape))
+    await asyncio.sleep(0.01)
+
+    await executor.stop()
+
+    assert scrape.cancelled
+    with pytest.raises(asyncio.CancelledError):
+        await running
+    with pytest.raises(ScraperExecutorStopped):
+        await executor.run("other", Scrape())
+
+
+def test_preview_key_ignores_case_and_spacing():
+    assert preview_key("indeed", " Backend  Engineer", "San Francisco,  CA ", 5) == preview_key(
+        "indeed", "backend engineer", "san francisco, ca", 5
+    )
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import select
+
+from app.models import CompanySize, ExperienceLevel, JobStatus
+from app.services.job_facets import FACET_COLUMNS, facet_counts
+
+
+@pytest.fixture
+def jobs(make_job):
+    make_job(company="Acme", location="Remote", company_size=CompanySize.SIZE_11_50,
+             experience_level=ExperienceLevel.SENIOR)
+    make_job(company="Acme", location="Austin, TX", company_size=CompanySize.SIZE_11_50)
+    make_job(company="Globex", location="Remote", experience_level=ExperienceLevel.SENIOR)
+    make_job(company="Initech", location=None, status=JobStatus.CLOSED)
+    make_job(company="Umbrella", location="Remote", status=JobStatus.DRAFT)
+
+
+def counts(facet):
+    return {item["value"]: item["count"] for item in facet}
+
+
+def test_facets_count_the_listed_jobs(client, jobs):
+    facets = client.get("/jobs/facets").json()
+
+    assert facets["total"] == 3
+    assert counts(facets["status"]) == {"active": 3}
+    assert facets["company"] == [{"value": "Acme", "count": 2}, {"value": "Globex", "count": 1}]
+    assert counts(facets["location"]) == {"Remote": 2, "Austin, TX": 1}
+    assert counts(facets["company_size"]) == {"11-50": 2}
+    assert counts(facets["experience_level"]) == {"senior": 2}
+
+
+def test_facets_follow_the_listing_filters(client, jobs):
+    facets = client.get("/jobs/facets", params={"location": "remote"}).json()
+
+    assert facets["total"] == 2
+    assert counts(facets["company"]) == {"Acme": 1, "Globex": 1}
+
+
+def test_admins_see_every_status(client, jobs, make_user, auth_headers):
+    headers = auth_headers(make_user(email="admin@example.com", is_admin=True))
+    facets = client.get("/jobs/facets", headers=headers).json()
+
+    assert facets["total"] == 5
+    assert counts(facets["status"]) == {"active": 3, "closed": 1, "draft": 1}
+    # Jobs without a location are counted in the total but not the facet
+    assert sum(counts(facets["location"]).values()) == 4
+
+
+@pytest.mark.anyio
+async def test_total_is_not_cut_by_the_facet_limit(async_db, jobs):
+    async with async_db() as db:
+        facets = await facet_counts(db, select(*FACET_COLUMNS.values()).subquery(), limit=1)
+
+    assert facets["total"] == 5
+    assert facets["status"] == [{"value": "active", "count": 3}]
+    assert facets["company"] == [{"value": "Acme", "count": 2}]
+
+
+@pytest.mark.anyio
+async def test_no_jobs(async_db):
+    async with async_db() as db:
+        facets = await facet_counts(db, select(*FACET_COLUMNS.values()).subquery())
+
+    assert facets == {"total": 0, **{name: [] for name in FACET_COLUMNS}}
@@ -0,0 +1,140 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.services.scrapers import fetcher as fetcher_module
+from app.services.scrapers.fetcher import AsyncFetcher
+
+pytestmark = pytest.mark.anyio
+
+URL = "https://jobs.example.com/search"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Backoff delays requested by the fetcher, without actually waiting"""
+    waits = []
+    real_sleep = fetcher_module.asyncio.sleep
+
+    async def fake_sleep(seconds):
+        # Zero-length sleeps are other code on the loop yielding
+        if seconds:
+            waits.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(fetcher_module.asyncio, "sleep", fake_sleep)
+    return waits
+
+
+def make_fetcher(handler, **kwargs) -> AsyncFetcher:
+    kwargs.setdefault("rate_limit_seconds", 0)
+    return AsyncFetcher(transport=httpx.MockTransport(handler), **kwargs)
+
+
+async def test_retries_5xx_with_exponential_backoff(sleeps):
+    statuses = iter([503, 502, 200])
+
+    def handler(request):
+        return httpx.Response(next(statuses), content=b"ok")
+
+    async with make_fetcher(handler, retries=3) as fetcher:
+        response = await fetcher.get(URL)
+
+    assert response.status_code == 200
+    assert sleeps == [1, 2]
+    assert fetcher.stats.pages_fetched == 1
+    assert fetcher.stats.bytes_downloaded == 2
+
+
+async def test_gives_up_after_last_retryable_status(sleeps):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(429)
+
+    async with make_fetcher(handler, retries=3) as fetcher:
+        with pytest.raises(httpx.HTTPStatusError):
+            await fetcher.get(URL)
+
+    assert len(calls) == 3
+    assert sleeps == [1, 2]
+
+
+async def test_does_not_retry_client_errors(sleeps):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(404)
+
+    async with make_fetcher(handler, retries=3) as fetcher:
+        with pytest.raises(httpx.HTTPStatusError):
+            await fetcher.get(URL)
+
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+async def test_retries_transport_errors_then_raises(sleeps):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("refused", request=request)
+
+    async with make_fetcher(handler, retries=2) as fetcher:
+        with pytest.raises(httpx.ConnectError):
+            await fetcher.get(URL)
+
+    assert len(calls) == 2
+    assert sleeps == [1]
+
+
+async def test_sends_params_and_headers():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200)
+
+    async with make_fetcher(handler, headers={"User-Agent": "tests"}) as fetcher:
+        await fetcher.get(URL, params={"q": "python", "start": 10})
+
+    assert seen[0].url.params["q"] == "python"
+    assert seen[0].url.params["start"] == "10"
+    assert seen[0].headers["user-agent"] == "tests"
+
+
+async def test_caps_requests_in_flight():
+    in_flight = []
+    peak = []
+
+    async def handler(request):
+        in_flight.append(request)
+        peak.append(len(in_flight))
+        await fetcher_module.asyncio.sleep(0.01)
+        in_flight.remove(request)
+        return httpx.Response(200)
+
+    async with make_fetcher(handler, max_concurrency=2) as fetcher:
+        await fetcher_module.asyncio.gather(*(fetcher.get(URL, params={"start": i}) for i in range(6)))
+
+    assert max(peak) == 2
+    assert fetcher.stats.pages_fetched == 6
+
+
+async def test_rate_limit_spaces_requests_to_one_host(sleeps, monkeypatch):
+    # A clock that only moves when the bucket sleeps
+    monkeypatch.setattr(fetcher_module, "time", SimpleNamespace(monotonic=lambda: sum(sleeps)))
+
+    def handler(request):
+        return httpx.Response(200)
+
+    async with make_fetcher(handler, rate_limit_seconds=2, burst=1) as fetcher:
+        for start in range(3):
+            await fetcher.get(URL, params={"start": start})
+
+    # The first request spends the burst token; each later one waits a full refill
+    assert sleeps == [2, 2]
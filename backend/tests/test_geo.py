@@ -0,0 +1,63 @@
+import pytest
+
+from app.services.geo import KM_PER_DEGREE, cell_ranges, encode_cell, geocode, resolve_point
+
+
+@pytest.mark.parametrize("text, name, region", [
+    ("San Francisco, CA 94105", "San Francisco", "CA"),
+    ("Hybrid remote in San Francisco, CA", "San Francisco", "CA"),
+    ("Austin, TX (Hybrid)", "Austin", "TX"),
+    ("NYC", "New York", "NY"),
+    ("Portland, OR", "Portland", "OR"),
+    ("Portland, ME", "Portland", "ME"),
+    ("Manchester, NH", "Manchester", "NH"),
+])
+def test_geocodes_us_locations(text, name, region):
+    place = geocode(text)
+    assert (place.name, place.region, place.country) == (name, region, "US")
+
+
+def test_written_out_country_picks_the_right_city():
+    assert geocode("Manchester, UK").country == "GB"
+    assert geocode("Manchester, United Kingdom").country == "GB"
+
+
+@pytest.mark.parametrize("text", [None, "", "Remote", "Atlantis", "(remote)"])
+def test_unknown_locations_are_not_geocoded(text):
+    assert geocode(text) is None
+
+
+def test_resolve_point():
+    assert resolve_point("37.7, -122.4") == (37.7, -122.4)
+    assert resolve_point("95,0") is None
+    sf = geocode("San Francisco, CA")
+    assert resolve_point("SF") == (sf.latitude, sf.longitude)
+
+
+def test_cell_ranges_cover_the_bounding_box():
+    latitude, longitude, radius_km = 37.7749, -122.4194, 25
+    ranges = cell_ranges(latitude, longitude, radius_km)
+    assert len(ranges) <= 4
+
+    dlat = radius_km / KM_PER_DEGREE
+    for lat in (latitude - dlat, latitude, latitude + dlat):
+        for lon in (longitude - 0.35, longitude, longitude + 0.35):
+            cell = encode_cell(lat, lon)
+            assert any(low <= cell <= high for low, high in ranges)
+
+
+def test_near_filter(client, make_job):
+    make_job(title="SF", location="San Francisco, CA")
+    make_job(title="Oakland", location="Oakland, CA")
+    make_job(title="Austin", location="Austin, TX")
+    make_job(title="Remote", location="Remote")
+
+    def titles(**params):
+        response = client.get("/jobs/", params=params)
+        assert response.status_code == 200
+        return sorted(job["title"] for job in response.json())
+
+    assert titles(near="San Francisco, CA", radius_km=30) == ["Oakland", "SF"]
+    assert titles(near="San Francisco, CA", radius_km=5) == ["SF"]
+    assert titles(near="30.27,-97.74", radius_km=10) == ["Austin"]
+    assert client.get("/jobs/", params={"near": "Atlantis"}).status_code == 400
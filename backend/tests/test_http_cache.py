@@ -0,0 +1,136 @@
+import time
+
+import httpx
+import pytest
+
+from app.services.scrapers import fetcher as fetcher_module
+from app.services.scrapers.fetcher import AsyncFetcher
+from app.services.scrapers.http_cache import CacheMiss, HttpCache
+
+pytestmark = pytest.mark.anyio
+
+URL = "https://jobs.example.com/search"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Backoff delays requested by the fetcher, without actually waiting"""
+    waits = []
+    real_sleep = fetcher_module.asyncio.sleep
+
+    async def fake_sleep(seconds):
+        if seconds:
+            waits.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(fetcher_module.asyncio, "sleep", fake_sleep)
+    return waits
+
+
+def make_fetcher(handler, **kwargs) -> AsyncFetcher:
+    kwargs.setdefault("rate_limit_seconds", 0)
+    return AsyncFetcher(transport=httpx.MockTransport(handler), **kwargs)
+
+
+def revalidating_handler(requests):
+    """200 with an ETag, then 304 for any request carrying it"""
+    def handler(request):
+        requests.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=b"<html>page</html>", headers={"ETag": '"v1"'})
+    return handler
+
+
+async def test_fresh_cache_entry_skips_the_network(tmp_path):
+    requests = []
+    cache = HttpCache(str(tmp_path), ttl=3600)
+    async with make_fetcher(revalidating_handler(requests), cache=cache) as fetcher:
+        first = await fetcher.get(URL, params={"q": "python"})
+        second = await fetcher.get(URL, params={"q": "python"})
+
+    assert first.content == second.content == b"<html>page</html>"
+    assert second.headers["x-cache"] == "HIT"
+    assert requests == [None]
+    assert fetcher.stats.cache_hits == 1
+
+
+async def test_stale_entry_is_revalidated_with_304(tmp_path):
+    requests = []
+    cache = HttpCache(str(tmp_path), ttl=0)
+    async with make_fetcher(revalidating_handler(requests), cache=cache) as fetcher:
+        await fetcher.get(URL)
+        response = await fetcher.get(URL)
+
+    assert response.status_code == 200
+    assert response.content == b"<html>page</html>"
+    assert requests == [None, '"v1"']
+    assert cache.stats.revalidated == 1
+    assert fetcher.stats.pages_fetched == 1
+
+
+async def test_304_without_stored_body_refetches_unconditionally(tmp_path, sleeps):
+    requests = []
+    cache = HttpCache(str(tmp_path), ttl=0)
+    async with make_fetcher(revalidating_handler(requests), cache=cache, retries=1) as fetcher:
+        await fetcher.get(URL)
+        # Prune the body but keep the entry, so the next request is conditional
+        for body in (tmp_path / "bodies").rglob("*"):
+            if body.is_file():
+                body.unlink()
+        response = await fetcher.get(URL)
+
+    assert response.status_code == 200
+    assert response.content == b"<html>page</html>"
+    assert requests == [None, '"v1"', None]
+    assert sleeps == []
+
+
+async def test_no_store_responses_are_not_cached(tmp_path):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=b"private", headers={"Cache-Control": "no-store"})
+
+    cache = HttpCache(str(tmp_path), ttl=3600)
+    async with make_fetcher(handler, cache=cache) as fetcher:
+        await fetcher.get(URL)
+        await fetcher.get(URL)
+
+    assert len(requests) == 2
+    assert cache.stats.stored == 0
+
+
+async def test_offline_mode_serves_stale_entries_and_never_fetches(tmp_path):
+    requests = []
+    async with make_fetcher(revalidating_handler(requests), cache=HttpCache(str(tmp_path), ttl=0)) as fetcher:
+        await fetcher.get(URL)
+
+    offline = HttpCache(str(tmp_path), ttl=0, offline=True)
+    async with make_fetcher(revalidating_handler(requests), cache=offline) as fetcher:
+        assert (await fetcher.get(URL)).content == b"<html>page</html>"
+        with pytest.raises(CacheMiss):
+            await fetcher.get(URL, params={"q": "never cached"})
+
+    assert requests == [None]
+
+
+def test_request_key_ignores_param_order_and_host_case():
+    assert HttpCache.request_key("https://Jobs.Example.com/search?q=python", {"start": 10}) == HttpCache.request_key(
+        "https://jobs.example.com/search", {"start": "10", "q": "python"}
+    )
+
+
+async def test_prune_drops_old_entries_and_unreferenced_bodies(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    old = await cache.store(URL, {"page": 1}, b"old page")
+    new = await cache.store(URL, {"page": 2}, b"new page")
+    old.stored_at = time.time() - 3600
+    cache._write_entry(HttpCache.request_key(URL, {"page": 1}), old)
+
+    assert cache.prune(max_age=60) == 1
+
+    assert await cache.lookup(URL, {"page": 1}) is None
+    assert await cache.lookup(URL, {"page": 2}) == new
+    assert [body.name for body in (tmp_path / "bodies").rglob("*.gz")] == [f"{new.body}.gz"]
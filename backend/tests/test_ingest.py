@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select, text
+
+from app.models import Job, JobSource
+from app.services.ingest import (
+    TITLE_COMPANY_LOCK_BUCKETS,
+    _pair_lock_bucket,
+    external_key,
+    get_or_create_source,
+    ingest_jobs,
+    insert_new_jobs,
+    lock_title_company_pairs,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def scraped(i: int, **overrides) -> dict:
+    job = {
+        "external_id": f"jk{i}",
+        "title": f"Engineer {i}",
+        "company": f"Company {i}",
+        "description": f"Posting number {i} " + " ".join(f"word{i}x{n}" for n in range(30)),
+        "location": "Austin, TX",
+    }
+    job.update(overrides)
+    return job
+
+
+@pytest.fixture
+def admin(make_user):
+    return make_user(email="admin@example.com", is_admin=True)
+
+
+async def ingest(async_db, admin, jobs):
+    async with async_db() as db:
+        source = await get_or_create_source(db, {"name": "indeed", "base_url": "https://www.indeed.com"})
+        result = await ingest_jobs(db, source, jobs, admin.id)
+        await db.commit()
+    return result
+
+
+async def count(async_db, *criteria) -> int:
+    async with async_db() as db:
+        return (await db.execute(select(func.count()).select_from(Job).where(*criteria))).scalar_one()
+
+
+def test_external_key_falls_back_to_a_content_hash():
+    assert external_key({"external_id": 42}) == "42"
+    assert external_key({"title": "A", "company": "B"}) == external_key({"title": " a ", "company": "b"})
+    assert external_key({"title": "A", "company": "B"}).startswith("sha1:")
+
+
+def test_lock_buckets_are_bounded():
+    buckets = {_pair_lock_bucket(f"Title {i}", f"Company {i}") for i in range(5000)}
+    assert all(0 <= bucket < TITLE_COMPANY_LOCK_BUCKETS for bucket in buckets)
+    assert len(buckets) <= TITLE_COMPANY_LOCK_BUCKETS
+
+
+async def test_batch_inserts_new_jobs_and_counts_duplicates(async_db, admin):
+    first = await ingest(async_db, admin, [scraped(i) for i in range(5)])
+    second = await ingest(async_db, admin, [
+        scraped(1),
+        scraped(9, title="Engineer 2", company="Company 2"),
+        scraped(10),
+        scraped(10),
+    ])
+
+    assert (first.inserted, first.duplicates) == (5, 0)
+    assert (second.inserted, second.duplicates) == (1, 3)
+    assert await count(async_db) == 6
+    async with async_db() as db:
+        source = (await db.execute(select(JobSource))).scalar_one()
+    assert source.total_jobs_scraped == 6
+
+
+async def test_long_titles_match_the_truncated_stored_job(async_db, admin):
+    title, company = "Senior " * 50, "Acme " * 60
+
+    await ingest(async_db, admin, [scraped(1, title=title, company=company)])
+    result = await ingest(async_db, admin, [scraped(2, title=title, company=company)])
+
+    assert (result.inserted, result.duplicates) == (0, 1)
+    assert await count(async_db) == 1
+
+
+@pytest.mark.postgres
+async def test_a_large_batch_takes_at_most_one_lock_per_bucket(async_db):
+    pairs = {(f"Title {i}", f"Company {i}") for i in range(3 * TITLE_COMPANY_LOCK_BUCKETS)}
+    async with async_db() as db:
+        await lock_title_company_pairs(db, pairs)
+        held = (await db.execute(text(
+            "SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND pid = pg_backend_pid()"
+        ))).scalar_one()
+        await db.rollback()
+
+    assert held == len({_pair_lock_bucket(title, company) for title, company in pairs})
+    assert held <= TITLE_COMPANY_LOCK_BUCKETS
+
+
+@pytest.mark.postgres
+async def test_concurrent_writers_of_one_title_and_company_insert_once(async_db, admin):
+    async with async_db() as db:
+        source = await get_or_create_source(db, {"name": "indeed", "base_url": "https://www.indeed.com"})
+        await db.commit()
+
+    first_job = scraped(1, title="Staff Engineer", company="Acme")
+    second_job = scraped(2, title="Staff Engineer", company="Acme")
+    async with async_db() as first, async_db() as second:
+        await insert_new_jobs(first, await first.get(JobSource, source.id), {"jk1": (first_job, admin.id)})
+        # Blocks on the (title, company) bucket lock until the first writer commits
+        pending = asyncio.create_task(
+            insert_new_jobs(second, await second.get(JobSource, source.id), {"jk2": (second_job, admin.id)})
+        )
+        await asyncio.sleep(0.2)
+        assert not pending.done()
+        await first.commit()
+        outcome = await pending
+        await second.commit()
+
+    assert outcome.created == {}
+    assert "jk2" in outcome.matched
+    assert await count(async_db, Job.title == "Staff Engineer") == 1
@@ -0,0 +1,59 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models import CompanySize, ExperienceLevel, JobStatus
+from app.schemas import JobSummary
+from app.services.job_listing import dump_json
+
+
+@pytest.fixture
+def job(make_job):
+    return make_job(
+        title="Backend Engineer",
+        company="Acme",
+        description="Café opening: build the APIs behind our ordering app. " * 20,
+        location="San Francisco, CA",
+        salary_range="$150,000 - $180,000 a year",
+        company_size=CompanySize.SIZE_51_200,
+        experience_level=ExperienceLevel.SENIOR,
+        posted_date=datetime(2026, 10, 1, 9, 30, 15, 123456, tzinfo=timezone.utc),
+    )
+
+
+def orm_json(job) -> dict:
+    """What the listing returned when it validated ORM entities into JobSummary"""
+    return json.loads(JobSummary.model_validate(job).model_dump_json())
+
+
+def test_projection_matches_the_orm_serialization(client, job, make_job):
+    # Every optional column left empty
+    bare = make_job(title="Bare")
+    listed = {item["id"]: item for item in client.get("/jobs/").json()}
+
+    assert listed == {job.id: orm_json(job), bare.id: orm_json(bare)}
+
+
+def test_description_chars_cuts_the_description_in_sql(client, job):
+    [item] = client.get("/jobs/", params={"description_chars": 5}).json()
+
+    assert item["description"] == "Café "
+    assert {**item, "description": job.description} == orm_json(job)
+
+
+def test_description_chars_shorter_than_the_limit_is_untouched(client, job):
+    [item] = client.get("/jobs/", params={"description_chars": 10000}).json()
+
+    assert item["description"] == job.description
+
+
+@pytest.mark.parametrize("description_chars", [0, 10001])
+def test_description_chars_is_bounded(client, description_chars):
+    assert client.get("/jobs/", params={"description_chars": description_chars}).status_code == 422
+
+
+def test_dump_json_writes_enums_and_datetimes_like_the_schema():
+    row = {"status": JobStatus.ACTIVE, "posted_date": datetime(2026, 10, 1, tzinfo=timezone.utc)}
+
+    assert json.loads(dump_json([row])) == [{"status": "active", "posted_date": "2026-10-01T00:00:00Z"}]
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import select
+
+from app.models import Job, JobStatus
+from app.services.job_counts import matching_count
+
+
+@pytest.fixture
+def jobs(make_job):
+    for i in range(5):
+        make_job(title=f"Engineer {i}", location="Remote" if i % 2 == 0 else "Austin, TX")
+    make_job(title="Closed", location="Remote", status=JobStatus.CLOSED)
+
+
+def test_with_total_counts_every_match_not_the_page(client, jobs):
+    page = client.get("/jobs/", params={"with_total": True, "limit": 2, "skip": 2}).json()
+
+    assert len(page["items"]) == 2
+    assert (page["total"], page["total_is_estimate"]) == (5, False)
+    assert page["next_cursor"] is None
+
+
+def test_with_total_follows_the_filters_and_cursor_pages(client, jobs):
+    first = client.get("/jobs/", params={"with_total": True, "cursor": "", "limit": 2, "location": "remote"}).json()
+    second = client.get(
+        "/jobs/", params={"with_total": True, "cursor": first["next_cursor"], "limit": 2, "location": "remote"}
+    ).json()
+
+    # The total is of the whole filtered listing, on every page
+    assert first["total"] == second["total"] == 3
+    assert len(first["items"]) + len(second["items"]) == 3
+
+
+def test_listing_without_total_stays_a_list(client, jobs):
+    assert isinstance(client.get("/jobs/").json(), list)
+
+
+@pytest.mark.anyio
+async def test_matching_count_is_exact_up_to_the_threshold(async_db, jobs):
+    query = select(Job).where(Job.status == JobStatus.ACTIVE)
+
+    async with async_db() as db:
+        assert await matching_count(db, query, threshold=5) == (5, False)
+        assert await matching_count(db, query.where(Job.location == "Remote"), threshold=5) == (3, False)
+
+
+@pytest.mark.anyio
+async def test_matching_count_estimates_past_the_threshold(async_db, jobs):
+    query = select(Job).where(Job.status == JobStatus.ACTIVE)
+
+    async with async_db() as db:
+        total, is_estimate = await matching_count(db, query, threshold=2)
+
+    # Never below the rows it has actually counted
+    assert is_estimate
+    assert total >= 3
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import JobStatus
+from app.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(["2026-01-02T03:04:05+00:00", 42])
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 2) == ["2026-01-02T03:04:05+00:00", 42]
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor({"id": 1}), encode_cursor([1, 2, 3])])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, 2)
+    assert error.value.status_code == 400
+
+
+@pytest.fixture
+def jobs(make_job):
+    """Seven active jobs, three of them sharing a posted_date, plus a closed one"""
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    posted = [base + timedelta(hours=hours) for hours in (5, 4, 4, 4, 3, 2, 1)]
+    created = [make_job(title=f"Job {i}", posted_date=date) for i, date in enumerate(posted)]
+    make_job(title="Closed", status=JobStatus.CLOSED, posted_date=base + timedelta(hours=6))
+    return created
+
+
+def expected_order(jobs):
+    return [job.id for job in sorted(jobs, key=lambda job: (job.posted_date, job.id), reverse=True)]
+
+
+def test_cursor_pages_cover_every_job_once(client, jobs):
+    seen = []
+    cursor = ""
+    pages = 0
+    while cursor is not None:
+        page = client.get("/jobs/", params={"cursor": cursor, "limit": 3}).json()
+        assert len(page["items"]) <= 3
+        seen.extend(job["id"] for job in page["items"])
+        cursor = page["next_cursor"]
+        pages += 1
+
+    assert seen == expected_order(jobs)
+    assert pages == 3
+
+
+def test_cursor_matches_offset_order(client, jobs):
+    offset_ids = [job["id"] for job in client.get("/jobs/", params={"limit": 100}).json()]
+    first = client.get("/jobs/", params={"cursor": "", "limit": 100}).json()
+
+    assert [job["id"] for job in first["items"]] == offset_ids
+    assert first["next_cursor"] is None
+
+
+def test_last_full_page_has_no_next_cursor(client, jobs):
+    page = client.get("/jobs/", params={"cursor": "", "limit": len(jobs)}).json()
+    assert len(page["items"]) == len(jobs)
+    assert page["next_cursor"] is None
+
+
+def test_invalid_cursor_returns_400(client, jobs):
+    response = client.get("/jobs/", params={"cursor": encode_cursor(["not a date", 1])})
+    assert response.status_code == 400
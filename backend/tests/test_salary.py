@@ -0,0 +1,83 @@
+import pytest
+
+from app.services.salary import Salary, parse_salaries, parse_salary, salary_columns
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$120,000 - $150,000 a year", Salary(120000, 150000, "USD")),
+    ("$120K-$150K", Salary(120000, 150000, "USD")),
+    ("$50 - $60 an hour", Salary(50 * 2080, 60 * 2080, "USD")),
+    ("$3,000 a month", Salary(36000, 36000, "USD")),
+    ("Up to $90,000 a year", Salary(None, 90000, "USD")),
+    ("From $25 an hour", Salary(25 * 2080, None, "USD")),
+    ("£40,000 per year", Salary(40000, 40000, "GBP")),
+    ("CAD 90k", Salary(90000, 90000, "CAD")),
+    # Suffixes scale the amount before a missing period is guessed
+    ("$1.2M", Salary(1200000, 1200000, "USD")),
+    ("$1 - 1.5M", Salary(1000000, 1500000, "USD")),
+    ("$100 - 120K", Salary(100000, 120000, "USD")),
+    ("$45", Salary(45 * 2080, 45 * 2080, "USD")),
+])
+def test_parses_annualized_ranges(text, expected):
+    assert parse_salary(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    None,
+    "",
+    "Competitive",
+    # Numbers without a currency or a period aren't salaries
+    "401k match",
+    "80000",
+    # Annualizes outside the plausible range
+    "$5 a year",
+])
+def test_rejects_non_salaries(text):
+    assert parse_salary(text) is None
+
+
+def test_batch_parse_matches_single_parse():
+    texts = ["$100k a year", None, "$100k a year", "Competitive"]
+    assert parse_salaries(texts) == [parse_salary(text) for text in texts]
+
+
+def test_salary_columns():
+    assert salary_columns("$100k a year") == {"salary_min": 100000, "salary_max": 100000, "salary_currency": "USD"}
+    assert salary_columns("DOE") == {"salary_min": None, "salary_max": None, "salary_currency": None}
+
+
+def test_jobs_get_salary_columns_on_write(db, make_job):
+    job = make_job(salary_range="$80,000 - $100,000 a year")
+    assert (job.salary_min, job.salary_max, job.salary_currency) == (80000, 100000, "USD")
+
+    job.salary_range = "$40 an hour"
+    db.commit()
+    assert (job.salary_min, job.salary_max) == (83200, 83200)
+
+
+def test_salary_filters(client, make_job):
+    make_job(title="Low", salary_range="$50,000 - $70,000 a year")
+    make_job(title="High", salary_range="$150,000 - $200,000 a year")
+    make_job(title="Unknown", salary_range="Competitive")
+
+    def titles(**params):
+        return sorted(job["title"] for job in client.get("/jobs/", params=params).json())
+
+    assert titles(min_salary=100000) == ["High"]
+    assert titles(max_salary=60000) == ["Low"]
+    assert titles(min_salary=60000, max_salary=160000) == ["High", "Low"]
+
+
+def test_salary_filters_match_open_ended_ranges(client, make_job):
+    make_job(title="Capped", salary_range="Up to $90,000 a year")
+    make_job(title="Floored", salary_range="From $120,000 a year")
+    make_job(title="Unknown", salary_range="Competitive")
+
+    def titles(**params):
+        return sorted(job["title"] for job in client.get("/jobs/", params=params).json())
+
+    assert titles(min_salary=80000) == ["Capped", "Floored"]
+    assert titles(min_salary=100000) == ["Floored"]
+    assert titles(max_salary=100000) == ["Capped"]
+    assert titles(max_salary=130000) == ["Capped", "Floored"]
+    assert titles(min_salary=95000, max_salary=110000) == []
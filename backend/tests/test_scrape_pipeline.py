@@ -0,0 +1,84 @@
+import pytest
+
+from app.services.scrape_pipeline import iter_jobs, limit_pages, scrape_stream
+
+pytestmark = pytest.mark.anyio
+
+
+def posting(n):
+    return {"external_id": f"job-{n}", "title": f" Job {n} ", "company": "Acme"}
+
+
+class PageSource:
+    """Async page iterator recording how many pages were pulled and whether it was closed"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.pulled = 0
+        self.closed = False
+
+    async def __call__(self):
+        try:
+            for page_jobs in self.pages:
+                self.pulled += 1
+                yield page_jobs
+        finally:
+            self.closed = True
+
+
+class FakeScraper:
+    def __init__(self, pages):
+        self.source = PageSource(pages)
+        self.calls = []
+
+    def iter_pages(self, query, location, limit, stats=None, newest_first=False, prefetch=None):
+        self.calls.append({"newest_first": newest_first, "prefetch": prefetch})
+        return self.source()
+
+
+async def collect(pages):
+    return [page_jobs async for page_jobs in pages]
+
+
+async def test_limit_pages_stops_on_the_page_that_meets_the_limit():
+    source = PageSource([[1, 2], [3, 4], [5, 6]])
+
+    assert await collect(limit_pages(source(), 3)) == [[1, 2], [3]]
+    assert source.pulled == 2
+    assert source.closed
+
+
+async def test_limit_pages_pulls_nothing_for_a_zero_limit():
+    source = PageSource([[1, 2]])
+
+    assert await collect(limit_pages(source(), 0)) == []
+    assert source.pulled == 0
+
+
+async def test_repeated_jobs_do_not_count_towards_the_limit():
+    scraper = FakeScraper([
+        [posting(1), posting(2)],
+        [posting(2), posting(1)],
+        [posting(3), posting(4)],
+        [posting(5), posting(6)],
+    ])
+
+    jobs = [job async for job in iter_jobs(scrape_stream(scraper, "engineer", "Remote", 3))]
+
+    assert [job["title"] for job in jobs] == ["Job 1", "Job 2", "Job 3"]
+    assert scraper.source.pulled == 3
+    assert scraper.source.closed
+
+
+async def test_incremental_stream_stops_at_the_first_known_page():
+    scraper = FakeScraper([
+        [posting(3), posting(2)],
+        [posting(1), posting(0)],
+        [posting(-1), posting(-2)],
+    ])
+
+    pages = await collect(scrape_stream(scraper, "engineer", "Remote", 10, known={"job-1", "job-0"}))
+
+    assert [[job["title"] for job in page_jobs] for page_jobs in pages] == [["Job 3", "Job 2"]]
+    assert scraper.calls == [{"newest_first": True, "prefetch": 1}]
+    assert scraper.source.pulled == 2
@@ -0,0 +1,142 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from app.models import ScrapeRun, ScrapeRunStatus, ScrapeTask, ScrapeTaskStatus
+from app.services import scrape_queue
+from app.services.scrape_queue import claim_task, enqueue_scrape, requeue_stale_tasks, run_task, start_run
+
+pytestmark = pytest.mark.anyio
+
+
+async def enqueue(async_db, count: int, run_after=None, max_attempts=3):
+    async with async_db() as db:
+        for i in range(count):
+            task = await enqueue_scrape(db, "indeed", f"query {i}", "Remote", 10, requested_by_id=None)
+            task.max_attempts = max_attempts
+            if run_after is not None:
+                task.run_after = run_after
+        await db.commit()
+
+
+async def tasks_and_runs(async_db):
+    async with async_db() as db:
+        tasks = (await db.execute(select(ScrapeTask).order_by(ScrapeTask.id))).scalars().all()
+        runs = (await db.execute(select(ScrapeRun).order_by(ScrapeRun.id))).scalars().all()
+    return tasks, runs
+
+
+async def orphan_running_task(async_db, started_seconds_ago: float, max_attempts=3):
+    """A claimed task with an open run whose worker went away ``started_seconds_ago``"""
+    await enqueue(async_db, 1, max_attempts=max_attempts)
+    async with async_db() as db:
+        task = await claim_task(db, "dead-worker")
+        await start_run(db, task)
+        started_at = datetime.now(timezone.utc) - timedelta(seconds=started_seconds_ago)
+        await db.execute(update(ScrapeTask).where(ScrapeTask.id == task.id).values(started_at=started_at))
+        await db.commit()
+
+
+def past_deadline(seconds: float = 1) -> float:
+    return scrape_queue.SCRAPE_TASK_DEADLINE_SECONDS + scrape_queue.SCRAPE_TASK_STALE_GRACE_SECONDS + seconds
+
+
+async def test_claim_task_hands_each_task_to_one_worker(async_db):
+    await enqueue(async_db, 3)
+
+    async def claim(worker_id):
+        async with async_db() as db:
+            task = await claim_task(db, worker_id)
+            return task.id if task is not None else None
+
+    claimed = await asyncio.gather(*(claim(f"worker-{i}") for i in range(6)))
+
+    task_ids = [task_id for task_id in claimed if task_id is not None]
+    assert len(task_ids) == len(set(task_ids)) == 3
+    tasks, _ = await tasks_and_runs(async_db)
+    assert {task.status for task in tasks} == {ScrapeTaskStatus.RUNNING}
+    assert {task.attempts for task in tasks} == {1}
+    assert len({task.locked_by for task in tasks}) == 3
+
+
+async def test_claim_task_skips_tasks_not_yet_due(async_db):
+    await enqueue(async_db, 1, run_after=datetime.now(timezone.utc) + timedelta(hours=1))
+    async with async_db() as db:
+        assert await claim_task(db, "worker") is None
+
+
+async def test_orphaned_task_is_requeued_and_its_run_failed(async_db):
+    await orphan_running_task(async_db, past_deadline())
+
+    async with async_db() as db:
+        assert await requeue_stale_tasks(db) == 1
+
+    [task], [run] = await tasks_and_runs(async_db)
+    assert (task.status, task.locked_by, task.last_error) == (ScrapeTaskStatus.QUEUED, None, "Worker timed out")
+    assert run.status == ScrapeRunStatus.FAILED
+    assert run.completed_at is not None
+    async with async_db() as db:
+        assert (await claim_task(db, "worker")).attempts == 2
+
+
+async def test_orphaned_task_out_of_attempts_fails(async_db):
+    await orphan_running_task(async_db, past_deadline(), max_attempts=1)
+
+    async with async_db() as db:
+        assert await requeue_stale_tasks(db) == 1
+
+    [task], [run] = await tasks_and_runs(async_db)
+    assert task.status == ScrapeTaskStatus.FAILED
+    assert task.finished_at is not None
+    assert run.status == ScrapeRunStatus.FAILED
+    async with async_db() as db:
+        assert await claim_task(db, "worker") is None
+
+
+async def test_tasks_within_the_deadline_are_left_running(async_db):
+    await orphan_running_task(async_db, scrape_queue.SCRAPE_TASK_DEADLINE_SECONDS)
+
+    async with async_db() as db:
+        assert await requeue_stale_tasks(db) == 0
+
+    [task], [run] = await tasks_and_runs(async_db)
+    assert task.status == ScrapeTaskStatus.RUNNING
+    assert run.status == ScrapeRunStatus.RUNNING
+
+
+async def test_scrape_past_the_deadline_is_abandoned_and_retried(async_db, monkeypatch):
+    async def slow_scrape(task, run, stats):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(scrape_queue, "scrape_and_stage", slow_scrape)
+    monkeypatch.setattr(scrape_queue, "SCRAPE_TASK_DEADLINE_SECONDS", 0.05)
+    await enqueue(async_db, 1)
+
+    async with async_db() as db:
+        await run_task(db, await claim_task(db, "worker"))
+
+    [task], [run] = await tasks_and_runs(async_db)
+    assert task.status == ScrapeTaskStatus.QUEUED
+    assert "deadline" in task.last_error
+    assert run.status == ScrapeRunStatus.FAILED
+    # Retried after the backoff, not right away
+    async with async_db() as db:
+        assert await claim_task(db, "worker") is None
+
+
+async def test_successful_run_is_recorded(async_db, monkeypatch):
+    async def scrape(task, run, stats):
+        stats.pages_fetched = 2
+        return 25
+
+    monkeypatch.setattr(scrape_queue, "scrape_and_stage", scrape)
+    await enqueue(async_db, 1)
+
+    async with async_db() as db:
+        await run_task(db, await claim_task(db, "worker"))
+
+    [task], [run] = await tasks_and_runs(async_db)
+    assert (task.status, task.jobs_found) == (ScrapeTaskStatus.SUCCEEDED, 25)
+    assert (run.status, run.pages_fetched, run.jobs_found) == (ScrapeRunStatus.COMPLETED, 2, 25)
@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import func, insert, select, update
+
+from app.models import Job, JobCounter, ScrapeRun
+from app.services.job_counts import job_counts
+
+
+@pytest.fixture
+def admin_headers(make_user, auth_headers):
+    return auth_headers(make_user(email="admin@example.com", is_admin=True))
+
+
+def stats(client, headers) -> dict:
+    response = client.get("/admin/scraping/stats", headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_stats_count_scraped_and_manual_jobs(client, db, make_job, admin_headers):
+    make_job(title="Manual")
+    scraped = make_job(title="Scraped", external_url="https://jobs.example.com/1")
+    make_job(title="Also scraped", external_url="https://jobs.example.com/2")
+
+    assert stats(client, admin_headers) | {"http_cache": None} == {
+        "total_jobs": 3,
+        "scraped_jobs": 2,
+        "manual_jobs": 1,
+        "scraping_enabled": True,
+        "available_sources": 1,
+        "http_cache": None,
+    }
+
+    scraped.external_url = None
+    db.commit()
+    assert (stats(client, admin_headers)["scraped_jobs"], stats(client, admin_headers)["manual_jobs"]) == (1, 2)
+
+
+def test_stats_are_admin_only(client, make_user, auth_headers):
+    assert client.get("/admin/scraping/stats", headers=auth_headers(make_user())).status_code == 403
+
+
+def test_history_pages_newest_first(client, db, admin_headers):
+    db.add_all(ScrapeRun(source="indeed", query=f"query {i}", location="Remote") for i in range(5))
+    db.commit()
+
+    first = client.get("/admin/scraping/history", params={"limit": 3}, headers=admin_headers).json()
+    second = client.get(
+        "/admin/scraping/history", params={"limit": 3, "cursor": first["next_cursor"]}, headers=admin_headers
+    ).json()
+
+    assert [run["query"] for run in first["recent_scrapes"]] == ["query 4", "query 3", "query 2"]
+    assert [run["query"] for run in second["recent_scrapes"]] == ["query 1", "query 0"]
+    assert second["next_cursor"] is None
+    assert client.get(
+        "/admin/scraping/history", params={"cursor": "garbage"}, headers=admin_headers
+    ).status_code == 400
+
+
+@pytest.mark.postgres
+@pytest.mark.anyio
+async def test_triggers_keep_the_sharded_counters_exact(async_db, make_job):
+    owner = make_job(title="Manual").posted_by_id
+    make_job(title="Scraped", external_url="https://jobs.example.com/1")
+
+    def row(i, external_url=None):
+        return {
+            "title": f"Bulk {i}", "company": "Acme", "description": "Bulk insert",
+            "application_url": "https://example.com", "external_url": external_url, "posted_by_id": owner,
+        }
+
+    async with async_db() as db:
+        # One multi-row statement, counted once by the statement trigger
+        await db.execute(insert(Job.__table__).values(
+            [row(i) for i in range(5)] + [row(i + 5, f"https://jobs.example.com/b{i}") for i in range(3)]
+        ))
+        # Only external_url appearing/disappearing changes jobs_scraped
+        await db.execute(update(Job).where(Job.title == "Bulk 0").values(external_url="https://jobs.example.com/x"))
+        await db.execute(update(Job).where(Job.title == "Bulk 5").values(external_url=None))
+        await db.execute(update(Job).where(Job.title == "Bulk 6").values(external_url="https://jobs.example.com/y"))
+        await db.execute(update(Job).where(Job.title == "Bulk 1").values(description="Edited"))
+        await db.execute(Job.__table__.delete().where(Job.title.in_(["Bulk 2", "Bulk 7"])))
+        await db.commit()
+
+        counters = dict((await db.execute(
+            select(JobCounter.name, func.sum(JobCounter.value)).group_by(JobCounter.name)
+        )).all())
+        actual = (await db.execute(select(func.count(Job.id), func.count(Job.external_url)))).one()
+        counts = await job_counts(db)
+
+    assert counters == {"jobs_total": actual[0], "jobs_scraped": actual[1]}
+    assert counts == {"jobs_total": 8, "jobs_scraped": 3}
@@ -0,0 +1,154 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.models import JobSource
+from app.services.job_aggregator import JobAggregator, active_scrapers
+from app.services.scrapers import base as base_module
+from app.services.scrapers.base import BaseScraper, register_scraper
+from app.services.scrapers.indeed_scraper import IndeedScraper
+from app.services.scrapers.registry import available_sources, make_scraper
+
+pytestmark = pytest.mark.anyio
+
+
+def posting(title, company="Acme"):
+    return {
+        "title": title,
+        "company": company,
+        "location": "Remote",
+        "description": f"{title} at {company}",
+        "external_url": f"https://jobs.example.com/{company}/{title}".replace(" ", "-").lower(),
+    }
+
+
+class StubScraper(BaseScraper):
+    """Serves ``postings`` as JSON pages of ``page_size`` from a mock transport"""
+    name = "stub"
+    display_name = "Stub"
+    default_base_url = "https://stub.example.com"
+    page_size = 2
+
+    def __init__(self, postings, delay_from=None, **kwargs):
+        self.postings = postings
+        self.requested = []
+
+        async def handler(request):
+            start = int(request.url.params["start"])
+            self.requested.append(start)
+            if delay_from is not None and start >= delay_from:
+                await asyncio.sleep(10)
+            return httpx.Response(200, json=self.postings[start:start + self.page_size])
+
+        kwargs.setdefault("rate_limit_seconds", 0)
+        super().__init__(transport=httpx.MockTransport(handler), cache=None, **kwargs)
+
+    def page_request(self, query, location, start, newest_first=False):
+        return f"{self.base_url}/search", {"q": query, "start": start}
+
+    def parse_page(self, html):
+        return json.loads(html)
+
+
+class BrokenScraper(StubScraper):
+    def page_request(self, query, location, start, newest_first=False):
+        raise RuntimeError("board changed its URLs")
+
+
+def test_plugins_must_implement_page_request_and_parse_page():
+    class Incomplete(BaseScraper):
+        name = "incomplete"
+
+        def page_request(self, query, location, start, newest_first=False):
+            return "", {}
+
+    with pytest.raises(TypeError):
+        BaseScraper()
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_register_scraper_rejects_a_second_class_under_the_same_name(monkeypatch):
+    monkeypatch.setattr(base_module, "SCRAPERS", {})
+
+    assert register_scraper(StubScraper) is StubScraper
+    assert register_scraper(StubScraper) is StubScraper
+    with pytest.raises(ValueError):
+        register_scraper(type("OtherStub", (StubScraper,), {}))
+    assert base_module.SCRAPERS == {"stub": StubScraper}
+
+
+def test_make_scraper_applies_the_job_source_rate_limit():
+    assert isinstance(make_scraper("indeed"), IndeedScraper)
+    assert make_scraper("indeed").rate_limit_seconds == IndeedScraper.default_rate_limit_seconds
+    assert make_scraper("indeed", JobSource(name="indeed", rate_limit_seconds=7)).rate_limit_seconds == 7
+    assert "indeed" in [source["name"] for source in available_sources()]
+
+
+async def test_iter_pages_stops_at_the_first_short_page():
+    scraper = StubScraper([posting(f"Job {i}") for i in range(5)], prefetch_pages=1)
+
+    jobs = await scraper.search_jobs_async("engineer", "Remote", limit=20)
+
+    assert [job["title"] for job in jobs] == [f"Job {i}" for i in range(5)]
+    assert scraper.requested == [0, 2, 4]
+
+
+async def test_active_scrapers_skip_switched_off_sources(async_db):
+    async with async_db() as db:
+        assert set(await active_scrapers(db)) == {"indeed"}
+
+        db.add(JobSource(name="indeed", display_name="Indeed", base_url="https://indeed.com", is_active=False))
+        await db.commit()
+        assert await active_scrapers(db) == {}
+
+
+async def test_aggregator_merges_sources_and_drops_cross_board_duplicates():
+    aggregator = JobAggregator({
+        "first": StubScraper([posting("Backend Engineer"), posting("Data Analyst", "Globex")]),
+        "second": StubScraper([posting("backend  engineer", "ACME"), posting("Pastry Chef", "Crumb")]),
+    })
+
+    jobs = await aggregator.search("engineer", "Remote", limit_per_source=10)
+
+    # Whichever board delivered the backend posting first keeps it
+    assert sorted(" ".join(job["title"].lower().split()) for job in jobs) == [
+        "backend engineer", "data analyst", "pastry chef",
+    ]
+    assert {job["source_name"] for job in jobs} == {"first", "second"}
+    assert aggregator.duplicates == 1
+    assert sum(report.jobs_found for report in aggregator.reports.values()) == 4
+    assert sum(report.jobs_kept for report in aggregator.reports.values()) == 3
+
+
+async def test_slow_source_keeps_the_pages_it_delivered_within_budget():
+    aggregator = JobAggregator(
+        {
+            "fast": StubScraper([posting("Backend Engineer")]),
+            "slow": StubScraper([posting(f"Slow {i}", "Globex") for i in range(4)], delay_from=2, prefetch_pages=1),
+        },
+        budget_seconds=0.2,
+    )
+
+    jobs = await aggregator.search("engineer", "Remote", limit_per_source=10)
+
+    assert sorted(job["title"] for job in jobs) == ["Backend Engineer", "Slow 0", "Slow 1"]
+    assert aggregator.reports["slow"].timed_out
+    assert aggregator.reports["slow"].jobs_kept == 2
+    assert not aggregator.reports["fast"].timed_out
+    assert aggregator.reports["slow"].elapsed_seconds < 1
+
+
+async def test_failing_source_is_reported_without_failing_the_search():
+    aggregator = JobAggregator({
+        "ok": StubScraper([posting("Backend Engineer")]),
+        "broken": BrokenScraper([posting("Data Analyst")]),
+    })
+
+    jobs = await aggregator.search("engineer", "Remote")
+
+    assert [job["title"] for job in jobs] == ["Backend Engineer"]
+    assert aggregator.reports["broken"].error == "RuntimeError: board changed its URLs"
+    assert aggregator.reports["ok"].error is None
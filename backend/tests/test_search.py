@@ -0,0 +1,84 @@
+import pytest
+
+from app.search import FIELD_WEIGHTS, MAX_SEARCH_TERMS, InvertedIndex, search_terms, to_prefix_tsquery
+
+# ts_rank_cd's default weights for the labels jobs_search_vector_update() assigns
+# (title A, company B, description C)
+POSTGRES_LABEL_WEIGHTS = {"A": 1.0, "B": 0.4, "C": 0.2, "D": 0.1}
+
+
+def test_search_terms_are_unique_lowercase_and_capped():
+    assert search_terms("Senior  senior, PYTHON-dev!") == ["senior", "python", "dev"]
+    assert len(search_terms(" ".join(f"w{i}" for i in range(20)))) == MAX_SEARCH_TERMS
+    assert search_terms("  !!  ") == []
+
+
+def test_prefix_tsquery_ands_every_term():
+    assert to_prefix_tsquery(["senior", "eng"]) == "senior:* & eng:*"
+
+
+def test_field_weights_mirror_search_vector_labels():
+    assert FIELD_WEIGHTS == {
+        "title": POSTGRES_LABEL_WEIGHTS["A"],
+        "company": POSTGRES_LABEL_WEIGHTS["B"],
+        "description": POSTGRES_LABEL_WEIGHTS["C"],
+    }
+
+
+@pytest.fixture
+def index():
+    index = InvertedIndex()
+    index.add(1, "Data Analyst", "Python Corp", "SQL dashboards")
+    index.add(2, "Python Developer", "Acme", "APIs and services")
+    index.add(3, "Backend Engineer", "Initech", "Python services at scale")
+    index.add(4, "Frontend Engineer", "Globex", "React and TypeScript")
+    return index
+
+
+def test_ranks_title_over_company_over_description(index):
+    # The order ts_rank_cd gives the same rows: A-weighted title match first
+    assert index.search(["python"]) == [2, 1, 3]
+
+
+def test_every_term_must_match(index):
+    assert index.search(["python", "services"]) == [2, 3]
+    assert index.search(["python", "react"]) == []
+
+
+def test_terms_match_as_prefixes(index):
+    assert index.search(["eng"]) == [4, 3]
+    assert index.search(["develop"]) == [2]
+
+
+def test_does_not_stem(index):
+    # Postgres' english configuration would stem both to "engin"; the fallback only prefix-matches
+    assert index.search(["engineering"]) == []
+
+
+def test_reindexing_replaces_a_document(index):
+    index.add(2, "Rust Developer", "Acme", "Systems work")
+    assert 2 not in index.search(["python"])
+    assert index.search(["rust"]) == [2]
+
+    index.remove(2)
+    assert index.search(["rust"]) == []
+
+
+def test_fulltext_listing_is_ranked(client, make_job):
+    make_job(title="Data Analyst", company="Python Corp", description="SQL")
+    wanted = make_job(title="Python Developer", company="Acme", description="APIs")
+    make_job(title="Frontend Engineer", company="Globex", description="React")
+
+    jobs = client.get("/jobs/", params={"search": "python", "search_mode": "fulltext"}).json()
+
+    assert [job["id"] for job in jobs][0] == wanted.id
+    assert len(jobs) == 2
+
+
+def test_substring_search_is_the_default(client, make_job):
+    make_job(title="Software Engineer")
+    make_job(title="Designer")
+
+    jobs = client.get("/jobs/", params={"search": "ware eng"}).json()
+
+    assert [job["title"] for job in jobs] == ["Software Engineer"]
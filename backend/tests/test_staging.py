@@ -0,0 +1,133 @@
+import asyncio
+import random
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import Job, JobSource, ScrapedJob
+from app.services.ingest import get_or_create_source
+from app.services.staging import drain_staged_jobs, promote_batch, stage_jobs
+
+pytestmark = pytest.mark.anyio
+
+WORDS = "python rust go java sql cloud data api design infra react mobile security ml ops docs".split()
+
+
+def scraped_job(i: int, **overrides) -> dict:
+    # Random word salad per job, so the MinHash check never pairs two of them
+    rng = random.Random(i)
+    job = {
+        "external_id": f"jk{i}",
+        "title": f"Engineer {i}",
+        "company": f"Company {i}",
+        "description": " ".join(f"{rng.choice(WORDS)}{rng.randint(0, 999)}" for _ in range(40)),
+        "location": "Austin, TX",
+    }
+    job.update(overrides)
+    return job
+
+
+@pytest.fixture
+def admin(make_user):
+    return make_user(email="admin@example.com", is_admin=True)
+
+
+async def stage(async_db, admin, jobs):
+    async with async_db() as db:
+        source = await get_or_create_source(db, {"name": "indeed", "base_url": "https://www.indeed.com"})
+        await stage_jobs(db, source, jobs, admin.id)
+        await db.commit()
+
+
+async def count(async_db, *criteria, model=Job) -> int:
+    async with async_db() as db:
+        return (await db.execute(select(func.count()).select_from(model).where(*criteria))).scalar_one()
+
+
+async def job_source(async_db) -> JobSource:
+    async with async_db() as db:
+        return (await db.execute(select(JobSource))).scalar_one()
+
+
+async def test_stage_jobs_stamps_the_source(async_db, admin):
+    await stage(async_db, admin, [scraped_job(i) for i in range(3)])
+
+    assert await count(async_db, model=ScrapedJob) == 3
+    source = await job_source(async_db)
+    assert source.last_scraped_at is not None
+    assert not source.total_jobs_scraped
+
+
+async def test_promote_batch_claims_each_row_once(async_db, admin):
+    await stage(async_db, admin, [scraped_job(i) for i in range(10)])
+
+    claimed = []
+    for _ in range(4):
+        async with async_db() as db:
+            result = await promote_batch(db, batch_size=4)
+            await db.commit()
+        claimed.append(result.claimed)
+
+    assert claimed == [4, 4, 2, 0]
+    assert await count(async_db) == 10
+    assert await count(async_db, ScrapedJob.is_processed.is_(False), model=ScrapedJob) == 0
+    async with async_db() as db:
+        job_ids = (await db.execute(select(ScrapedJob.job_id))).scalars().all()
+    assert len(set(job_ids)) == 10
+
+
+async def test_drain_recounts_the_source_total(async_db, admin):
+    await stage(async_db, admin, [scraped_job(i) for i in range(5)])
+    await drain_staged_jobs(batch_size=2)
+    await stage(async_db, admin, [scraped_job(i) for i in range(3, 8)])
+    await drain_staged_jobs(batch_size=2)
+
+    assert (await job_source(async_db)).total_jobs_scraped == 8
+
+
+async def test_promote_batch_flags_duplicates(async_db, admin):
+    await stage(async_db, admin, [
+        scraped_job(1),
+        scraped_job(1),
+        scraped_job(2, title="Engineer 1", company="Company 1"),
+        scraped_job(3),
+    ])
+
+    result = await drain_staged_jobs(batch_size=10)
+
+    assert (result.claimed, result.promoted, result.duplicates) == (4, 2, 2)
+    async with async_db() as db:
+        first_id = (await db.execute(select(Job.id).where(Job.external_id == "jk1"))).scalar_one()
+        duplicates = (await db.execute(
+            select(ScrapedJob.duplicate_of_job_id).where(ScrapedJob.is_duplicate.is_(True))
+        )).scalars().all()
+    assert duplicates == [first_id, first_id]
+    assert (await job_source(async_db)).total_jobs_scraped == 2
+
+
+@pytest.mark.postgres
+async def test_concurrent_claims_are_disjoint(async_db, admin):
+    await stage(async_db, admin, [scraped_job(i) for i in range(8)])
+
+    async with async_db() as first, async_db() as second:
+        # The first claim holds its row locks until commit; the second skips them
+        first_result = await promote_batch(first, batch_size=5)
+        second_result = await promote_batch(second, batch_size=5)
+        await first.commit()
+        await second.commit()
+
+    assert (first_result.claimed, second_result.claimed) == (5, 3)
+    assert await count(async_db) == 8
+
+
+@pytest.mark.postgres
+async def test_concurrent_promoters_drain_the_backlog_once(async_db, admin):
+    await stage(async_db, admin, [scraped_job(i) for i in range(60)])
+
+    results = await asyncio.gather(*(drain_staged_jobs(batch_size=7) for _ in range(4)))
+
+    assert sum(result.claimed for result in results) == 60
+    assert sum(result.promoted for result in results) == 60
+    assert await count(async_db) == 60
+    # Recounted after the drains, so no promoter's jobs are lost
+    assert (await job_source(async_db)).total_jobs_scraped == 60
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models import JobSource, ScrapedJob, ScrapeRun, ScrapeTask, ScrapeTaskStatus, ScrapeWatermark
+from app.services import watermarks
+from app.services.watermarks import advance_watermark, get_watermark, seen_ids, stale_watermarks
+
+pytestmark = pytest.mark.anyio
+
+
+async def staged_run(async_db, *external_ids) -> int:
+    """A scrape run that staged ``external_ids``, oldest first"""
+    async with async_db() as db:
+        job_source = await db.get(JobSource, 1)
+        if job_source is None:
+            db.add(JobSource(id=1, name="indeed", display_name="Indeed", base_url="https://indeed.com"))
+        run = ScrapeRun(source="indeed", query="backend engineer", location="remote")
+        db.add(run)
+        await db.flush()
+        db.add_all(
+            ScrapedJob(source_id=1, scrape_run_id=run.id, external_id=external_id, title=external_id, company="Acme")
+            for external_id in external_ids
+        )
+        await db.commit()
+        return run.id
+
+
+async def advance(async_db, run_id, query="backend engineer", location="remote") -> int:
+    async with async_db() as db:
+        new = await advance_watermark(db, "indeed", query, location, run_id)
+        await db.commit()
+        return new
+
+
+async def test_advance_prepends_new_ids_and_counts_them(async_db):
+    assert await advance(async_db, await staged_run(async_db, "a", "b")) == 2
+    assert await advance(async_db, await staged_run(async_db, "c", "b", "c", "d"), "  Backend  ENGINEER ", "Remote") == 2
+
+    async with async_db() as db:
+        watermark = await get_watermark(db, "indeed", "backend engineer", "remote")
+        assert watermark.seen_external_ids == ["c", "d", "a", "b"]
+        assert watermark.last_new_jobs == 2
+        assert await seen_ids(db, "indeed", "BACKEND ENGINEER", "remote") == {"a", "b", "c", "d"}
+
+
+async def test_watermark_keeps_only_the_newest_ids(async_db, monkeypatch):
+    monkeypatch.setattr(watermarks, "SCRAPE_WATERMARK_MAX_IDS", 3)
+
+    await advance(async_db, await staged_run(async_db, "a", "b"))
+    await advance(async_db, await staged_run(async_db, "c", "d"))
+
+    async with async_db() as db:
+        assert await seen_ids(db, "indeed", "backend engineer", "remote") == {"c", "d", "a"}
+
+
+@pytest.mark.postgres
+async def test_concurrent_runs_of_one_search_both_land_in_the_watermark(async_db):
+    first = await staged_run(async_db, "a", "b")
+    second = await staged_run(async_db, "c", "d")
+
+    async with async_db() as db:
+        assert await advance_watermark(db, "indeed", "backend engineer", "remote", first) == 2
+        # The second run finishes while the first hasn't committed yet
+        racing = asyncio.ensure_future(advance(async_db, second))
+        await asyncio.sleep(0.2)
+        assert not racing.done()
+        await db.commit()
+    assert await racing == 2
+
+    async with async_db() as db:
+        assert await seen_ids(db, "indeed", "backend engineer", "remote") == {"a", "b", "c", "d"}
+
+
+async def test_stale_watermarks_skip_searches_with_a_pending_task(async_db):
+    hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+    async with async_db() as db:
+        db.add_all([
+            ScrapeWatermark(source="indeed", query="backend engineer", location="remote", seen_external_ids=[],
+                            last_scraped_at=hour_ago),
+            ScrapeWatermark(source="indeed", query="data analyst", location="remote", seen_external_ids=[],
+                            last_scraped_at=hour_ago),
+            ScrapeWatermark(source="indeed", query="pastry chef", location="remote", seen_external_ids=[],
+                            last_scraped_at=datetime.now(timezone.utc)),
+            # Queued as typed into the admin form
+            ScrapeTask(source="indeed", query="  Backend   Engineer", location="Remote ", limit=10,
+                       status=ScrapeTaskStatus.QUEUED),
+            ScrapeTask(source="indeed", query="Data Analyst", location="Remote", limit=10,
+                       status=ScrapeTaskStatus.SUCCEEDED),
+        ])
+        await db.commit()
+
+        assert [watermark.query for watermark in await stale_watermarks(db, max_age_seconds=600)] == ["data analyst"]
+
+
+async def test_stale_watermarks_skip_inactive_sources(async_db):
+    async with async_db() as db:
+        db.add_all([
+            JobSource(name="indeed", display_name="Indeed", base_url="https://indeed.com", is_active=False),
+            ScrapeWatermark(source="indeed", query="backend engineer", location="remote", seen_external_ids=[]),
+        ])
+        await db.commit()
+
+        assert await stale_watermarks(db, max_age_seconds=600) == []